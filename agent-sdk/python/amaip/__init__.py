@@ -1,5 +1,58 @@
-from .agent import Agent
-from .client import AMAIPClient
+import logging
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .batching import BatchWriter
+    from .cache import PlatformCache
+    from .claims import ClaimPolicy, ClaimResult, HashRing
+    from .client import AMAIPClient
+    from .dispatch import EventDispatcher
+    from .fleet import AgentFleet
+    from .log import configure_logging
+    from .metrics import Metrics
+    from .scheduler import TaskScheduler
+    from .state import AgentStateStore
+    from .timers import JobScheduler
+    from .transport import create_session, get_shared_session
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __version__ = "1.0.0"
-__all__ = ["Agent", "AMAIPClient"]
+
+# Public names and the submodules they live in. They are imported on first
+# access, so ``import amaip`` doesn't pay for requests, socketio or sqlite3.
+_EXPORTS = {
+    "Agent": "agent",
+    "AgentFleet": "fleet",
+    "AgentStateStore": "state",
+    "AMAIPClient": "client",
+    "BatchWriter": "batching",
+    "ClaimPolicy": "claims",
+    "ClaimResult": "claims",
+    "EventDispatcher": "dispatch",
+    "HashRing": "claims",
+    "JobScheduler": "timers",
+    "Metrics": "metrics",
+    "PlatformCache": "cache",
+    "TaskScheduler": "scheduler",
+    "configure_logging": "log",
+    "create_session": "transport",
+    "get_shared_session": "transport",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
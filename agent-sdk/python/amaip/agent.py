@@ -1,36 +1,99 @@
+import logging
+import threading
 import time
-from typing import List, Dict, Optional
+import uuid
+from typing import Callable, Iterable, List, Dict, Optional, Union
+
+import requests
+
+from .cache import PlatformCache
+from .claims import ClaimPolicy, ClaimResult
 from .client import AMAIPClient
+from .dispatch import EventDispatcher
+from .log import ensure_logging
+from .metrics import Metrics
+from .scheduler import TaskScheduler
+from .timers import Job, JobScheduler
+
+logger = logging.getLogger(__name__)
 
 
 class Agent:
-    """Base class for AMAIP agents"""
+    """Base class for AMAIP agents
+
+    Pass the same ``session`` (e.g. ``amaip.transport.get_shared_session()``)
+    to several agents in one process to let them share one connection pool.
+
+    By default hooks run inline on the socket thread. Pass an
+    :class:`~amaip.dispatch.EventDispatcher` to run them on a worker pool so
+    slow hooks don't hold up later events.
+
+    With ``cache=True`` (or a shared :class:`~amaip.cache.PlatformCache`),
+    ``get_pending_tasks()`` and ``get_online_agents()`` are answered from a
+    local view kept current by socket events instead of a REST call.
+
+    With a :class:`~amaip.scheduler.TaskScheduler` the agent claims new
+    tasks itself, best-scored first and up to a cap on in-flight tasks.
+
+    With a :class:`~amaip.claims.ClaimPolicy` every claim is acknowledged by
+    the server, retried with backoff, and reported to ``on_claim_result``.
 
-    def __init__(self, name: str, capabilities: List[str] = None, base_url: str = "http://localhost:3000"):
+    ``every()`` and ``after()`` run periodic and delayed work on a
+    :class:`~amaip.timers.JobScheduler`, off the socket thread.
+
+    With a :class:`~amaip.metrics.Metrics` the client's traffic is measured,
+    along with the time spent in each hook and the dispatcher's queue depth.
+
+    Without :meth:`subscribe` the agent receives every broadcast and drops
+    what isn't for it; with it, the server sends only the relevant events.
+    """
+
+    def __init__(self, name: str, capabilities: List[str] = None, base_url: str = "http://localhost:3000",
+                 session: Optional[requests.Session] = None,
+                 dispatcher: Optional[EventDispatcher] = None,
+                 client: Optional[AMAIPClient] = None,
+                 cache: Union[bool, PlatformCache] = False,
+                 scheduler: Optional[TaskScheduler] = None,
+                 claim_policy: Optional[ClaimPolicy] = None,
+                 timers: Optional[JobScheduler] = None,
+                 metrics: Optional[Metrics] = None):
         self.name = name
         self.capabilities = capabilities or []
         self.base_url = base_url
-        self.client = AMAIPClient(base_url)
+        self.client = client or AMAIPClient(base_url, session=session, metrics=metrics)
+        self.metrics = metrics if metrics is not None else self.client.metrics
+        self.dispatcher = dispatcher
+        self.cache = cache
+        self.scheduler = scheduler
+        self.claim_policy = claim_policy
+        self.timers = timers
+        if scheduler:
+            scheduler.bind(self.claim_task, self.capabilities)
+        if self.metrics is not None and dispatcher:
+            self.metrics.gauge("hook_queue_depth", dispatcher.queue_depth, agent=name)
+            self.metrics.gauge("hooks_dropped", dispatcher.dropped, agent=name)
         self.agent_data = None
+        self._subscriptions: List[Dict] = []
         self._running = False
 
     def start(self):
         """Start the agent"""
-        print(f"🤖 Starting agent: {self.name}")
-
-        # Register agent via REST API
-        self.agent_data = self.client.register_agent(self.name, self.capabilities)
-        print(f"✅ Registered as agent #{self.agent_data['id']}")
-
-        # Connect to WebSocket
-        self.client.connect()
-
-        # Emit join event
-        self.client.emit_agent_join(self.name, self.capabilities)
-        print(f"🔌 Connected to WebSocket")
-
-        # Register event handlers
+        ensure_logging()
+        logger.info("Starting agent: %s", self.name, extra={"agent": self.name})
+
+        # Open the socket while registering over REST: the two round trips
+        # (and importing socketio) overlap instead of adding up
+        connecting = self.client.connect_in_background()
+        self._register()
+        connecting.result()
+        logger.info("%s connected to WebSocket", self.name, extra={"agent": self.name})
+
+        # Handlers need the agent's id, so they go in once registered, and
+        # before joining so the join confirmation isn't missed
         self._setup_event_handlers()
+        self._apply_subscriptions()
+        self.client.emit_agent_join(self.name, self.capabilities)
+        self._start_cache()
 
         # Call user's on_start hook
         self.on_start()
@@ -40,7 +103,7 @@ class Agent:
         try:
             self.client.wait()
         except KeyboardInterrupt:
-            print(f"\n⚠️ Agent {self.name} interrupted")
+            logger.warning("Agent %s interrupted", self.name, extra={"agent": self.name})
             self.stop()
 
     def stop(self):
@@ -48,43 +111,152 @@ class Agent:
         self._running = False
         self.on_stop()
         self.client.disconnect()
-        print(f"👋 Agent {self.name} stopped")
+        self.client.close()
+        if isinstance(self.cache, PlatformCache):
+            self.cache.stop()
+        if self.dispatcher:
+            self.dispatcher.shutdown(wait=False)
+        if self.timers:
+            self.timers.shutdown()
+        logger.info("Agent %s stopped", self.name, extra={"agent": self.name})
+
+    @property
+    def agent_id(self) -> Optional[int]:
+        """Platform id of this agent, once registered"""
+        return self.agent_data['id'] if self.agent_data else None
+
+    def _register(self):
+        """Register this agent via the REST API"""
+        self.agent_data = self.client.register_agent(self.name, self.capabilities)
+        logger.info("%s registered as agent #%s", self.name, self.agent_id, extra={"agent": self.name})
+
+    def subscribe(self, discussions: Iterable[int] = (), capabilities: Optional[List[str]] = None,
+                  assigned: bool = True, events: Iterable[str] = ()):
+        """Receive only the events relevant to this agent instead of every broadcast
+
+        Messages of ``discussions``, tasks mentioning ``capabilities`` (by
+        default the agent's own), tasks assigned to this agent, and every
+        event named in ``events`` (e.g. ``innovation:created``). With a
+        cache, the events it needs are added. May be called before
+        :meth:`start` or from ``on_start``; calls add up.
+        """
+        topics = {
+            "discussions": list(discussions),
+            "capabilities": list(self.capabilities if capabilities is None else capabilities),
+            "assigned": assigned,
+            "events": list(events) + (list(PlatformCache.EVENTS) if self.cache else []),
+        }
+        self._subscriptions.append(topics)
+        if self.agent_id is not None:
+            self._subscribe(topics)
+
+    def _subscribe(self, topics: Dict):
+        self.client.subscribe(
+            topics["discussions"], topics["capabilities"],
+            [self.agent_id] if topics["assigned"] else [], topics["events"]
+        )
+
+    def _apply_subscriptions(self):
+        """Send the topics subscribed to before the agent had an id"""
+        for topics in self._subscriptions:
+            self._subscribe(topics)
+
+    def _start_cache(self):
+        """Seed the local view, creating it on first use if cache=True"""
+        if self.cache is True:
+            self.cache = PlatformCache(self.client)
+        if self.cache:
+            self.cache.start()
+
+    def _event_handlers(self) -> Dict[str, Callable]:
+        """Socket events this agent handles, mapped to their internal handlers"""
+        return {
+            'agent:joined': self._on_joined,
+            'task:created': self._on_task_created,
+            'task:assigned': self._on_task_assigned,
+            'task:completed': self._on_task_completed,
+            'message:new': self._on_message_received,
+            'message:chunk': self._on_message_chunk,
+            'innovation:created': self._on_innovation_created,
+        }
 
     def _setup_event_handlers(self):
         """Setup event handlers"""
-        self.client.on('agent:joined', self._on_joined)
-        self.client.on('task:created', self._on_task_created)
-        self.client.on('task:assigned', self._on_task_assigned)
-        self.client.on('message:new', self._on_message_received)
-        self.client.on('innovation:created', self._on_innovation_created)
+        for event, handler in self._event_handlers().items():
+            self.client.on(event, handler)
+
+    def _dispatch(self, event: str, hook, payload: Dict, key=None):
+        """Run a user hook inline or through the dispatcher"""
+        if self.metrics is not None:
+            hook = self._measured(event, hook)
+        if self.dispatcher:
+            self.dispatcher.submit(event, hook, payload, key=key)
+        else:
+            hook(payload)
+
+    def _measured(self, event: str, hook):
+        """Wrap a hook to record its run time"""
+        metrics = self.metrics
+
+        def run(payload):
+            with metrics.timed("hook_seconds", span=f"hook {event}", event=event, agent=self.name):
+                return hook(payload)
+        return run
 
     def _on_joined(self, data):
         """Internal handler for join confirmation"""
-        print(f"✨ Successfully joined the platform!")
+        logger.info("%s joined the platform", self.name, extra={"agent": self.name, "event": "agent:joined"})
 
     def _on_task_created(self, task):
         """Internal handler for task creation"""
-        print(f"📋 New task created: {task['title']}")
-        self.on_task_created(task)
+        logger.info("New task created: %s", task.get('title'),
+                    extra={"agent": self.name, "event": "task:created", "task_id": task.get('id')})
+        if self.scheduler:
+            self.scheduler.offer(task)
+        self._dispatch('task:created', self.on_task_created, task, key=('task', task.get('id')))
 
     def _on_task_assigned(self, task):
         """Internal handler for task assignment"""
-        if task.get('assigned_agent_id') == self.agent_data['id']:
-            print(f"📌 Task assigned to me: {task['title']}")
-            self.on_task_assigned(task)
+        mine = task.get('assigned_agent_id') == self.agent_data['id']
+        if self.scheduler:
+            self.scheduler.on_assigned(task, mine)
+        if mine:
+            logger.info("Task assigned to %s: %s", self.name, task.get('title'),
+                        extra={"agent": self.name, "event": "task:assigned", "task_id": task.get('id')})
+            self._dispatch('task:assigned', self.on_task_assigned, task, key=('task', task.get('id')))
         else:
-            print(f"📌 Task assigned to another agent: {task['title']}")
+            logger.debug("Task assigned to another agent: %s", task.get('title'),
+                         extra={"agent": self.name, "event": "task:assigned", "task_id": task.get('id')})
+
+    def _on_task_completed(self, task):
+        """Internal handler for task completion"""
+        if self.scheduler:
+            self.scheduler.release(task['id'])
 
     def _on_message_received(self, message):
         """Internal handler for messages"""
         if message.get('agent_id') != self.agent_data['id']:
-            print(f"💬 {message.get('agent_name')}: {message.get('content')}")
-            self.on_message_received(message)
+            logger.info("%s: %s", message.get('agent_name'), message.get('content'),
+                        extra={"agent": self.name, "event": "message:new",
+                               "discussion_id": message.get('discussion_id')})
+            self._dispatch(
+                'message:new', self.on_message_received, message,
+                key=('discussion', message.get('discussion_id'))
+            )
+
+    def _on_message_chunk(self, chunk):
+        """Internal handler for partial chunks of streamed messages"""
+        if chunk.get('agent_id') != self.agent_data['id']:
+            self._dispatch(
+                'message:chunk', self.on_message_chunk, chunk,
+                key=('discussion', chunk.get('discussion_id'))
+            )
 
     def _on_innovation_created(self, innovation):
         """Internal handler for innovation creation"""
-        print(f"✨ New innovation: {innovation['title']}")
-        self.on_innovation_created(innovation)
+        logger.info("New innovation: %s", innovation.get('title'),
+                    extra={"agent": self.name, "event": "innovation:created"})
+        self._dispatch('innovation:created', self.on_innovation_created, innovation)
 
     # ============ Agent Actions ============
 
@@ -94,17 +266,80 @@ class Agent:
             title, description, self.agent_data['id'], priority
         )
 
-    def claim_task(self, task_id: int):
-        """Claim a task"""
-        self.client.emit_task_claim(task_id)
+    def create_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """Create many tasks in one request (items take create_task's arguments)"""
+        return self.client.create_tasks([
+            {**task, "creator_agent_id": self.agent_id} for task in tasks
+        ])
+
+    def claim_task(self, task_id: int, wait: bool = False) -> Optional[ClaimResult]:
+        """Claim a task
+
+        With ``wait=True`` block until the server says whether we won it.
+        Without a claim policy and without ``wait`` the claim is fire-and-forget.
+        """
+        if not wait and self.claim_policy is None:
+            self.client.emit_task_claim(task_id, agent_id=self.agent_id)
+            return None
+
+        policy = self.claim_policy or ClaimPolicy()
+        if wait:
+            return self._claim(policy, task_id)
+        threading.Thread(target=self._claim, args=(policy, task_id), daemon=True).start()
+        return None
+
+    def _claim(self, policy: ClaimPolicy, task_id: int) -> ClaimResult:
+        try:
+            result = policy.claim(self.client, task_id, self.agent_id)
+        except Exception as e:
+            # Always report and free the scheduler slot, even on unexpected errors
+            logger.exception("Claiming task %s failed", task_id, extra={"agent": self.name, "task_id": task_id})
+            result = ClaimResult(task_id, False, error=str(e) or type(e).__name__)
+        if not result and self.scheduler:
+            self.scheduler.release(task_id)
+        self.on_claim_result(result)
+        return result
 
     def complete_task(self, task_id: int, result: str = None):
         """Complete a task"""
-        self.client.emit_task_complete(task_id, result)
+        self.client.emit_task_complete(task_id, result, agent_id=self.agent_id)
+        if self.scheduler:
+            self.scheduler.release(task_id)
 
     def send_message(self, discussion_id: int, content: str):
         """Send a message to a discussion"""
-        self.client.emit_message(discussion_id, content)
+        self.client.emit_message(discussion_id, content, agent_id=self.agent_id)
+
+    def send_message_stream(self, discussion_id: int, chunks: Iterable[str],
+                            min_chars: int = 20, max_delay: float = 0.1) -> str:
+        """Send a message while it is still being generated
+
+        Text from ``chunks`` (e.g. an LLM token stream) is relayed as partial
+        ``message:chunk`` events, grouped into pieces of at least
+        ``min_chars`` characters or ``max_delay`` seconds' worth, whichever
+        comes first. The complete text is then stored as one message and
+        returned.
+        """
+        stream_id = uuid.uuid4().hex
+        parts = []
+        pending = []
+        pending_chars = 0
+        last_flush = time.monotonic()
+        for delta in chunks:
+            if not delta:
+                continue
+            parts.append(delta)
+            pending.append(delta)
+            pending_chars += len(delta)
+            if pending_chars >= min_chars or time.monotonic() - last_flush >= max_delay:
+                self.client.emit_message_chunk(stream_id, discussion_id, "".join(pending), agent_id=self.agent_id)
+                pending, pending_chars, last_flush = [], 0, time.monotonic()
+        if pending:
+            self.client.emit_message_chunk(stream_id, discussion_id, "".join(pending), agent_id=self.agent_id)
+
+        content = "".join(parts)
+        self.client.emit_message_end(stream_id, discussion_id, content, agent_id=self.agent_id)
+        return content
 
     def create_innovation(self, title: str, description: str = "", category: str = None, output_data: Dict = None):
         """Create an innovation"""
@@ -115,12 +350,29 @@ class Agent:
 
     def get_pending_tasks(self) -> List[Dict]:
         """Get all pending tasks"""
+        if isinstance(self.cache, PlatformCache):
+            return self.cache.get_pending_tasks()
         return self.client.get_pending_tasks()
 
     def get_online_agents(self) -> List[Dict]:
         """Get all online agents"""
+        if isinstance(self.cache, PlatformCache):
+            return self.cache.get_online_agents()
         return self.client.get_online_agents()
 
+    def every(self, interval: float, fn: Callable, *args, name: str = None,
+              delay: Optional[float] = None) -> Job:
+        """Run ``fn(*args)`` every ``interval`` seconds until the agent stops"""
+        if self.timers is None:
+            self.timers = JobScheduler()
+        return self.timers.every(interval, fn, *args, name=name, delay=delay)
+
+    def after(self, delay: float, fn: Callable, *args, name: str = None) -> Job:
+        """Run ``fn(*args)`` once, ``delay`` seconds from now"""
+        if self.timers is None:
+            self.timers = JobScheduler()
+        return self.timers.after(delay, fn, *args, name=name)
+
     # ============ Override These Methods ============
 
     def on_start(self):
@@ -139,10 +391,18 @@ class Agent:
         """Called when a task is assigned to this agent. Override this."""
         pass
 
+    def on_claim_result(self, result: ClaimResult):
+        """Called when an acknowledged claim is won or lost. Override this."""
+        pass
+
     def on_message_received(self, message: Dict):
         """Called when a message is received. Override this."""
         pass
 
+    def on_message_chunk(self, chunk: Dict):
+        """Called with each partial chunk of another agent's streamed message. Override this."""
+        pass
+
     def on_innovation_created(self, innovation: Dict):
         """Called when an innovation is created. Override this."""
         pass
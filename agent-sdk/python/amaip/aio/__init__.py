@@ -0,0 +1,9 @@
+"""asyncio flavour of the AMAIP SDK.
+
+Requires the ``asyncio`` extra: ``pip install amaip[asyncio]``.
+"""
+
+from .agent import AsyncAgent
+from .client import AsyncAMAIPClient
+
+__all__ = ["AsyncAgent", "AsyncAMAIPClient"]
@@ -0,0 +1,184 @@
+import asyncio
+import inspect
+import logging
+from typing import List, Dict, Optional
+
+import aiohttp
+
+from ..log import ensure_logging
+from .client import AsyncAMAIPClient
+
+logger = logging.getLogger(__name__)
+
+
+async def _maybe_await(result):
+    """Await hook results that are awaitable, pass plain values through"""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+class AsyncAgent:
+    """Base class for asyncio AMAIP agents
+
+    Hooks may be plain methods or coroutines. Many agents can run on one
+    event loop, e.g. ``await asyncio.gather(*(a.start() for a in agents))``,
+    optionally sharing one ``aiohttp.ClientSession`` through ``session``.
+    """
+
+    def __init__(self, name: str, capabilities: List[str] = None, base_url: str = "http://localhost:3000",
+                 session: Optional[aiohttp.ClientSession] = None):
+        self.name = name
+        self.capabilities = capabilities or []
+        self.base_url = base_url
+        self.client = AsyncAMAIPClient(base_url, session=session)
+        self.agent_data = None
+        self._running = False
+
+    async def start(self):
+        """Start the agent and run until the connection closes"""
+        ensure_logging()
+        logger.info("Starting agent: %s", self.name, extra={"agent": self.name})
+
+        # Register event handlers before connecting so no early event is missed
+        self._setup_event_handlers()
+
+        # Register over REST and connect the socket concurrently
+        self.agent_data, _ = await asyncio.gather(
+            self.client.register_agent(self.name, self.capabilities),
+            self.client.connect()
+        )
+        logger.info("%s registered as agent #%s", self.name, self.agent_id, extra={"agent": self.name})
+
+        # Emit join event
+        await self.client.emit_agent_join(self.name, self.capabilities)
+        logger.info("%s connected to WebSocket", self.name, extra={"agent": self.name})
+
+        # Call user's on_start hook
+        await _maybe_await(self.on_start())
+
+        # Keep running
+        self._running = True
+        try:
+            await self.client.wait()
+        except asyncio.CancelledError:
+            logger.warning("Agent %s cancelled", self.name, extra={"agent": self.name})
+            await self.stop()
+            raise
+
+    @property
+    def agent_id(self) -> Optional[int]:
+        """Platform id of this agent, once registered"""
+        return self.agent_data['id'] if self.agent_data else None
+
+    async def stop(self):
+        """Stop the agent"""
+        self._running = False
+        await _maybe_await(self.on_stop())
+        await self.client.disconnect()
+        await self.client.close()
+        logger.info("Agent %s stopped", self.name, extra={"agent": self.name})
+
+    def _setup_event_handlers(self):
+        """Setup event handlers"""
+        self.client.on('agent:joined', self._on_joined)
+        self.client.on('task:created', self._on_task_created)
+        self.client.on('task:assigned', self._on_task_assigned)
+        self.client.on('message:new', self._on_message_received)
+        self.client.on('innovation:created', self._on_innovation_created)
+
+    async def _on_joined(self, data):
+        """Internal handler for join confirmation"""
+        logger.info("%s joined the platform", self.name, extra={"agent": self.name, "event": "agent:joined"})
+
+    async def _on_task_created(self, task):
+        """Internal handler for task creation"""
+        logger.info("New task created: %s", task.get('title'),
+                    extra={"agent": self.name, "event": "task:created", "task_id": task.get('id')})
+        await _maybe_await(self.on_task_created(task))
+
+    async def _on_task_assigned(self, task):
+        """Internal handler for task assignment"""
+        if task.get('assigned_agent_id') == self.agent_id:
+            logger.info("Task assigned to %s: %s", self.name, task.get('title'),
+                        extra={"agent": self.name, "event": "task:assigned", "task_id": task.get('id')})
+            await _maybe_await(self.on_task_assigned(task))
+        else:
+            logger.debug("Task assigned to another agent: %s", task.get('title'),
+                         extra={"agent": self.name, "event": "task:assigned", "task_id": task.get('id')})
+
+    async def _on_message_received(self, message):
+        """Internal handler for messages"""
+        if message.get('agent_id') != self.agent_id:
+            logger.info("%s: %s", message.get('agent_name'), message.get('content'),
+                        extra={"agent": self.name, "event": "message:new",
+                               "discussion_id": message.get('discussion_id')})
+            await _maybe_await(self.on_message_received(message))
+
+    async def _on_innovation_created(self, innovation):
+        """Internal handler for innovation creation"""
+        logger.info("New innovation: %s", innovation.get('title'),
+                    extra={"agent": self.name, "event": "innovation:created"})
+        await _maybe_await(self.on_innovation_created(innovation))
+
+    # ============ Agent Actions ============
+
+    async def create_task(self, title: str, description: str = "", priority: int = 0):
+        """Create a new task"""
+        return await self.client.create_task(
+            title, description, self.agent_data['id'], priority
+        )
+
+    async def claim_task(self, task_id: int):
+        """Claim a task"""
+        await self.client.emit_task_claim(task_id)
+
+    async def complete_task(self, task_id: int, result: str = None):
+        """Complete a task"""
+        await self.client.emit_task_complete(task_id, result)
+
+    async def send_message(self, discussion_id: int, content: str):
+        """Send a message to a discussion"""
+        await self.client.emit_message(discussion_id, content)
+
+    async def create_innovation(self, title: str, description: str = "", category: str = None,
+                                output_data: Dict = None):
+        """Create an innovation"""
+        agents_involved = [self.agent_data['id']] if self.agent_data else []
+        return await self.client.create_innovation(
+            title, description, category, agents_involved, output_data
+        )
+
+    async def get_pending_tasks(self) -> List[Dict]:
+        """Get all pending tasks"""
+        return await self.client.get_pending_tasks()
+
+    async def get_online_agents(self) -> List[Dict]:
+        """Get all online agents"""
+        return await self.client.get_online_agents()
+
+    # ============ Override These Methods (plain or async) ============
+
+    def on_start(self):
+        """Called when agent starts. Override this."""
+        pass
+
+    def on_stop(self):
+        """Called when agent stops. Override this."""
+        pass
+
+    def on_task_created(self, task: Dict):
+        """Called when a new task is created. Override this."""
+        pass
+
+    def on_task_assigned(self, task: Dict):
+        """Called when a task is assigned to this agent. Override this."""
+        pass
+
+    def on_message_received(self, message: Dict):
+        """Called when a message is received. Override this."""
+        pass
+
+    def on_innovation_created(self, innovation: Dict):
+        """Called when an innovation is created. Override this."""
+        pass
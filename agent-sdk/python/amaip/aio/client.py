@@ -0,0 +1,247 @@
+import itertools
+
+import aiohttp
+import socketio
+from typing import List, Dict, Optional, Callable
+
+from ..codec import DEFAULT_COMPRESS_THRESHOLD, SocketJson, WireFormat
+from ..rpc import RPC_EVENT, RpcTimeoutError, answer_value, request_payload
+from ..transport import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_TIMEOUT
+
+
+class AsyncAMAIPClient:
+    """asyncio client for interacting with AMAIP platform
+
+    Mirrors :class:`amaip.AMAIPClient`, with every REST and socket method
+    being a coroutine. Many clients can share one ``aiohttp.ClientSession``.
+    With ``rpc=True`` REST calls go over the connected socket, and concurrent
+    ones are pipelined on it (see :mod:`amaip.rpc`).
+    """
+
+    def __init__(self, base_url: str = "http://localhost:3000",
+                 session: Optional[aiohttp.ClientSession] = None,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 codec: str = "auto",
+                 compress_threshold: Optional[int] = DEFAULT_COMPRESS_THRESHOLD,
+                 rpc: bool = False):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.timeout = timeout
+        self._pool_limit = pool_connections * pool_maxsize
+        self._pool_per_host = pool_maxsize
+        # A session passed in is shared with other clients and is not closed by us
+        self._owns_session = session is None
+        self.session = session
+        self.wire = WireFormat(codec, compress_threshold)
+        self.sio = socketio.AsyncClient(json=SocketJson(self.wire.json))
+        self.rpc = rpc
+        self._rpc_ids = itertools.count(1)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session lazily, inside the running loop"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_limit,
+                limit_per_host=self._pool_per_host
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+
+    async def _request(self, method: str, path: str, json=None, **kwargs):
+        """Send a request over the pooled session (or the socket, in RPC mode) and decode the body"""
+        if self.rpc and self.sio.connected:
+            return await self._rpc_call(method, path, json, kwargs.get("params"))
+        session = self._get_session()
+        headers = dict(self.wire.headers)
+        if json is not None:
+            kwargs["data"], body_headers = self.wire.encode(json)
+            headers.update(body_headers)
+        async with session.request(method, f"{self.api_url}{path}", headers=headers, **kwargs) as response:
+            response.raise_for_status()
+            return self.wire.decode(response.headers.get("Content-Type"), await response.read())
+
+    async def _rpc_call(self, method: str, path: str, json=None, params: Optional[Dict] = None):
+        """Send a REST call as an acknowledged socket emit and decode the answer"""
+        payload = request_payload(next(self._rpc_ids), method, path, json, params)
+        try:
+            answer = await self.sio.call(RPC_EVENT, payload, timeout=self.timeout)
+        except socketio.exceptions.TimeoutError:
+            raise RpcTimeoutError(f"No answer to {method} {path} within {self.timeout}s") from None
+        return answer_value(answer, method, path)
+
+    async def close(self) -> None:
+        """Release pooled connections owned by this client"""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    # ============ REST API Methods ============
+
+    async def register_agent(self, name: str, capabilities: List[str] = None, endpoint: str = None) -> Dict:
+        """Register an agent on the platform"""
+        return await self._request(
+            "POST", "/agents/register",
+            json={"name": name, "capabilities": capabilities or [], "endpoint": endpoint}
+        )
+
+    async def get_agents(self) -> List[Dict]:
+        """Get all agents"""
+        return await self._request("GET", "/agents")
+
+    async def get_online_agents(self) -> List[Dict]:
+        """Get online agents"""
+        return await self._request("GET", "/agents/online")
+
+    async def create_task(self, title: str, description: str = "", creator_agent_id: int = None,
+                          priority: int = 0) -> Dict:
+        """Create a new task"""
+        return await self._request(
+            "POST", "/tasks",
+            json={
+                "title": title,
+                "description": description,
+                "creatorAgentId": creator_agent_id,
+                "priority": priority
+            }
+        )
+
+    async def get_tasks(self) -> List[Dict]:
+        """Get all tasks"""
+        return await self._request("GET", "/tasks")
+
+    async def get_pending_tasks(self) -> List[Dict]:
+        """Get pending tasks"""
+        return await self._request("GET", "/tasks/pending")
+
+    async def assign_task(self, task_id: int, agent_id: int) -> Dict:
+        """Assign a task to an agent"""
+        return await self._request(
+            "POST", f"/tasks/{task_id}/assign",
+            json={"agentId": agent_id}
+        )
+
+    async def complete_task(self, task_id: int, result: str = None) -> Dict:
+        """Mark a task as completed"""
+        return await self._request(
+            "POST", f"/tasks/{task_id}/complete",
+            json={"result": result}
+        )
+
+    async def create_discussion(self, topic: str) -> Dict:
+        """Create a new discussion"""
+        return await self._request(
+            "POST", "/discussions",
+            json={"topic": topic}
+        )
+
+    async def get_discussions(self) -> List[Dict]:
+        """Get all discussions"""
+        return await self._request("GET", "/discussions")
+
+    async def add_message(self, discussion_id: int, agent_id: int, content: str) -> Dict:
+        """Add a message to a discussion"""
+        return await self._request(
+            "POST", f"/discussions/{discussion_id}/messages",
+            json={"agentId": agent_id, "content": content}
+        )
+
+    async def get_messages(self, discussion_id: int, limit: int = 100) -> List[Dict]:
+        """Get messages from a discussion"""
+        return await self._request(
+            "GET", f"/discussions/{discussion_id}/messages",
+            params={"limit": limit}
+        )
+
+    async def create_innovation(self, title: str, description: str = "", category: str = None,
+                                agents_involved: List[int] = None, output_data: Dict = None) -> Dict:
+        """Create an innovation"""
+        return await self._request(
+            "POST", "/innovations",
+            json={
+                "title": title,
+                "description": description,
+                "category": category,
+                "agentsInvolved": agents_involved or [],
+                "outputData": output_data or {}
+            }
+        )
+
+    async def get_innovations(self) -> List[Dict]:
+        """Get all innovations"""
+        return await self._request("GET", "/innovations")
+
+    async def upvote_innovation(self, innovation_id: int) -> Dict:
+        """Upvote an innovation"""
+        return await self._request("PUT", f"/innovations/{innovation_id}/vote")
+
+    # ============ WebSocket Methods ============
+
+    async def connect(self) -> None:
+        """Connect to WebSocket server"""
+        await self.sio.connect(self.base_url)
+
+    async def disconnect(self) -> None:
+        """Disconnect from WebSocket server"""
+        await self.sio.disconnect()
+
+    async def emit_agent_join(self, name: str, capabilities: List[str] = None, endpoint: str = None):
+        """Emit agent join event"""
+        await self.sio.emit('agent:join', {
+            "name": name,
+            "capabilities": capabilities or [],
+            "endpoint": endpoint
+        })
+
+    async def emit_message(self, discussion_id: int, content: str):
+        """Emit a message"""
+        await self.sio.emit('agent:message', {
+            "discussionId": discussion_id,
+            "content": content
+        })
+
+    async def emit_task_create(self, title: str, description: str = "", priority: int = 0):
+        """Emit task creation"""
+        await self.sio.emit('task:create', {
+            "title": title,
+            "description": description,
+            "priority": priority
+        })
+
+    async def emit_task_claim(self, task_id: int):
+        """Emit task claim"""
+        await self.sio.emit('task:claim', {"taskId": task_id})
+
+    async def claim_task(self, task_id: int, timeout: float = 5.0) -> Dict:
+        """Claim a task and wait for the server's answer (see ``AMAIPClient.claim_task``)"""
+        return await self.sio.call('task:claim', {"taskId": task_id}, timeout=timeout)
+
+    async def emit_task_complete(self, task_id: int, result: str = None):
+        """Emit task completion"""
+        await self.sio.emit('task:complete', {
+            "taskId": task_id,
+            "result": result
+        })
+
+    async def emit_innovation_create(self, title: str, description: str = "", category: str = None,
+                                     agents_involved: List[int] = None, output_data: Dict = None):
+        """Emit innovation creation"""
+        await self.sio.emit('innovation:create', {
+            "title": title,
+            "description": description,
+            "category": category,
+            "agentsInvolved": agents_involved or [],
+            "outputData": output_data or {}
+        })
+
+    def on(self, event: str, handler: Callable):
+        """Register event handler (plain function or coroutine function)"""
+        self.sio.on(event, handler)
+
+    async def wait(self):
+        """Wait for socket connection"""
+        await self.sio.wait()
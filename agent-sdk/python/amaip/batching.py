@@ -0,0 +1,121 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+CREATE_TASK = "create_task"
+COMPLETE_TASK = "complete_task"
+ADD_MESSAGE = "add_message"
+
+
+class BatchItemError(Exception):
+    """Raised from a batched write's future when the server rejected that item"""
+
+
+class BatchWriter:
+    """Coalesces single writes into batch requests
+
+    Writes are queued and sent together once ``max_batch`` of the same kind
+    are waiting or ``flush_interval`` seconds have passed since the first
+    one, whichever comes first. Each write returns a ``Future`` with the
+    created/updated record.
+
+        with client.batcher() as batch:
+            futures = [batch.create_task(f"Subtask {i}") for i in range(20)]
+        tasks = [f.result() for f in futures]
+    """
+
+    def __init__(self, client, max_batch: int = 50, flush_interval: float = 0.05):
+        self.client = client
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._senders = {
+            CREATE_TASK: client.create_tasks,
+            COMPLETE_TASK: client.complete_tasks,
+            ADD_MESSAGE: client.add_messages,
+        }
+        self._pending: Dict[str, List[Tuple[Dict, Future]]] = {kind: [] for kind in self._senders}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def create_task(self, title: str, description: str = "", creator_agent_id: int = None,
+                    priority: int = 0) -> Future:
+        """Queue a task creation"""
+        return self._enqueue(CREATE_TASK, {
+            "title": title,
+            "description": description,
+            "creator_agent_id": creator_agent_id,
+            "priority": priority
+        })
+
+    def complete_task(self, task_id: int, result: str = None) -> Future:
+        """Queue a task completion"""
+        return self._enqueue(COMPLETE_TASK, {"task_id": task_id, "result": result})
+
+    def add_message(self, discussion_id: int, agent_id: int, content: str) -> Future:
+        """Queue a discussion message"""
+        return self._enqueue(ADD_MESSAGE, {
+            "discussion_id": discussion_id,
+            "agent_id": agent_id,
+            "content": content
+        })
+
+    def _enqueue(self, kind: str, item: Dict) -> Future:
+        future = Future()
+        batch = None
+        with self._lock:
+            pending = self._pending[kind]
+            pending.append((item, future))
+            if len(pending) >= self.max_batch:
+                batch = self._pending[kind]
+                self._pending[kind] = []
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._send(kind, batch)
+        return future
+
+    def flush(self):
+        """Send every queued write now"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batches = [(kind, pending) for kind, pending in self._pending.items() if pending]
+            self._pending = {kind: [] for kind in self._senders}
+        for kind, batch in batches:
+            self._send(kind, batch)
+
+    def _send(self, kind: str, batch: List[Tuple[Dict, Future]]):
+        try:
+            results = self._senders[kind]([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        if not isinstance(results, list):
+            results = []
+        if len(results) != len(batch):
+            logger.warning("Batch %s of %d items got %d results", kind, len(batch), len(results))
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, dict) and "error" in result and "id" not in result:
+                future.set_exception(BatchItemError(result["error"]))
+            else:
+                future.set_result(result)
+        # Never leave a caller waiting on an item the server didn't answer for
+        for _, future in batch[len(results):]:
+            future.set_exception(BatchItemError("No result returned for this item"))
+
+    def close(self):
+        """Flush queued writes and stop the timer"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
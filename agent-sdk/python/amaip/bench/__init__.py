@@ -0,0 +1,17 @@
+"""Load generation and latency benchmarks for a running AMAIP platform
+
+    python -m amaip.bench --agents 50 --duration 30 --output bench.json
+
+Spawns synthetic agents (threads, processes or asyncio) that create tasks,
+race to claim them, complete the ones they win and post discussion
+messages at configurable rates, then reports end-to-end event latency
+percentiles, throughput, claim contention and client CPU/memory as JSON.
+
+``python -m amaip.bench.codec`` compares the wire codecs offline, and
+``python -m amaip.bench.coldstart`` times an agent from process start to
+its first handled event.
+"""
+
+from .runner import BenchConfig, run_benchmark
+
+__all__ = ["BenchConfig", "run_benchmark"]
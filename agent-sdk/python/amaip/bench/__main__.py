@@ -0,0 +1,71 @@
+import argparse
+import json
+import sys
+
+from .runner import MODES, THREADS, BenchConfig, expected_latencies, run_benchmark
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m amaip.bench", description="Benchmark an AMAIP platform")
+    parser.add_argument("--url", default="http://localhost:3000", help="platform base URL")
+    parser.add_argument("--agents", type=int, default=10, help="number of synthetic agents")
+    parser.add_argument("--mode", choices=MODES, default=THREADS, help="how agents are run")
+    parser.add_argument("--workers", type=int, default=4, help="worker processes for --mode processes")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--task-rate", type=float, default=0.5, help="task:create per agent per second")
+    parser.add_argument("--message-rate", type=float, default=1.0, help="agent:message per agent per second")
+    parser.add_argument("--claim-probability", type=float, default=1.0,
+                        help="chance an agent tries to claim each benchmark task")
+    parser.add_argument("--no-complete", action="store_true", help="leave won tasks uncompleted")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds between connecting and load")
+    parser.add_argument("--drain", type=float, default=2.0, help="seconds to wait for in-flight events")
+    parser.add_argument("--run-id", help="tag for this run (default: random)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with an error unless every expected event's latency was measured")
+    args = parser.parse_args(argv)
+    return args, BenchConfig(
+        url=args.url, agents=args.agents, mode=args.mode, duration=args.duration,
+        task_rate=args.task_rate, message_rate=args.message_rate,
+        claim_probability=args.claim_probability, complete=not args.no_complete,
+        workers=args.workers, warmup=args.warmup, drain=args.drain, run_id=args.run_id
+    )
+
+
+def summary(report) -> str:
+    lines = [
+        f"{report['config']['agents']} agents ({report['config']['mode']}), {report['duration_s']}s",
+        f"throughput: {report['throughput_per_s']['sent']}/s sent, {report['throughput_per_s']['received']}/s received",
+    ]
+    for event, latency in sorted(report["latency_ms"].items()):
+        if latency["count"]:
+            lines.append(f"{event:15} p50 {latency['p50']:8.2f}ms  p95 {latency['p95']:8.2f}ms  "
+                         f"p99 {latency['p99']:8.2f}ms  (n={latency['count']})")
+    claims = report["claims"]
+    lines.append(f"claims: {claims['attempted']} attempted, {claims['won']} won, "
+                 f"contention {claims['contention_rate']:.1%}")
+    client = report["client"]
+    lines.append(f"client: {client['cpu_percent']}% CPU, {client['max_rss_mb']} MB peak RSS")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    args, config = parse_args(argv)
+    report = run_benchmark(config)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(summary(report), file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.check:
+        missing = [event for event in expected_latencies(config)
+                   if not report["latency_ms"].get(event, {}).get("count")]
+        if missing:
+            sys.exit(f"No latencies measured for: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
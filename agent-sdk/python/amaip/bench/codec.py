@@ -0,0 +1,127 @@
+"""Encode/decode cost and wire size of the installed codecs
+
+    python -m amaip.bench.codec --tasks 1000 --output codec.json
+
+Runs offline on synthetic payloads shaped like the platform's: a
+``get_tasks`` answer, an innovation with a large ``output_data`` and a
+single message. For each codec it reports the median encode and decode
+time, the encoded size, and the size and time with gzip.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from ..codec import available_codecs
+
+
+def _stamp(i: int) -> str:
+    return f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00.000Z"
+
+
+def sample_payloads(tasks: int = 1000, rows: int = 2000, seed: int = 0) -> Dict[str, object]:
+    """Payloads to measure, by name"""
+    rng = random.Random(seed)
+    words = ["data", "model", "agent", "research", "pipeline", "analysis", "report", "vector", "python"]
+
+    def text(n: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    task_list = [{
+        "id": i,
+        "title": text(4),
+        "description": text(30),
+        "creator_agent_id": rng.randint(1, 50),
+        "assigned_agent_id": rng.choice([None, rng.randint(1, 50)]),
+        "status": rng.choice(["pending", "in_progress", "completed"]),
+        "priority": rng.randint(0, 5),
+        "created_at": _stamp(i),
+        "updated_at": _stamp(i + 1),
+    } for i in range(tasks)]
+    innovation = {
+        "title": text(5),
+        "description": text(60),
+        "category": "research",
+        "agentsInvolved": list(range(1, 9)),
+        "outputData": {
+            "summary": text(200),
+            "series": [{"t": i, "value": rng.random(), "label": rng.choice(words)} for i in range(rows)],
+        },
+    }
+    message = {
+        "id": 1, "discussion_id": 3, "agent_id": 7, "agent_name": "Analyst-1",
+        "content": text(40), "created_at": _stamp(1),
+    }
+    return {"tasks": task_list, "innovation": innovation, "message": message}
+
+
+def _median_seconds(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def run_codec_benchmark(payloads: Optional[Dict[str, object]] = None, repeat: int = 20,
+                        codecs: Optional[List[str]] = None) -> Dict:
+    """Measure every installed codec (or those named) on every payload"""
+    payloads = payloads if payloads is not None else sample_payloads()
+    installed = available_codecs()
+    names = [n for n in (codecs or installed) if n in installed]
+    report: Dict[str, Dict] = {}
+    for payload_name, payload in payloads.items():
+        results = {}
+        for name in names:
+            codec = installed[name]
+            encoded = codec.dumps(payload)
+            compressed = gzip.compress(encoded, compresslevel=5)
+            results[name] = {
+                "bytes": len(encoded),
+                "gzip_bytes": len(compressed),
+                "encode_ms": round(1000 * _median_seconds(lambda: codec.dumps(payload), repeat), 3),
+                "decode_ms": round(1000 * _median_seconds(lambda: codec.loads(encoded), repeat), 3),
+                "gzip_ms": round(1000 * _median_seconds(lambda: gzip.compress(encoded, compresslevel=5), repeat), 3),
+                "gunzip_ms": round(1000 * _median_seconds(lambda: gzip.decompress(compressed), repeat), 3),
+            }
+        report[payload_name] = results
+    return report
+
+
+def summary(report: Dict) -> str:
+    lines = [f"{'payload':12} {'codec':8} {'bytes':>9} {'gzip':>9} {'encode':>9} {'decode':>9} {'gzip':>8}"]
+    for payload_name, results in report.items():
+        for name, r in results.items():
+            lines.append(f"{payload_name:12} {name:8} {r['bytes']:9d} {r['gzip_bytes']:9d} "
+                         f"{r['encode_ms']:7.3f}ms {r['decode_ms']:7.3f}ms {r['gzip_ms']:6.3f}ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m amaip.bench.codec",
+                                     description="Compare wire codecs on platform-shaped payloads")
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks in the get_tasks payload")
+    parser.add_argument("--rows", type=int, default=2000, help="rows in the innovation's output_data")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per measurement (median is kept)")
+    parser.add_argument("--codec", action="append", help="codec to include (default: all installed)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_codec_benchmark(sample_payloads(args.tasks, args.rows), args.repeat, args.codec)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(summary(report), file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
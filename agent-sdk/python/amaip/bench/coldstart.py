@@ -0,0 +1,129 @@
+"""Cold start: time from process start to an agent's first handled event
+
+    python -m amaip.bench.coldstart --runs 10 --latency 0.02
+
+Each run launches a fresh interpreter that imports the SDK, starts an
+agent and exits as soon as it handles its join confirmation
+(``agent:joined``), the first event any agent receives. Runs alternate
+between ``Agent.start()`` ("pipelined": the socket handshake overlaps REST
+registration) and the same steps one after another ("sequential"), and
+the report gives, per mode, latency summaries of:
+
+- ``interpreter``: process launch until the child runs its first line
+- ``import``: ``from amaip import Agent``
+- ``start``: from there to the first handled event
+- ``total``: process launch to the first handled event
+
+Without ``--url`` a :class:`~amaip.testing.LocalPlatform` is started in a
+subprocess, adding ``--latency`` seconds to each REST call and socket
+event to stand in for a remote backend.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from .stats import summarize_latencies
+
+PIPELINED = "pipelined"
+SEQUENTIAL = "sequential"
+
+_CHILD = r"""
+import json, os, sys, time
+began = time.time()
+from amaip import Agent
+imported = time.time()
+agent = Agent(sys.argv[2], base_url=sys.argv[1])
+
+def joined(data):
+    print(json.dumps({"began": began, "imported": imported, "handled": time.time()}), flush=True)
+    os._exit(0)
+
+agent.client.add_listener('agent:joined', joined)
+if sys.argv[3] == "sequential":
+    agent._register()
+    agent.client.connect()
+    agent._setup_event_handlers()
+    agent.client.emit_agent_join(agent.name, agent.capabilities)
+    agent.client.wait()
+else:
+    agent.start()
+"""
+
+
+def run_once(url: str, mode: str, name: str, timeout: float = 30.0) -> Dict[str, float]:
+    """Launch one agent process and return its phase durations in seconds"""
+    launched = time.time()
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD, url, name, mode],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=timeout, check=True
+    ).stdout
+    times = json.loads(output.decode().strip().splitlines()[-1])
+    return {
+        "interpreter": times["began"] - launched,
+        "import": times["imported"] - times["began"],
+        "start": times["handled"] - times["imported"],
+        "total": times["handled"] - launched,
+    }
+
+
+def run_coldstart(url: str, runs: int = 10, modes: List[str] = (PIPELINED, SEQUENTIAL)) -> Dict:
+    """Alternate cold starts in each mode and summarize every phase"""
+    samples: Dict[str, Dict[str, List[float]]] = {mode: {} for mode in modes}
+    for run in range(runs):
+        for mode in modes:
+            phases = run_once(url, mode, f"coldstart-{mode}-{run}")
+            for phase, seconds in phases.items():
+                samples[mode].setdefault(phase, []).append(seconds)
+    return {
+        mode: {phase: summarize_latencies(values) for phase, values in phases.items()}
+        for mode, phases in samples.items()
+    }
+
+
+def summary(report: Dict) -> str:
+    lines = []
+    for mode, phases in report.items():
+        parts = [f"{phase} p50 {stats['p50']:.1f}ms" for phase, stats in phases.items() if stats["count"]]
+        lines.append(f"{mode:10} " + ", ".join(parts))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m amaip.bench.coldstart",
+                                     description="Measure agent cold start to first handled event")
+    parser.add_argument("--url", help="platform base URL (default: a local in-memory platform)")
+    parser.add_argument("--runs", type=int, default=10, help="cold starts per mode")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="seconds added per REST call and socket event by the local platform")
+    parser.add_argument("--mode", choices=(PIPELINED, SEQUENTIAL), action="append",
+                        help="startup mode to measure (default: both)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    platform: Optional[object] = None
+    url = args.url
+    if url is None:
+        from ..testing import LocalPlatform
+        platform = LocalPlatform(latency=args.latency, subprocess=True).start()
+        url = platform.url
+    try:
+        report = run_coldstart(url, args.runs, args.mode or (PIPELINED, SEQUENTIAL))
+    finally:
+        if platform is not None:
+            platform.stop()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(summary(report), file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import json
+import multiprocessing
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from ..client import AMAIPClient
+from ..transport import get_shared_session
+from .stats import Recorder, resource_usage
+
+THREADS = "threads"
+PROCESSES = "processes"
+ASYNCIO = "asyncio"
+MODES = (THREADS, PROCESSES, ASYNCIO)
+
+
+class BenchConfig:
+    """Parameters of a benchmark run
+
+    Rates are per agent, in operations per second. Every synthetic agent
+    tries to claim each benchmark task it sees with probability
+    ``claim_probability``, so with many agents claims contend for the same
+    tasks; the winner completes the task if ``complete`` is set.
+    """
+
+    def __init__(self, url: str = "http://localhost:3000", agents: int = 10, mode: str = THREADS,
+                 duration: float = 10.0, task_rate: float = 0.5, message_rate: float = 1.0,
+                 claim_probability: float = 1.0, complete: bool = True, workers: int = 4,
+                 warmup: float = 1.0, drain: float = 2.0, run_id: Optional[str] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+        self.url = url
+        self.agents = agents
+        self.mode = mode
+        self.duration = duration
+        self.task_rate = task_rate
+        self.message_rate = message_rate
+        self.claim_probability = claim_probability
+        self.complete = complete
+        self.workers = workers
+        self.warmup = warmup
+        self.drain = drain
+        self.run_id = run_id or uuid.uuid4().hex[:8]
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+def _marker(run_id: str) -> str:
+    """Payload text carrying the send time, so receivers can measure latency"""
+    return json.dumps({"bench": run_id, "sent": time.time()})
+
+
+def _sent_at(text: Optional[str], run_id: str) -> Optional[float]:
+    """Send time from a benchmark payload of this run, else None"""
+    if not text or not text.startswith("{"):
+        return None
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or payload.get("bench") != run_id:
+        return None
+    return payload.get("sent")
+
+
+def _next_due(due: float, rate: float) -> float:
+    return due + 1.0 / rate if rate > 0 else float("inf")
+
+
+class SyntheticAgent:
+    """One simulated agent on its own socket, driven from a thread"""
+
+    def __init__(self, index: int, config: BenchConfig, recorder: Recorder, discussion_id: int):
+        self.name = f"bench-{config.run_id}-{index}"
+        self.config = config
+        self.recorder = recorder
+        self.discussion_id = discussion_id
+        self.client = AMAIPClient(config.url, session=get_shared_session())
+        self.agent_id = None
+
+    def start(self):
+        self.agent_id = self.client.register_agent(self.name, ["bench"])['id']
+        self.client.on('task:created', self._on_task_created)
+        self.client.on('task:completed', self._on_task_completed)
+        self.client.on('message:new', self._on_message)
+        self.client.connect()
+        self.client.emit_agent_join(self.name, ["bench"])
+
+    def run(self, stop: threading.Event):
+        """Send tasks and messages at the configured rates until ``stop`` is set"""
+        now = time.monotonic()
+        # Random phase so agents don't all fire in lockstep
+        next_task = now + random.random() / self.config.task_rate if self.config.task_rate > 0 else float("inf")
+        next_message = now + random.random() / self.config.message_rate if self.config.message_rate > 0 else float("inf")
+        while not stop.is_set():
+            due = min(next_task, next_message)
+            if stop.wait(max(0.0, due - time.monotonic())):
+                break
+            if next_task <= next_message:
+                self.client.emit_task_create("Benchmark task", _marker(self.config.run_id), agent_id=self.agent_id)
+                self.recorder.count_sent("task:create")
+                next_task = _next_due(next_task, self.config.task_rate)
+            else:
+                self.client.emit_message(self.discussion_id, _marker(self.config.run_id), agent_id=self.agent_id)
+                self.recorder.count_sent("agent:message")
+                next_message = _next_due(next_message, self.config.message_rate)
+
+    def close(self):
+        self.client.disconnect()
+        self.client.close()
+
+    def _on_task_created(self, task):
+        sent = _sent_at(task.get('description'), self.config.run_id)
+        if sent is None:
+            return
+        self.recorder.record("task:created", time.time() - sent)
+        if random.random() >= self.config.claim_probability:
+            return
+
+        self.recorder.count_sent("task:claim")
+        started = time.perf_counter()
+        try:
+            answer = self.client.claim_task(task['id'], agent_id=self.agent_id)
+        except Exception:
+            self.recorder.record_claim(time.perf_counter() - started, "errors")
+            return
+        self.recorder.record_claim(time.perf_counter() - started, "won" if answer.get('success') else "lost")
+
+        if answer.get('success') and self.config.complete:
+            self.recorder.count_completion(task['id'])
+            self.client.emit_task_complete(task['id'], "benchmark", agent_id=self.agent_id)
+
+    def _on_task_completed(self, task):
+        self.recorder.saw_completion(task['id'])
+
+    def _on_message(self, message):
+        sent = _sent_at(message.get('content'), self.config.run_id)
+        if sent is not None:
+            self.recorder.record("message:new", time.time() - sent)
+
+
+def _run_threads(config: BenchConfig, indices: List[int], discussion_id: int, recorder: Recorder):
+    """Run the given agents in this process, one driver thread each"""
+    agents = [SyntheticAgent(i, config, recorder, discussion_id) for i in indices]
+    for agent in agents:
+        agent.start()
+    time.sleep(config.warmup)
+
+    stop = threading.Event()
+    drivers = [threading.Thread(target=agent.run, args=(stop,), daemon=True) for agent in agents]
+    for driver in drivers:
+        driver.start()
+    time.sleep(config.duration)
+    stop.set()
+    for driver in drivers:
+        driver.join()
+
+    time.sleep(config.drain)
+    for agent in agents:
+        agent.close()
+
+
+def _process_worker(config: Dict, indices: List[int], discussion_id: int) -> Dict:
+    recorder = Recorder()
+    _run_threads(BenchConfig(**config), indices, discussion_id, recorder)
+    return {"recorder": recorder.to_dict(), "usage": resource_usage()}
+
+
+async def _run_asyncio(config: BenchConfig, discussion_id: int, recorder: Recorder):
+    """Run every agent as a coroutine on one event loop"""
+    import asyncio
+    from ..aio.client import AsyncAMAIPClient
+
+    clients = []
+
+    async def start(index: int):
+        client = AsyncAMAIPClient(config.url)
+        name = f"bench-{config.run_id}-{index}"
+        await client.register_agent(name, ["bench"])
+
+        async def on_task_created(task):
+            sent = _sent_at(task.get('description'), config.run_id)
+            if sent is None:
+                return
+            recorder.record("task:created", time.time() - sent)
+            if random.random() >= config.claim_probability:
+                return
+            recorder.count_sent("task:claim")
+            started = time.perf_counter()
+            try:
+                answer = await client.claim_task(task['id'])
+            except Exception:
+                recorder.record_claim(time.perf_counter() - started, "errors")
+                return
+            recorder.record_claim(time.perf_counter() - started, "won" if answer.get('success') else "lost")
+            if answer.get('success') and config.complete:
+                recorder.count_completion(task['id'])
+                await client.emit_task_complete(task['id'], "benchmark")
+
+        def on_task_completed(task):
+            recorder.saw_completion(task['id'])
+
+        def on_message(message):
+            sent = _sent_at(message.get('content'), config.run_id)
+            if sent is not None:
+                recorder.record("message:new", time.time() - sent)
+
+        client.on('task:created', on_task_created)
+        client.on('task:completed', on_task_completed)
+        client.on('message:new', on_message)
+        await client.connect()
+        await client.emit_agent_join(name, ["bench"])
+        clients.append(client)
+
+    async def drive(client, deadline: float):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        next_task = now + random.random() / config.task_rate if config.task_rate > 0 else float("inf")
+        next_message = now + random.random() / config.message_rate if config.message_rate > 0 else float("inf")
+        while True:
+            due = min(next_task, next_message)
+            if due >= deadline:
+                return
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            if next_task <= next_message:
+                await client.emit_task_create("Benchmark task", _marker(config.run_id))
+                recorder.count_sent("task:create")
+                next_task = _next_due(next_task, config.task_rate)
+            else:
+                await client.emit_message(discussion_id, _marker(config.run_id))
+                recorder.count_sent("agent:message")
+                next_message = _next_due(next_message, config.message_rate)
+
+    await asyncio.gather(*(start(i) for i in range(config.agents)))
+    await asyncio.sleep(config.warmup)
+    deadline = asyncio.get_running_loop().time() + config.duration
+    await asyncio.gather(*(drive(client, deadline) for client in clients))
+    await asyncio.sleep(config.drain)
+    for client in clients:
+        await client.disconnect()
+        await client.close()
+
+
+def expected_latencies(config: BenchConfig) -> List[str]:
+    """Events a run with this config should report latencies for"""
+    events = []
+    if config.task_rate > 0:
+        events.append("task:created")
+        if config.claim_probability > 0:
+            events.append("task:claim")
+            if config.complete:
+                events.append("task:completed")
+    if config.message_rate > 0:
+        events.append("message:new")
+    return events
+
+
+def run_benchmark(config: BenchConfig) -> Dict:
+    """Run a benchmark against a live platform and return its report"""
+    setup = AMAIPClient(config.url)
+    discussion_id = setup.create_discussion(f"Benchmark {config.run_id}")['id']
+    setup.close()
+
+    recorder = Recorder()
+    usage = []
+    started = time.monotonic()
+
+    if config.mode == THREADS:
+        _run_threads(config, list(range(config.agents)), discussion_id, recorder)
+        usage.append(resource_usage())
+    elif config.mode == PROCESSES:
+        workers = max(1, min(config.workers, config.agents))
+        slices = [list(range(config.agents))[w::workers] for w in range(workers)]
+        # Spawned, not forked: a forked worker would share this process's
+        # pooled keep-alive connections (e.g. the shared session's)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_process_worker, config.to_dict(), indices, discussion_id)
+                       for indices in slices]
+            for future in futures:
+                result = future.result()
+                recorder.merge(result["recorder"])
+                usage.append(result["usage"])
+    else:
+        import asyncio
+        asyncio.run(_run_asyncio(config, discussion_id, recorder))
+        usage.append(resource_usage())
+
+    wall = time.monotonic() - started
+    report = recorder.report(config.duration)
+    cpu = sum(u["cpu_seconds"] for u in usage)
+    rss = [u["max_rss_mb"] for u in usage if u["max_rss_mb"] is not None]
+    report["client"] = {
+        "processes": len(usage),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_percent": round(100 * cpu / wall, 1) if wall else 0.0,
+        "max_rss_mb": max(rss) if rss else None,
+    }
+    report["config"] = config.to_dict()
+    return report
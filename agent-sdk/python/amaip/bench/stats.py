@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize_latencies(samples: List[float]) -> Dict:
+    """count/mean/p50/p95/p99/max of latencies in seconds, reported in milliseconds"""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(1000 * sum(values) / len(values), 3),
+        "p50": round(1000 * percentile(values, 50), 3),
+        "p95": round(1000 * percentile(values, 95), 3),
+        "p99": round(1000 * percentile(values, 99), 3),
+        "max": round(1000 * values[-1], 3),
+    }
+
+
+def resource_usage() -> Dict:
+    """CPU seconds used and peak RSS of this process (and its finished children)"""
+    if resource is None:
+        return {"cpu_seconds": time.process_time(), "max_rss_mb": None}
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux
+    return {
+        "cpu_seconds": usage.ru_utime + usage.ru_stime + children.ru_utime + children.ru_stime,
+        "max_rss_mb": round(max(usage.ru_maxrss, children.ru_maxrss) / 1024.0, 1),
+    }
+
+
+class Recorder:
+    """Thread-safe counters and latency samples for one benchmark run
+
+    ``task:completed`` carries nothing of the sender's (the platform doesn't
+    return the result), so completions are timed by task id: send and
+    receive times are kept apart and paired in :meth:`report`, which also
+    works when sender and receivers are in different worker processes.
+    """
+
+    def __init__(self):
+        self.sent: Dict[str, int] = defaultdict(int)
+        self.received: Dict[str, int] = defaultdict(int)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.claims = {"attempted": 0, "won": 0, "lost": 0, "errors": 0}
+        self.completions_sent: Dict[int, float] = {}
+        self.completions_seen: List[Tuple[int, float]] = []
+        self._lock = threading.Lock()
+
+    def count_sent(self, op: str):
+        with self._lock:
+            self.sent[op] += 1
+
+    def record(self, event: str, latency: float):
+        """Count a received event and its end-to-end latency"""
+        with self._lock:
+            self.received[event] += 1
+            self.latencies[event].append(latency)
+
+    def count_completion(self, task_id: int):
+        """Count a task:complete about to be sent, remembering when"""
+        with self._lock:
+            self.sent["task:complete"] += 1
+            self.completions_sent[task_id] = time.time()
+
+    def saw_completion(self, task_id: int):
+        """Note a task:completed event; it counts if this run completed the task"""
+        with self._lock:
+            self.completions_seen.append((task_id, time.time()))
+
+    def record_claim(self, latency: float, outcome: str):
+        """Count a claim round trip: ``outcome`` is won, lost or errors"""
+        with self._lock:
+            self.claims["attempted"] += 1
+            self.claims[outcome] += 1
+            if outcome != "errors":
+                self.latencies["task:claim"].append(latency)
+
+    def to_dict(self) -> Dict:
+        """Raw counters and samples, e.g. to send back from a worker process"""
+        with self._lock:
+            return {
+                "sent": dict(self.sent),
+                "received": dict(self.received),
+                "latencies": {k: list(v) for k, v in self.latencies.items()},
+                "claims": dict(self.claims),
+                "completions_sent": dict(self.completions_sent),
+                "completions_seen": list(self.completions_seen),
+            }
+
+    def merge(self, raw: Dict):
+        """Add another recorder's :meth:`to_dict` output"""
+        with self._lock:
+            for op, n in raw["sent"].items():
+                self.sent[op] += n
+            for event, n in raw["received"].items():
+                self.received[event] += n
+            for event, samples in raw["latencies"].items():
+                self.latencies[event].extend(samples)
+            for key, n in raw["claims"].items():
+                self.claims[key] += n
+            self.completions_sent.update(raw["completions_sent"])
+            self.completions_seen.extend(raw["completions_seen"])
+
+    def report(self, duration: float) -> Dict:
+        """Machine-readable summary of the run"""
+        raw = self.to_dict()
+        sent = raw["completions_sent"]
+        completed = [seen - sent[task_id] for task_id, seen in raw["completions_seen"] if task_id in sent]
+        if completed:
+            raw["received"]["task:completed"] = len(completed)
+            raw["latencies"]["task:completed"] = completed
+        attempted = raw["claims"]["attempted"]
+        return {
+            "duration_s": round(duration, 3),
+            "sent": raw["sent"],
+            "received": raw["received"],
+            "throughput_per_s": {
+                "sent": round(sum(raw["sent"].values()) / duration, 2) if duration else 0.0,
+                "received": round(sum(raw["received"].values()) / duration, 2) if duration else 0.0,
+            },
+            "latency_ms": {event: summarize_latencies(samples) for event, samples in raw["latencies"].items()},
+            "claims": {
+                **raw["claims"],
+                "contention_rate": round(raw["claims"]["lost"] / attempted, 4) if attempted else 0.0,
+            },
+        }
@@ -0,0 +1,156 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _pending_order(task: Dict):
+    """Same order as /api/tasks/pending: highest priority, then oldest first"""
+    return (-(task.get('priority') or 0), task.get('created_at') or '')
+
+
+class PlatformCache:
+    """Local view of pending tasks and online agents kept current by socket events
+
+    The view is seeded once over REST, then updated from ``task:created``,
+    ``task:assigned``, ``task:completed``, ``agent:connected`` and
+    ``agent:disconnected``. Every ``reconcile_interval`` seconds it is
+    re-seeded over REST to repair drift from missed events; pass ``None`` to
+    disable that. Events that arrive while a snapshot is being fetched are
+    applied again on top of it, so they are not lost.
+    """
+
+    # Socket events the view is kept current by
+    EVENTS = ('task:created', 'task:assigned', 'task:completed', 'agent:connected', 'agent:disconnected')
+
+    def __init__(self, client, reconcile_interval: Optional[float] = 60.0):
+        self.client = client
+        self.reconcile_interval = reconcile_interval
+        self._tasks: Dict[int, Dict] = {}
+        self._agents: Dict[int, Dict] = {}
+        self._pending_view: Optional[List[Dict]] = None
+        self._online_view: Optional[List[Dict]] = None
+        self._lock = threading.Lock()
+        self._reconciling = threading.Lock()
+        # Events seen while a snapshot is being fetched, to apply on top of it
+        self._buffer: Optional[List[Tuple[Callable, Dict]]] = None
+        self._stopped = threading.Event()
+        self._started = False
+
+    def _listeners(self) -> Dict[str, Callable]:
+        return {
+            'task:created': self._on_task_created,
+            'task:assigned': self._on_task_closed,
+            'task:completed': self._on_task_closed,
+            'agent:connected': self._on_agent_connected,
+            'agent:disconnected': self._on_agent_disconnected,
+        }
+
+    def start(self):
+        """Attach to the client's events and seed the view. Safe to call twice."""
+        if self._started:
+            return
+        self._started = True
+        for event, listener in self._listeners().items():
+            self.client.add_listener(event, listener)
+        self.reconcile()
+
+        if self.reconcile_interval:
+            thread = threading.Thread(target=self._reconcile_loop, name="amaip-cache", daemon=True)
+            thread.start()
+
+    def stop(self):
+        """Stop periodic reconciliation and detach from the client's events"""
+        self._stopped.set()
+        if self._started:
+            for event, listener in self._listeners().items():
+                self.client.remove_listener(event, listener)
+            self._started = False
+
+    def reconcile(self):
+        """Replace the view with a fresh REST snapshot plus the events seen while fetching it"""
+        with self._reconciling:
+            with self._lock:
+                self._buffer = []
+            try:
+                tasks = self.client.get_pending_tasks()
+                agents = self.client.get_online_agents()
+            except Exception:
+                with self._lock:
+                    self._buffer = None
+                raise
+            with self._lock:
+                buffered, self._buffer = self._buffer, None
+                self._tasks = {t['id']: t for t in tasks}
+                self._agents = {a['id']: a for a in agents}
+                for apply, payload in buffered:
+                    apply(payload)
+                self._pending_view = None
+                self._online_view = None
+
+    def _reconcile_loop(self):
+        while not self._stopped.wait(self.reconcile_interval):
+            try:
+                self.reconcile()
+            except Exception:
+                logger.warning("Cache reconciliation failed", exc_info=True)
+
+    # ============ Event Handlers ============
+
+    def _apply(self, change: Callable, payload):
+        """Apply an event to the view, and keep it for a snapshot being fetched"""
+        with self._lock:
+            if self._buffer is not None:
+                self._buffer.append((change, payload))
+            change(payload)
+
+    def _on_task_created(self, task):
+        self._apply(self._add_task, task)
+
+    def _on_task_closed(self, task):
+        self._apply(self._remove_task, task)
+
+    def _on_agent_connected(self, agent):
+        self._apply(self._add_agent, agent)
+
+    def _on_agent_disconnected(self, agent):
+        self._apply(self._remove_agent, agent)
+
+    # Changes to the view; the caller holds the lock
+
+    def _add_task(self, task):
+        if task.get('status', 'pending') != 'pending':
+            return
+        self._tasks[task['id']] = task
+        self._pending_view = None
+
+    def _remove_task(self, task):
+        if self._tasks.pop(task.get('id'), None) is not None:
+            self._pending_view = None
+
+    def _add_agent(self, agent):
+        self._agents[agent['id']] = agent
+        self._online_view = None
+
+    def _remove_agent(self, agent):
+        if agent and self._agents.pop(agent.get('id'), None) is not None:
+            self._online_view = None
+
+    # ============ Queries ============
+
+    def get_pending_tasks(self) -> List[Dict]:
+        """Pending tasks, highest priority first"""
+        with self._lock:
+            if self._pending_view is None:
+                self._pending_view = sorted(self._tasks.values(), key=_pending_order)
+            return list(self._pending_view)
+
+    def get_online_agents(self) -> List[Dict]:
+        """Online agents, most recently seen first"""
+        with self._lock:
+            if self._online_view is None:
+                self._online_view = sorted(
+                    self._agents.values(), key=lambda a: a.get('last_seen') or '', reverse=True
+                )
+            return list(self._online_view)
@@ -0,0 +1,156 @@
+import bisect
+import hashlib
+import random
+import threading
+import time
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional
+
+
+# Server errors meaning someone else has (or nobody can get) the task
+LOST_ERRORS = ("Task is not available for assignment", "Task not found")
+
+
+def backoff_delays(base: float = 0.05, factor: float = 2.0, max_delay: float = 2.0) -> Iterator[float]:
+    """Endless jittered exponential backoff ("full jitter")"""
+    ceiling = base
+    while True:
+        yield random.uniform(0, ceiling)
+        ceiling = min(ceiling * factor, max_delay)
+
+
+class ClaimResult:
+    """Outcome of an acknowledged claim"""
+
+    def __init__(self, task_id: int, success: bool, task: Optional[Dict] = None,
+                 error: Optional[str] = None, attempts: int = 1):
+        self.task_id = task_id
+        self.success = success
+        self.task = task
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def lost(self) -> bool:
+        """True when another agent won the task (or it no longer exists)"""
+        return not self.success and self.error in LOST_ERRORS
+
+    def __bool__(self):
+        return self.success
+
+    def __repr__(self):
+        state = "won" if self.success else f"failed: {self.error}"
+        return f"<ClaimResult task={self.task_id} {state} attempts={self.attempts}>"
+
+
+class HashRing:
+    """Consistent-hash ring assigning each task a preference order of agents
+
+    The first agent in a task's order claims it straight away; the others
+    hold back progressively longer, so agents sharing a ring rarely race.
+    Adding or removing an agent only moves the tasks adjacent to it.
+    """
+
+    def __init__(self, members: Iterable[Hashable] = (), replicas: int = 64):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, Hashable] = {}
+        self._members = set()
+        self._lock = threading.Lock()
+        for member in members:
+            self.add(member)
+
+    @staticmethod
+    def _hash(value) -> int:
+        return int(hashlib.md5(str(value).encode()).hexdigest()[:16], 16)
+
+    def add(self, member: Hashable):
+        with self._lock:
+            if member in self._members:
+                return
+            self._members.add(member)
+            for i in range(self.replicas):
+                point = self._hash(f"{member}#{i}")
+                self._owners[point] = member
+                bisect.insort(self._points, point)
+
+    def remove(self, member: Hashable):
+        with self._lock:
+            if member not in self._members:
+                return
+            self._members.discard(member)
+            for i in range(self.replicas):
+                point = self._hash(f"{member}#{i}")
+                del self._owners[point]
+                self._points.remove(point)
+
+    def rank(self, key: Hashable, member: Hashable) -> int:
+        """Position of ``member`` in ``key``'s preference order (0 = owner)"""
+        with self._lock:
+            if member not in self._members or not self._points:
+                return 0
+            start = bisect.bisect(self._points, self._hash(key))
+            seen = []
+            for i in range(len(self._points)):
+                owner = self._owners[self._points[(start + i) % len(self._points)]]
+                if owner == member:
+                    return len(seen)
+                if owner not in seen:
+                    seen.append(owner)
+            return len(seen)
+
+
+class ClaimPolicy:
+    """Acknowledged task claims with retry, backoff and optional partitioning
+
+    Claims wait for the server's acknowledgement. A timeout, a socket that
+    is down, or a transient error is retried up to ``retries`` times with jittered exponential
+    backoff; losing the task to another agent ends the attempt at once.
+    With a ``ring`` shared by agents (see :class:`HashRing`), agents that
+    don't own a task wait ``rank * stagger`` seconds (jittered) before
+    claiming it, which is usually long enough for the owner to win.
+    """
+
+    def __init__(self, retries: int = 3, timeout: float = 5.0, base_delay: float = 0.05,
+                 max_delay: float = 2.0, ring: Optional[HashRing] = None, stagger: float = 0.25):
+        self.retries = retries
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.ring = ring
+        self.stagger = stagger
+
+    def defer_for(self, task_id: int, agent_id: int) -> float:
+        """Seconds a non-owning agent should hold back before claiming"""
+        if self.ring is None or agent_id is None:
+            return 0.0
+        rank = self.ring.rank(task_id, agent_id)
+        if rank == 0:
+            return 0.0
+        return rank * self.stagger + random.uniform(0, self.stagger)
+
+    def claim(self, client, task_id: int, agent_id: int = None) -> ClaimResult:
+        """Claim a task, blocking until it is won, lost or retries run out"""
+        from socketio.exceptions import SocketIOError, TimeoutError as AckTimeoutError
+
+        defer = self.defer_for(task_id, agent_id)
+        if defer:
+            time.sleep(defer)
+
+        delays = backoff_delays(self.base_delay, max_delay=self.max_delay)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                ack = client.claim_task(task_id, agent_id=agent_id, timeout=self.timeout)
+                result = ClaimResult(
+                    task_id, bool(ack.get('success')), ack.get('task'), ack.get('error'), attempt
+                )
+            except AckTimeoutError:
+                result = ClaimResult(task_id, False, error="Claim timed out", attempts=attempt)
+            except SocketIOError as e:
+                # Not connected (e.g. mid-reconnect): as good as a timeout
+                result = ClaimResult(task_id, False, error=f"Socket unavailable: {e}", attempts=attempt)
+
+            if result.success or result.lost or attempt > self.retries:
+                return result
+            time.sleep(next(delays))
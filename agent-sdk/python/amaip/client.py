@@ -1,43 +1,218 @@
+import logging
+import threading
+
 import requests
-import socketio
-from typing import List, Dict, Optional, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Iterable, Iterator, Optional, Callable
+
+from .batching import BatchWriter
+from .codec import DEFAULT_COMPRESS_THRESHOLD, SocketJson, WireFormat
+from .metrics import Metrics, payload_size, route_label
+from .rpc import RpcChannel
+from .stream import EventStream
+from .subscriptions import Subscription
+from .sync import DeltaCursor
+from .transport import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    create_session,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _cursor_params(since_id: Optional[int], updated_after: Optional[str], limit: Optional[int]) -> Dict:
+    """Query parameters for incremental fetch, leaving out unset ones"""
+    params = {"since_id": since_id, "updated_after": updated_after, "limit": limit}
+    return {k: v for k, v in params.items() if v is not None}
 
 
 class AMAIPClient:
-    """Client for interacting with AMAIP platform"""
+    """Client for interacting with AMAIP platform
+
+    With a :class:`~amaip.metrics.Metrics`, REST latency per route, socket
+    emits and calls, events received and handled, bytes on the wire and
+    reconnects are recorded.
 
-    def __init__(self, base_url: str = "http://localhost:3000"):
+    A dropped socket reconnects by itself, with exponential backoff between
+    ``reconnection_delay`` and ``reconnection_delay_max`` seconds, +/-50%
+    jitter. Agents joined over it are joined again, and with ``resume`` (the
+    default) an :class:`~amaip.stream.EventStream` replays the events missed
+    meanwhile and drops duplicates, so handlers see every event once.
+
+    REST bodies use MessagePack when it is installed and the server answers
+    in it, else the fastest JSON installed, and are gzipped above
+    ``compress_threshold`` bytes (see :mod:`amaip.codec`).
+
+    :meth:`subscribe` narrows the socket to the events of some discussions,
+    capabilities, agents or event types; the server then stops sending the
+    rest (see :mod:`amaip.subscriptions`).
+
+    With ``rpc=True`` the REST methods go over the socket while it is
+    connected, as acknowledged emits that can be pipelined, and over HTTP
+    otherwise (see :mod:`amaip.rpc`).
+    """
+
+    def __init__(self, base_url: str = "http://localhost:3000",
+                 session: Optional[requests.Session] = None,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 metrics: Optional[Metrics] = None,
+                 resume: bool = True,
+                 reconnection_delay: float = 1.0,
+                 reconnection_delay_max: float = 30.0,
+                 codec: str = "auto",
+                 compress_threshold: Optional[int] = DEFAULT_COMPRESS_THRESHOLD,
+                 rpc: bool = False):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
-        self.sio = socketio.Client()
+        self.timeout = timeout
+        # A session passed in is shared with other clients and is not closed by us
+        self._owns_session = session is None
+        self.session = session or create_session(pool_connections, pool_maxsize)
+        self.wire = WireFormat(codec, compress_threshold)
+        self._sio = None
+        self._sio_options = {
+            "reconnection_delay": reconnection_delay,
+            "reconnection_delay_max": reconnection_delay_max,
+            "randomization_factor": 0.5,
+        }
+        self._sio_lock = threading.Lock()
+        self._handlers: Dict[str, Callable] = {}
+        self._listeners: Dict[str, List[Callable]] = {}
+        self.metrics = metrics
+        self._connects = 0
+        self._joins: Dict[str, Dict] = {}
+        self.subscription: Optional[Subscription] = None
+        self._sent_topics: Optional[Dict] = None
+        self.stream = EventStream(self, self._dispatch) if resume else None
+        self.add_listener('connect', self._on_connect)
+        # A (connect, read) timeout pair bounds socket calls by its read part
+        rpc_timeout = timeout[-1] if isinstance(timeout, tuple) else timeout
+        self.rpc = RpcChannel(self, rpc_timeout) if rpc else None
+        if self.rpc is not None:
+            self.add_listener('disconnect', self.rpc.disconnected)
+
+    @property
+    def sio(self):
+        """The socket.io client, created on first use so REST-only clients never import socketio"""
+        if self._sio is None:
+            with self._sio_lock:
+                if self._sio is None:
+                    import socketio
+                    sio = socketio.Client(http_session=self.session, json=SocketJson(self.wire.json),
+                                          **self._sio_options)
+                    for event in set(self._handlers) | set(self._listeners):
+                        sio.on(event, self._router(event))
+                    self._sio = sio
+        return self._sio
+
+    @property
+    def connected(self) -> bool:
+        """Whether the socket is connected"""
+        return self._sio is not None and self._sio.connected
+
+    def _request(self, method: str, path: str, json=None, **kwargs):
+        """Send a request over the pooled session (or the socket, in RPC mode) and decode the body"""
+        if self.rpc is not None and self.connected:
+            return self.rpc.call(method, path, json, kwargs.get("params"))
+        kwargs.setdefault("timeout", self.timeout)
+        headers = dict(self.wire.headers)
+        if json is not None:
+            kwargs["data"], body_headers = self.wire.encode(json)
+            headers.update(body_headers)
+        kwargs["headers"] = headers
+        if self.metrics is None:
+            response = self.session.request(method, f"{self.api_url}{path}", **kwargs)
+            response.raise_for_status()
+            return self.wire.decode(response.headers.get("Content-Type"), response.content)
+
+        route = route_label(method, path)
+        with self.metrics.timed("http_request_seconds", span=f"HTTP {route}", route=route):
+            response = self.session.request(method, f"{self.api_url}{path}", **kwargs)
+        self.metrics.inc("http_requests_total", route=route, status=response.status_code)
+        self.metrics.inc("bytes_sent_total", len(response.request.body or b""), transport="http")
+        self.metrics.inc("bytes_received_total", len(response.content), transport="http")
+        response.raise_for_status()
+        return self.wire.decode(response.headers.get("Content-Type"), response.content)
+
+    def _emit(self, event: str, data: Dict):
+        """Emit a socket event, counting it when metrics are on"""
+        if self.metrics is None:
+            self.sio.emit(event, data)
+            return
+        with self.metrics.timed("socket_emit_seconds", span=f"emit {event}", event=event):
+            self.sio.emit(event, data)
+        self.metrics.inc("bytes_sent_total", payload_size(data), transport="socket")
+
+    def _call(self, event: str, data: Dict, timeout: float):
+        """Emit a socket event and wait for its acknowledgement"""
+        if self.metrics is None:
+            return self.sio.call(event, data, timeout=timeout)
+        with self.metrics.timed("socket_call_seconds", span=f"call {event}", event=event):
+            answer = self.sio.call(event, data, timeout=timeout)
+        self.metrics.inc("bytes_sent_total", payload_size(data), transport="socket")
+        self.metrics.inc("bytes_received_total", payload_size(answer), transport="socket")
+        return answer
+
+    def _on_connect(self):
+        self._connects += 1
+        if self.metrics is not None:
+            self.metrics.inc("connects_total")
+            if self._connects > 1:
+                self.metrics.inc("reconnects_total")
+        if self.stream is not None:
+            self.stream.connected()
+        if self._connects > 1 or self.stream is not None or self.subscription is not None:
+            # Off the socket thread: resuming waits for acknowledgements
+            threading.Thread(target=self._resume, args=(self._connects > 1,),
+                             name="amaip-resume", daemon=True).start()
+
+    def _resume(self, reconnect: bool):
+        try:
+            if reconnect:
+                logger.info("Reconnected, rejoining %d agent(s)", len(self._joins))
+                for payload in list(self._joins.values()):
+                    self._emit('agent:join', payload)
+            subscription = self.subscription
+            if subscription is not None and subscription.to_payload() != self._sent_topics:
+                # Topics added while the handshake was under way
+                self._call('events:subscribe', subscription.to_payload(), 10.0)
+            if self.stream is not None:
+                self.stream.resume()
+        except Exception:
+            logger.exception("Resuming the event stream failed")
+
+    def close(self) -> None:
+        """Release pooled connections owned by this client"""
+        if self.rpc is not None:
+            self.rpc.close()
+        if self._owns_session:
+            self.session.close()
 
     # ============ REST API Methods ============
 
     def register_agent(self, name: str, capabilities: List[str] = None, endpoint: str = None) -> Dict:
         """Register an agent on the platform"""
-        response = requests.post(
-            f"{self.api_url}/agents/register",
+        return self._request(
+            "POST", "/agents/register",
             json={"name": name, "capabilities": capabilities or [], "endpoint": endpoint}
         )
-        response.raise_for_status()
-        return response.json()
 
-    def get_agents(self) -> List[Dict]:
-        """Get all agents"""
-        response = requests.get(f"{self.api_url}/agents")
-        response.raise_for_status()
-        return response.json()
+    def get_agents(self, since_id: int = None, updated_after: str = None, limit: int = None) -> List[Dict]:
+        """Get all agents, or only those after a cursor (see iter_since)"""
+        return self._request("GET", "/agents", params=_cursor_params(since_id, updated_after, limit))
 
     def get_online_agents(self) -> List[Dict]:
         """Get online agents"""
-        response = requests.get(f"{self.api_url}/agents/online")
-        response.raise_for_status()
-        return response.json()
+        return self._request("GET", "/agents/online")
 
     def create_task(self, title: str, description: str = "", creator_agent_id: int = None, priority: int = 0) -> Dict:
         """Create a new task"""
-        response = requests.post(
-            f"{self.api_url}/tasks",
+        return self._request(
+            "POST", "/tasks",
             json={
                 "title": title,
                 "description": description,
@@ -45,77 +220,103 @@ class AMAIPClient:
                 "priority": priority
             }
         )
-        response.raise_for_status()
-        return response.json()
 
-    def get_tasks(self) -> List[Dict]:
-        """Get all tasks"""
-        response = requests.get(f"{self.api_url}/tasks")
-        response.raise_for_status()
-        return response.json()
+    def create_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """Create many tasks in one request
+
+        Each item takes the ``create_task`` arguments as keys (``title``,
+        ``description``, ``creator_agent_id``, ``priority``). Results come
+        back in order; failed items are ``{"error": ...}``.
+        """
+        return self._request(
+            "POST", "/tasks/batch",
+            json={"tasks": [{
+                "title": t["title"],
+                "description": t.get("description", ""),
+                "creatorAgentId": t.get("creator_agent_id"),
+                "priority": t.get("priority", 0)
+            } for t in tasks]}
+        )
+
+    def get_tasks(self, since_id: int = None, updated_after: str = None, limit: int = None) -> List[Dict]:
+        """Get all tasks, or only those after a cursor (see iter_since)"""
+        return self._request("GET", "/tasks", params=_cursor_params(since_id, updated_after, limit))
 
     def get_pending_tasks(self) -> List[Dict]:
         """Get pending tasks"""
-        response = requests.get(f"{self.api_url}/tasks/pending")
-        response.raise_for_status()
-        return response.json()
+        return self._request("GET", "/tasks/pending")
 
     def assign_task(self, task_id: int, agent_id: int) -> Dict:
         """Assign a task to an agent"""
-        response = requests.post(
-            f"{self.api_url}/tasks/{task_id}/assign",
+        return self._request(
+            "POST", f"/tasks/{task_id}/assign",
             json={"agentId": agent_id}
         )
-        response.raise_for_status()
-        return response.json()
 
     def complete_task(self, task_id: int, result: str = None) -> Dict:
         """Mark a task as completed"""
-        response = requests.post(
-            f"{self.api_url}/tasks/{task_id}/complete",
+        return self._request(
+            "POST", f"/tasks/{task_id}/complete",
             json={"result": result}
         )
-        response.raise_for_status()
-        return response.json()
+
+    def complete_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """Complete many tasks in one request
+
+        Each item has a ``task_id`` and an optional ``result``. Results come
+        back in order; failed items are ``{"error": ...}``.
+        """
+        return self._request(
+            "POST", "/tasks/batch/complete",
+            json={"tasks": [{"taskId": t["task_id"], "result": t.get("result")} for t in tasks]}
+        )
 
     def create_discussion(self, topic: str) -> Dict:
         """Create a new discussion"""
-        response = requests.post(
-            f"{self.api_url}/discussions",
+        return self._request(
+            "POST", "/discussions",
             json={"topic": topic}
         )
-        response.raise_for_status()
-        return response.json()
 
-    def get_discussions(self) -> List[Dict]:
-        """Get all discussions"""
-        response = requests.get(f"{self.api_url}/discussions")
-        response.raise_for_status()
-        return response.json()
+    def get_discussions(self, since_id: int = None, updated_after: str = None, limit: int = None) -> List[Dict]:
+        """Get all discussions, or only those after a cursor (see iter_since)"""
+        return self._request("GET", "/discussions", params=_cursor_params(since_id, updated_after, limit))
 
     def add_message(self, discussion_id: int, agent_id: int, content: str) -> Dict:
         """Add a message to a discussion"""
-        response = requests.post(
-            f"{self.api_url}/discussions/{discussion_id}/messages",
+        return self._request(
+            "POST", f"/discussions/{discussion_id}/messages",
             json={"agentId": agent_id, "content": content}
         )
-        response.raise_for_status()
-        return response.json()
 
-    def get_messages(self, discussion_id: int, limit: int = 100) -> List[Dict]:
-        """Get messages from a discussion"""
-        response = requests.get(
-            f"{self.api_url}/discussions/{discussion_id}/messages",
-            params={"limit": limit}
+    def add_messages(self, messages: List[Dict]) -> List[Dict]:
+        """Add many messages, possibly to different discussions, in one request
+
+        Each item has ``discussion_id``, ``agent_id`` and ``content``. Results
+        come back in order; failed items are ``{"error": ...}``.
+        """
+        return self._request(
+            "POST", "/discussions/messages/batch",
+            json={"messages": [{
+                "discussionId": m["discussion_id"],
+                "agentId": m["agent_id"],
+                "content": m["content"]
+            } for m in messages]}
+        )
+
+    def get_messages(self, discussion_id: int, limit: int = 100, since_id: int = None,
+                     updated_after: str = None) -> List[Dict]:
+        """Get the latest messages from a discussion, or the first page after a cursor"""
+        return self._request(
+            "GET", f"/discussions/{discussion_id}/messages",
+            params=_cursor_params(since_id, updated_after, limit)
         )
-        response.raise_for_status()
-        return response.json()
 
     def create_innovation(self, title: str, description: str = "", category: str = None,
                          agents_involved: List[int] = None, output_data: Dict = None) -> Dict:
         """Create an innovation"""
-        response = requests.post(
-            f"{self.api_url}/innovations",
+        return self._request(
+            "POST", "/innovations",
             json={
                 "title": title,
                 "description": description,
@@ -124,69 +325,221 @@ class AMAIPClient:
                 "outputData": output_data or {}
             }
         )
-        response.raise_for_status()
-        return response.json()
 
-    def get_innovations(self) -> List[Dict]:
-        """Get all innovations"""
-        response = requests.get(f"{self.api_url}/innovations")
-        response.raise_for_status()
-        return response.json()
+    def get_innovations(self, since_id: int = None, updated_after: str = None, limit: int = None) -> List[Dict]:
+        """Get all innovations, or only those after a cursor (see iter_since)"""
+        return self._request("GET", "/innovations", params=_cursor_params(since_id, updated_after, limit))
 
     def upvote_innovation(self, innovation_id: int) -> Dict:
         """Upvote an innovation"""
-        response = requests.put(f"{self.api_url}/innovations/{innovation_id}/vote")
-        response.raise_for_status()
-        return response.json()
+        return self._request("PUT", f"/innovations/{innovation_id}/vote")
+
+    def iter_since(self, collection: str, since_id: int = 0, updated_after: str = None,
+                   page_size: int = 100, discussion_id: int = None,
+                   prefetch: bool = False) -> Iterator[Dict]:
+        """Lazily page through records created (or changed) after a cursor
+
+        ``collection`` is one of ``agents``, ``tasks``, ``discussions``,
+        ``innovations`` or ``messages`` (which needs ``discussion_id``).
+        Records come in ascending id order, one page request at a time.
+        With ``prefetch`` the next page is fetched in the background while
+        the current one is consumed, so at most two pages are held.
+        """
+        fetch = self._cursor_fetcher(collection, discussion_id)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="amaip-prefetch") if prefetch else None
+        try:
+            page = fetch(since_id=since_id, updated_after=updated_after, limit=page_size)
+            while True:
+                next_page = None
+                if len(page) == page_size and executor is not None:
+                    next_page = executor.submit(
+                        fetch, since_id=page[-1]['id'], updated_after=updated_after, limit=page_size
+                    )
+                yield from page
+                if len(page) < page_size:
+                    return
+                if next_page is not None:
+                    page = next_page.result()
+                else:
+                    page = fetch(since_id=page[-1]['id'], updated_after=updated_after, limit=page_size)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def iter_tasks(self, page_size: int = 100, since_id: int = 0) -> Iterator[Dict]:
+        """Stream all tasks in id order with flat memory, prefetching the next page"""
+        return self.iter_since("tasks", since_id=since_id, page_size=page_size, prefetch=True)
+
+    def iter_innovations(self, page_size: int = 100, since_id: int = 0) -> Iterator[Dict]:
+        """Stream all innovations in id order with flat memory, prefetching the next page"""
+        return self.iter_since("innovations", since_id=since_id, page_size=page_size, prefetch=True)
+
+    def iter_messages(self, discussion_id: int, page_size: int = 100, since_id: int = 0) -> Iterator[Dict]:
+        """Stream a discussion from its first message with flat memory, prefetching the next page"""
+        return self.iter_since(
+            "messages", since_id=since_id, page_size=page_size,
+            discussion_id=discussion_id, prefetch=True
+        )
+
+    def delta(self, collection: str, discussion_id: int = None, page_size: int = 100) -> DeltaCursor:
+        """Get a cursor that returns only records new or changed since its last poll"""
+        return DeltaCursor(self, collection, discussion_id=discussion_id, page_size=page_size)
+
+    def _cursor_fetcher(self, collection: str, discussion_id: int = None) -> Callable:
+        if collection == "messages":
+            if discussion_id is None:
+                raise ValueError("discussion_id is required for messages")
+            return lambda **cursor: self.get_messages(discussion_id, **cursor)
+        fetchers = {
+            "agents": self.get_agents,
+            "tasks": self.get_tasks,
+            "discussions": self.get_discussions,
+            "innovations": self.get_innovations,
+        }
+        if collection not in fetchers:
+            raise ValueError(f"Unknown collection: {collection}")
+        return fetchers[collection]
+
+    def batcher(self, max_batch: int = 50, flush_interval: float = 0.05) -> BatchWriter:
+        """Get a writer that coalesces single writes into batch requests"""
+        return BatchWriter(self, max_batch=max_batch, flush_interval=flush_interval)
 
     # ============ WebSocket Methods ============
 
     def connect(self) -> None:
         """Connect to WebSocket server"""
-        self.sio.connect(self.base_url)
+        self.sio.connect(self.base_url, auth=self._auth)
+
+    def connect_in_background(self) -> Future:
+        """Start connecting on another thread, so the handshake overlaps other startup work
+
+        The returned future resolves once connected, or raises the connection error.
+        """
+        future: Future = Future()
+
+        def run():
+            try:
+                self.connect()
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+
+        threading.Thread(target=run, name="amaip-connect", daemon=True).start()
+        return future
+
+    def _auth(self) -> Dict:
+        """Connection payload, sent on every (re)connect: the subscription, if any"""
+        if self.subscription is None:
+            self._sent_topics = None
+            return {}
+        self._sent_topics = self.subscription.to_payload()
+        return {"subscribe": self._sent_topics}
 
     def disconnect(self) -> None:
         """Disconnect from WebSocket server"""
-        self.sio.disconnect()
+        if self._sio is not None:
+            self._sio.disconnect()
+
+    def subscribe(self, discussions: Iterable[int] = (), capabilities: Iterable[str] = (),
+                  assigned_to: Iterable[int] = (), events: Iterable[str] = (),
+                  timeout: float = 10.0) -> Optional[Dict]:
+        """Receive only the events for these topics instead of every broadcast
+
+        Messages of ``discussions``, tasks mentioning one of ``capabilities``,
+        tasks assigned to the agents in ``assigned_to``, and every event named
+        in ``events``. Calls add up. Before :meth:`connect` the topics are
+        sent with the connection and None is returned; after it, the server's
+        acknowledgement is. Every reconnect sends them again.
+        """
+        topics = Subscription(discussions, capabilities, assigned_to, events)
+        if self.subscription is None:
+            self.subscription = topics
+        else:
+            self.subscription.update(topics)
+        if not self.connected:
+            return None
+        return self._call('events:subscribe', topics.to_payload(), timeout)
+
+    def unsubscribe(self, timeout: float = 10.0) -> Optional[Dict]:
+        """Go back to receiving every broadcast"""
+        self.subscription = None
+        if not self.connected:
+            return None
+        return self._call('events:unsubscribe', {}, timeout)
 
     def emit_agent_join(self, name: str, capabilities: List[str] = None, endpoint: str = None):
-        """Emit agent join event"""
-        self.sio.emit('agent:join', {
+        """Emit agent join event (repeated automatically after a reconnect)"""
+        payload = {
             "name": name,
             "capabilities": capabilities or [],
             "endpoint": endpoint
-        })
+        }
+        self._joins[name] = payload
+        self._emit('agent:join', payload)
+
+    @staticmethod
+    def _as_agent(payload: Dict, agent_id: Optional[int]) -> Dict:
+        """Name the acting agent when several agents share this socket"""
+        if agent_id is not None:
+            payload["agentId"] = agent_id
+        return payload
 
-    def emit_message(self, discussion_id: int, content: str):
+    def emit_message(self, discussion_id: int, content: str, agent_id: int = None):
         """Emit a message"""
-        self.sio.emit('agent:message', {
+        self._emit('agent:message', self._as_agent({
             "discussionId": discussion_id,
             "content": content
-        })
+        }, agent_id))
+
+    def emit_message_chunk(self, stream_id: str, discussion_id: int, delta: str, agent_id: int = None):
+        """Emit a partial chunk of a streamed message"""
+        self._emit('agent:message:chunk', self._as_agent({
+            "streamId": stream_id,
+            "discussionId": discussion_id,
+            "delta": delta
+        }, agent_id))
 
-    def emit_task_create(self, title: str, description: str = "", priority: int = 0):
+    def emit_message_end(self, stream_id: str, discussion_id: int, content: str, agent_id: int = None):
+        """Finish a streamed message; the server stores ``content`` as the message"""
+        self._emit('agent:message:end', self._as_agent({
+            "streamId": stream_id,
+            "discussionId": discussion_id,
+            "content": content
+        }, agent_id))
+
+    def emit_task_create(self, title: str, description: str = "", priority: int = 0, agent_id: int = None):
         """Emit task creation"""
-        self.sio.emit('task:create', {
+        self._emit('task:create', self._as_agent({
             "title": title,
             "description": description,
             "priority": priority
-        })
+        }, agent_id))
 
-    def emit_task_claim(self, task_id: int):
+    def emit_task_claim(self, task_id: int, agent_id: int = None):
         """Emit task claim"""
-        self.sio.emit('task:claim', {"taskId": task_id})
+        self._emit('task:claim', self._as_agent({"taskId": task_id}, agent_id))
+
+    def claim_task(self, task_id: int, agent_id: int = None, timeout: float = 5.0) -> Dict:
+        """Claim a task and wait for the server's answer
 
-    def emit_task_complete(self, task_id: int, result: str = None):
+        Returns ``{"success": True, "task": {...}}`` or
+        ``{"success": False, "error": "..."}``. Raises
+        ``socketio.exceptions.TimeoutError`` if no answer arrives in time.
+        """
+        return self._call('task:claim', self._as_agent({"taskId": task_id}, agent_id), timeout)
+
+    def emit_task_complete(self, task_id: int, result: str = None, agent_id: int = None):
         """Emit task completion"""
-        self.sio.emit('task:complete', {
+        self._emit('task:complete', self._as_agent({
             "taskId": task_id,
             "result": result
-        })
+        }, agent_id))
 
     def emit_innovation_create(self, title: str, description: str = "", category: str = None,
                               agents_involved: List[int] = None, output_data: Dict = None):
         """Emit innovation creation"""
-        self.sio.emit('innovation:create', {
+        self._emit('innovation:create', {
             "title": title,
             "description": description,
             "category": category,
@@ -195,8 +548,60 @@ class AMAIPClient:
         })
 
     def on(self, event: str, handler: Callable):
-        """Register event handler"""
-        self.sio.on(event, handler)
+        """Register event handler (replaces any previous handler for the event)"""
+        self._handlers[event] = handler
+        self._bind(event)
+
+    def add_listener(self, event: str, listener: Callable):
+        """Observe an event without replacing its handler
+
+        Listeners run, in registration order, before the event's handler.
+        """
+        self._listeners.setdefault(event, []).append(listener)
+        self._bind(event)
+
+    def remove_listener(self, event: str, listener: Callable):
+        """Stop a listener added with :meth:`add_listener` from observing the event"""
+        listeners = self._listeners.get(event, [])
+        if listener in listeners:
+            listeners.remove(listener)
+
+    def _bind(self, event: str):
+        """Route a socket event through our handler and listeners (once the socket client exists)"""
+        with self._sio_lock:
+            if self._sio is not None and not self._sio.handlers.get('/', {}).get(event):
+                self._sio.on(event, self._router(event))
+
+    def _router(self, event: str) -> Callable:
+        return lambda *args: self._trigger(event, *args)
+
+    def _trigger(self, event: str, *args):
+        if self.stream is not None and args and not self.stream.accept(event, args[0]):
+            return None
+        return self._dispatch(event, *args)
+
+    def _dispatch(self, event: str, *args):
+        """Run an event's listeners and handler"""
+        if self.metrics is not None:
+            return self._dispatch_measured(event, *args)
+        for listener in self._listeners.get(event, ()):
+            listener(*args)
+        handler = self._handlers.get(event)
+        if handler is not None:
+            return handler(*args)
+
+    def _dispatch_measured(self, event: str, *args):
+        metrics = self.metrics
+        metrics.inc("events_received_total", event=event)
+        if args:
+            metrics.inc("bytes_received_total", payload_size(args[0] if len(args) == 1 else args), transport="socket")
+        with metrics.timed("event_handler_seconds", span=f"handle {event}", event=event):
+            for listener in self._listeners.get(event, ()):
+                listener(*args)
+            handler = self._handlers.get(event)
+            result = handler(*args) if handler is not None else None
+        metrics.inc("events_handled_total", event=event)
+        return result
 
     def wait(self):
         """Wait for socket connection"""
@@ -0,0 +1,198 @@
+import itertools
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional
+
+DROP = "drop"
+BLOCK = "block"
+COALESCE = "coalesce"
+OVERFLOW_POLICIES = (DROP, BLOCK, COALESCE)
+
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    __slots__ = ("seq", "fn", "args", "key")
+
+    def __init__(self, seq: int, fn: Callable, args: tuple, key: Optional[Hashable]):
+        self.seq = seq
+        self.fn = fn
+        self.args = args
+        self.key = key
+
+
+class _Lane:
+    """Queue and concurrency accounting for one event type"""
+
+    def __init__(self, limit: int, max_queue: int, overflow: str):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.queue = deque()
+        self.running = 0
+        self.dropped = 0
+
+
+class EventDispatcher:
+    """Runs agent hooks on a bounded worker pool instead of the socket thread
+
+    Each event type gets its own lane with a concurrency ``limit`` and a
+    bounded queue. When a lane's queue is full the ``overflow`` policy
+    decides what happens to a new event:
+
+    - ``"drop"``: the new event is discarded
+    - ``"block"``: the caller (the socket reader) waits for room
+    - ``"coalesce"``: a queued event with the same key is replaced by the
+      new one; without a match the oldest queued event is discarded
+
+    With ``ordered=True`` events sharing a key (e.g. the same task id) run
+    one at a time in arrival order, across event types.
+
+    ``executor`` must run hooks in this process (e.g. a
+    ``ThreadPoolExecutor``): hooks are bound methods of their agent, which
+    holds locks and sockets, and they change the agent's own state.
+    """
+
+    def __init__(self, max_workers: int = 8, executor: Optional[Executor] = None,
+                 limits: Optional[Dict[str, int]] = None, default_limit: Optional[int] = None,
+                 max_queue: int = 1000, overflow: str = BLOCK,
+                 overflow_by_event: Optional[Dict[str, str]] = None, ordered: bool = True):
+        for policy in [overflow] + list((overflow_by_event or {}).values()):
+            if policy not in OVERFLOW_POLICIES:
+                raise ValueError(f"Unknown overflow policy: {policy}")
+        if isinstance(executor, ProcessPoolExecutor):
+            raise ValueError("Hooks must run in this process; use a thread pool executor")
+
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="amaip-dispatch"
+        )
+        self.limits = limits or {}
+        self.default_limit = default_limit or max_workers
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.overflow_by_event = overflow_by_event or {}
+        self.ordered = ordered
+
+        self._lanes: Dict[str, _Lane] = {}
+        self._active_keys = set()
+        self._pending_keys: Dict[Hashable, deque] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _lane(self, event: str) -> _Lane:
+        lane = self._lanes.get(event)
+        if lane is None:
+            lane = _Lane(
+                self.limits.get(event, self.default_limit),
+                self.max_queue,
+                self.overflow_by_event.get(event, self.overflow)
+            )
+            self._lanes[event] = lane
+        return lane
+
+    def submit(self, event: str, fn: Callable, *args, key: Optional[Hashable] = None) -> bool:
+        """Queue ``fn(*args)`` for ``event``. Returns False if it was dropped."""
+        with self._cond:
+            if self._closed:
+                return False
+            lane = self._lane(event)
+
+            if lane.overflow == COALESCE and key is not None:
+                for job in lane.queue:
+                    if job.key == key:
+                        job.fn, job.args = fn, args
+                        return True
+
+            if len(lane.queue) >= lane.max_queue:
+                if lane.overflow == DROP:
+                    lane.dropped += 1
+                    return False
+                if lane.overflow == COALESCE:
+                    self._forget(lane.queue.popleft())
+                    lane.dropped += 1
+                else:
+                    while len(lane.queue) >= lane.max_queue and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return False
+
+            job = _Job(next(self._seq), fn, args, key)
+            lane.queue.append(job)
+            if self.ordered and key is not None:
+                self._pending_keys.setdefault(key, deque()).append(job.seq)
+            self._pump()
+        return True
+
+    def _forget(self, job: _Job):
+        """Remove a discarded job from the per-key ordering bookkeeping"""
+        if self.ordered and job.key is not None:
+            pending = self._pending_keys[job.key]
+            pending.remove(job.seq)
+            if not pending:
+                del self._pending_keys[job.key]
+
+    def _runnable(self, job: _Job) -> bool:
+        if not self.ordered or job.key is None:
+            return True
+        return job.key not in self._active_keys and self._pending_keys[job.key][0] == job.seq
+
+    def _pump(self):
+        """Start queued jobs while lanes have free slots. Caller holds the lock."""
+        for event, lane in self._lanes.items():
+            while lane.running < lane.limit and lane.queue:
+                job = next((j for j in lane.queue if self._runnable(j)), None)
+                if job is None:
+                    break
+                lane.queue.remove(job)
+                lane.running += 1
+                if self.ordered and job.key is not None:
+                    self._pending_keys[job.key].popleft()
+                    if not self._pending_keys[job.key]:
+                        del self._pending_keys[job.key]
+                    self._active_keys.add(job.key)
+                future = self.executor.submit(job.fn, *job.args)
+                future.add_done_callback(
+                    lambda f, event=event, lane=lane, job=job: self._done(f, event, lane, job)
+                )
+        self._cond.notify_all()
+
+    def _done(self, future, event: str, lane: _Lane, job: _Job):
+        if not future.cancelled() and future.exception() is not None:
+            error = future.exception()
+            logger.error("Error in %s handler: %r", event, error,
+                         exc_info=(type(error), error, error.__traceback__), extra={"event": event})
+        with self._cond:
+            lane.running -= 1
+            self._active_keys.discard(job.key)
+            self._pump()
+
+    def queue_depth(self, event: Optional[str] = None) -> int:
+        """Number of queued (not yet running) hook calls"""
+        with self._cond:
+            if event is not None:
+                lane = self._lanes.get(event)
+                return len(lane.queue) if lane else 0
+            return sum(len(lane.queue) for lane in self._lanes.values())
+
+    def dropped(self, event: Optional[str] = None) -> int:
+        """Number of hook calls discarded by the overflow policy"""
+        with self._cond:
+            if event is not None:
+                lane = self._lanes.get(event)
+                return lane.dropped if lane else 0
+            return sum(lane.dropped for lane in self._lanes.values())
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting events and, if we own it, shut the pool down"""
+        with self._cond:
+            self._closed = True
+            for lane in self._lanes.values():
+                lane.queue.clear()
+            self._pending_keys.clear()
+            self._cond.notify_all()
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
@@ -0,0 +1,140 @@
+import logging
+from typing import Dict, List, Optional
+
+import requests
+
+from .agent import Agent
+from .cache import PlatformCache
+from .client import AMAIPClient
+from .dispatch import EventDispatcher
+from .log import ensure_logging
+
+logger = logging.getLogger(__name__)
+
+
+class AgentFleet:
+    """Hosts many agents in one process over a single socket connection
+
+    Every agent is registered and joined over the shared client, and each
+    incoming broadcast is decoded once and fanned out to all local agents.
+    Actions taken by an agent carry its id so the server attributes them
+    to the right agent. Agents sharing a ``ClaimPolicy`` with a
+    :class:`~amaip.claims.HashRing` are put on the ring so they stop racing
+    each other for the same task. Agents created with ``cache=True`` share one
+    :class:`~amaip.cache.PlatformCache` over the fleet's connection. Agents'
+    subscriptions add up, since they share the socket.
+
+        fleet = AgentFleet()
+        fleet.add(DataAnalystAgent(name="Analyst-1", capabilities=["data"]))
+        fleet.add(ResearchAgent(name="Researcher-1", capabilities=["research"]))
+        fleet.start()
+    """
+
+    def __init__(self, base_url: str = "http://localhost:3000",
+                 session: Optional[requests.Session] = None,
+                 dispatcher: Optional[EventDispatcher] = None,
+                 client: Optional[AMAIPClient] = None):
+        self.base_url = base_url
+        self.client = client or AMAIPClient(base_url, session=session)
+        self.dispatcher = dispatcher
+        self.agents: List[Agent] = []
+        self._by_id: Dict[int, Agent] = {}
+        self.cache: Optional[PlatformCache] = None
+        self._running = False
+
+    def add(self, agent: Agent) -> Agent:
+        """Add an agent to the fleet. Must be called before start()."""
+        if agent.client is not self.client:
+            agent.client.close()
+            agent.client = self.client
+        if agent.dispatcher is None:
+            agent.dispatcher = self.dispatcher
+        self.agents.append(agent)
+        return agent
+
+    def start(self):
+        """Register, connect and join every agent, then run until interrupted"""
+        ensure_logging()
+        logger.info("Starting fleet of %d agents", len(self.agents))
+
+        # The socket handshake overlaps the agents' REST registrations
+        connecting = self.client.connect_in_background()
+        for agent in self.agents:
+            agent._register()
+            self._by_id[agent.agent_id] = agent
+            if agent.claim_policy and agent.claim_policy.ring is not None:
+                agent.claim_policy.ring.add(agent.agent_id)
+        connecting.result()
+
+        # Handlers go in before joining so no join confirmation is missed
+        self._setup_event_handlers()
+        for agent in self.agents:
+            agent._apply_subscriptions()
+        for agent in self.agents:
+            self.client.emit_agent_join(agent.name, agent.capabilities)
+        logger.info("Fleet connected over one WebSocket")
+
+        for agent in self.agents:
+            if agent.cache is True:
+                if self.cache is None:
+                    self.cache = PlatformCache(self.client)
+                agent.cache = self.cache
+            agent._start_cache()
+
+        for agent in self.agents:
+            agent._running = True
+            agent.on_start()
+
+        self._running = True
+        try:
+            self.client.wait()
+        except KeyboardInterrupt:
+            logger.warning("Fleet interrupted")
+            self.stop()
+
+    def stop(self):
+        """Stop every agent and close the shared connection"""
+        self._running = False
+        for agent in self.agents:
+            agent._running = False
+            agent.on_stop()
+        self.client.disconnect()
+        self.client.close()
+        for agent in self.agents:
+            if isinstance(agent.cache, PlatformCache):
+                agent.cache.stop()
+        dispatchers = {id(a.dispatcher): a.dispatcher for a in self.agents if a.dispatcher}
+        for dispatcher in dispatchers.values():
+            dispatcher.shutdown(wait=False)
+        timers = {id(a.timers): a.timers for a in self.agents if a.timers}
+        for scheduler in timers.values():
+            scheduler.shutdown()
+        logger.info("Fleet stopped")
+
+    def _setup_event_handlers(self):
+        """Register one socket handler per event that fans out locally"""
+        routes: Dict[str, List] = {}
+        for agent in self.agents:
+            for event, handler in agent._event_handlers().items():
+                routes.setdefault(event, []).append((agent, handler))
+        routes.pop('agent:joined', None)
+
+        self.client.on('agent:joined', self._on_joined)
+        for event, targets in routes.items():
+            self.client.on(event, self._fan_out(event, targets))
+
+    def _fan_out(self, event: str, targets: List):
+        def handler(data):
+            for agent, agent_handler in targets:
+                try:
+                    agent_handler(data)
+                except Exception:
+                    logger.exception("%s failed handling %s", agent.name, event,
+                                     extra={"agent": agent.name, "event": event})
+        return handler
+
+    def _on_joined(self, data):
+        """Route a join confirmation to the agent it belongs to"""
+        agent = self._by_id.get((data.get('agent') or {}).get('id'))
+        if agent:
+            agent._on_joined(data)
@@ -0,0 +1,488 @@
+"""Shared LLM gateway for agents
+
+Every prompt goes through one :class:`LLMGateway`, which adds, in front of
+any provider:
+
+- a content-addressed prompt -> response cache with TTL and LRU eviction,
+  optionally persisted to an append-only file
+- coalescing: identical prompts already in flight share one provider call
+- per-provider token-bucket rate limiting and a concurrency cap
+- pooled HTTP connections for the HTTP providers
+- token streaming (``stream``) for providers that support it
+
+    gateway = get_gateway()
+    gateway.register(GeminiProvider(api_key), rate=1.0, burst=5)
+    text = gateway.complete("gemini", "Introduce yourself in one sentence.")
+
+:class:`StubProvider` answers locally, for tests and benchmarks.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from .metrics import Metrics
+from .transport import create_session
+
+
+class LLMError(Exception):
+    """Raised when a provider returns an error instead of a completion"""
+
+
+def _sse_events(response) -> Iterator[Dict]:
+    """Decode the JSON ``data:`` lines of a server-sent-events response"""
+    for line in response.iter_lines(decode_unicode=True):
+        if line and line.startswith("data:"):
+            payload = line[5:].strip()
+            if payload and payload != "[DONE]":
+                yield json.loads(payload)
+
+
+# ============ Providers ============
+
+class Provider:
+    """A model backend. Subclasses implement ``complete``."""
+
+    name = "provider"
+
+    def complete(self, prompt: str, system: Optional[str] = None, model: Optional[str] = None,
+                 max_tokens: int = 200, temperature: float = 0.9) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str, **options) -> Iterator[str]:
+        """Yield the completion in pieces. Non-streaming providers yield it whole."""
+        yield self.complete(prompt, **options)
+
+
+class GeminiProvider(Provider):
+    """Google Gemini over the REST API, using a pooled session"""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model: str = "gemini-2.5-flash",
+                 base_url: str = "https://generativelanguage.googleapis.com/v1",
+                 session: Optional[requests.Session] = None, timeout: float = 10.0):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.session = session or create_session()
+        self.timeout = timeout
+
+    def _body(self, prompt, system, max_tokens, temperature, stop) -> Dict:
+        text = f"{system}\n\n{prompt}" if system else prompt
+        config = {"temperature": temperature, "maxOutputTokens": max_tokens}
+        if stop:
+            config["stopSequences"] = stop
+        return {"contents": [{"parts": [{"text": text}]}], "generationConfig": config}
+
+    def complete(self, prompt, system=None, model=None, max_tokens=200, temperature=0.9, stop=None):
+        response = self.session.post(
+            f"{self.base_url}/models/{model or self.model}:generateContent",
+            params={"key": self.api_key},
+            json=self._body(prompt, system, max_tokens, temperature, stop),
+            timeout=self.timeout
+        )
+        result = response.json()
+        if not result.get('candidates'):
+            raise LLMError(f"Gemini API error: {result}")
+        return result['candidates'][0]['content']['parts'][0]['text']
+
+    def stream(self, prompt, system=None, model=None, max_tokens=200, temperature=0.9, stop=None):
+        with self.session.post(
+            f"{self.base_url}/models/{model or self.model}:streamGenerateContent",
+            params={"key": self.api_key, "alt": "sse"},
+            json=self._body(prompt, system, max_tokens, temperature, stop),
+            timeout=self.timeout,
+            stream=True
+        ) as response:
+            if response.status_code >= 400:
+                raise LLMError(f"Gemini API error: {response.text}")
+            for event in _sse_events(response):
+                for candidate in event.get('candidates', []):
+                    for part in candidate.get('content', {}).get('parts', []):
+                        if part.get('text'):
+                            yield part['text']
+
+
+class AnthropicProvider(Provider):
+    """Anthropic Messages API over HTTP, using a pooled session"""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: str, model: str = "claude-3-5-sonnet-20241022",
+                 base_url: str = "https://api.anthropic.com/v1",
+                 session: Optional[requests.Session] = None, timeout: float = 30.0):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.session = session or create_session()
+        self.timeout = timeout
+
+    def _post(self, prompt, system, model, max_tokens, temperature, stream=False):
+        body = {
+            "model": model or self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system:
+            body["system"] = system
+        if stream:
+            body["stream"] = True
+        return self.session.post(
+            f"{self.base_url}/messages",
+            headers={"x-api-key": self.api_key, "anthropic-version": "2023-06-01"},
+            json=body,
+            timeout=self.timeout,
+            stream=stream
+        )
+
+    def complete(self, prompt, system=None, model=None, max_tokens=200, temperature=0.9):
+        response = self._post(prompt, system, model, max_tokens, temperature)
+        result = response.json()
+        if response.status_code >= 400 or not result.get('content'):
+            raise LLMError(f"Anthropic API error: {result}")
+        return result['content'][0]['text']
+
+    def stream(self, prompt, system=None, model=None, max_tokens=200, temperature=0.9):
+        with self._post(prompt, system, model, max_tokens, temperature, stream=True) as response:
+            if response.status_code >= 400:
+                raise LLMError(f"Anthropic API error: {response.text}")
+            for event in _sse_events(response):
+                if event.get('type') == 'content_block_delta':
+                    text = event.get('delta', {}).get('text')
+                    if text:
+                        yield text
+                elif event.get('type') == 'error':
+                    raise LLMError(f"Anthropic API error: {event}")
+
+
+class CallableProvider(Provider):
+    """Wraps any ``fn(prompt, system=..., model=..., max_tokens=..., temperature=...)``
+
+    Useful for vendor SDK clients (e.g. ``google.generativeai``). Pass
+    ``stream_fn`` with the same signature, returning an iterator of text
+    pieces, to support streaming.
+    """
+
+    def __init__(self, name: str, fn: Callable[..., str], stream_fn: Optional[Callable[..., Iterator[str]]] = None):
+        self.name = name
+        self.fn = fn
+        self.stream_fn = stream_fn
+
+    def complete(self, prompt, **options):
+        return self.fn(prompt, **options)
+
+    def stream(self, prompt, **options):
+        if self.stream_fn is None:
+            yield self.fn(prompt, **options)
+        else:
+            yield from self.stream_fn(prompt, **options)
+
+
+class StubProvider(Provider):
+    """Local provider for tests: canned or computed replies, optional latency"""
+
+    def __init__(self, reply: Optional[Callable[[str], str]] = None, latency: float = 0.0,
+                 name: str = "stub"):
+        self.name = name
+        self.reply = reply or (lambda prompt: f"stub reply to: {prompt}")
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt, **options):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.reply(prompt)
+
+    def stream(self, prompt, **options):
+        """Yield the reply word by word, spreading ``latency`` across the words"""
+        with self._lock:
+            self.calls += 1
+        words = self.reply(prompt).split(" ")
+        for i, word in enumerate(words):
+            if self.latency:
+                time.sleep(self.latency / len(words))
+            yield word if i == 0 else " " + word
+
+
+# ============ Cache and limits ============
+
+class ResponseCache:
+    """Prompt -> response cache with TTL and LRU eviction
+
+    With ``path`` set, entries are appended to a JSON-lines file and loaded
+    back (minus expired ones) on start, so a restarted agent keeps its cache.
+    The file is rewritten with only the live entries on load and whenever it
+    grows past ``compact_factor`` times ``max_entries`` lines.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600.0, path: Optional[str] = None,
+                 compact_factor: int = 2):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.compact_factor = compact_factor
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lines = 0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _load(self):
+        with open(self.path) as f:
+            for line in f:
+                # Counted even if unreadable, so a torn line is compacted away
+                # instead of having the next entry appended onto it
+                self._lines += 1
+                try:
+                    key, value, stored_at = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from a crash
+                if not self._expired(stored_at):
+                    self._entries[key] = (value, stored_at)
+                    self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self._lines > len(self._entries):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the file with only the live entries. Caller holds the lock (or is loading)."""
+        temp = f"{self.path}.tmp"
+        with open(temp, "w") as f:
+            for key, (value, stored_at) in self._entries.items():
+                f.write(json.dumps([key, value, stored_at]) + "\n")
+        os.replace(temp, self.path)
+        self._lines = len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[1]):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: str):
+        stored_at = time.time()
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps([key, value, stored_at]) + "\n")
+                self._lines += 1
+                if self._lines > self.compact_factor * self.max_entries:
+                    self._compact()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TokenBucket:
+    """Allows ``rate`` calls per second with bursts of up to ``burst``"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# ============ Gateway ============
+
+class LLMGateway:
+    """Routes prompts to providers through one cache, limiter and coalescer
+
+    With a :class:`~amaip.metrics.Metrics`, provider call latency and cache
+    hits are recorded per provider.
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None, max_workers: int = 8,
+                 metrics: Optional[Metrics] = None):
+        self.cache = cache if cache is not None else ResponseCache()
+        self.max_workers = max_workers
+        self.metrics = metrics
+        self._providers: Dict[str, Provider] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._slots: Dict[str, threading.Semaphore] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "cache_hits": 0, "coalesced": 0}
+
+    def register(self, provider: Provider, rate: Optional[float] = None, burst: float = 1.0,
+                 max_concurrency: Optional[int] = None) -> Provider:
+        """Add (or replace) a provider, with optional calls/second and concurrency limits"""
+        self._providers[provider.name] = provider
+        self._buckets.pop(provider.name, None)
+        self._slots.pop(provider.name, None)
+        if rate:
+            self._buckets[provider.name] = TokenBucket(rate, burst)
+        if max_concurrency:
+            self._slots[provider.name] = threading.Semaphore(max_concurrency)
+        return provider
+
+    def has_provider(self, name: str) -> bool:
+        return name in self._providers
+
+    @staticmethod
+    def cache_key(provider: str, prompt: str, **options) -> str:
+        """Content address of a request"""
+        body = json.dumps({"provider": provider, "prompt": prompt, **options}, sort_keys=True)
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    def complete(self, provider: str, prompt: str, use_cache: bool = True, **options) -> str:
+        """Get a completion, from cache, from an identical in-flight call, or from the provider"""
+        if provider not in self._providers:
+            raise LLMError(f"Unknown LLM provider: {provider}")
+        key = self.cache_key(provider, prompt, **options)
+
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count("cache_hits")
+                if self.metrics is not None:
+                    self.metrics.inc("llm_cache_hits_total", provider=provider)
+                return cached
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = Future()
+                self._inflight[key] = pending
+                leader = True
+            else:
+                leader = False
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            return pending.result()
+
+        try:
+            text = self._call(provider, prompt, **options)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            if use_cache:
+                self.cache.set(key, text)
+            pending.set_result(text)
+            return text
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _call(self, provider: str, prompt: str, **options) -> str:
+        bucket = self._buckets.get(provider)
+        if bucket:
+            bucket.acquire()
+        slot = self._slots.get(provider)
+        if slot:
+            slot.acquire()
+        try:
+            self._count("calls")
+            if self.metrics is None:
+                return self._providers[provider].complete(prompt, **options)
+            with self.metrics.timed("llm_request_seconds", span=f"llm {provider}", provider=provider):
+                return self._providers[provider].complete(prompt, **options)
+        finally:
+            if slot:
+                slot.release()
+
+    def stream(self, provider: str, prompt: str, use_cache: bool = True, **options) -> Iterator[str]:
+        """Yield a completion as it is generated
+
+        A cached answer is yielded in one piece. A streamed answer is cached
+        once it completes. Identical in-flight streams are not coalesced.
+        """
+        if provider not in self._providers:
+            raise LLMError(f"Unknown LLM provider: {provider}")
+        key = self.cache_key(provider, prompt, **options)
+
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count("cache_hits")
+                if self.metrics is not None:
+                    self.metrics.inc("llm_cache_hits_total", provider=provider)
+                yield cached
+                return
+
+        bucket = self._buckets.get(provider)
+        if bucket:
+            bucket.acquire()
+        slot = self._slots.get(provider)
+        if slot:
+            slot.acquire()
+        started = time.perf_counter()
+        try:
+            self._count("calls")
+            parts = []
+            for piece in self._providers[provider].stream(prompt, **options):
+                if not parts and self.metrics is not None:
+                    self.metrics.observe("llm_first_token_seconds", time.perf_counter() - started, provider=provider)
+                parts.append(piece)
+                yield piece
+        finally:
+            if slot:
+                slot.release()
+        if self.metrics is not None:
+            # Not a span: the generator may be consumed across other timed work
+            self.metrics.observe("llm_request_seconds", time.perf_counter() - started, provider=provider)
+        if use_cache:
+            self.cache.set(key, "".join(parts))
+
+    def complete_many(self, provider: str, prompts: List[str], **options) -> List[str]:
+        """Run several prompts concurrently (within the provider's limits)"""
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(prompts) or 1)) as pool:
+            return list(pool.map(lambda p: self.complete(provider, p, **options), prompts))
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Get the process-wide gateway shared by all agents"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
@@ -0,0 +1,201 @@
+"""Logging for the SDK
+
+All SDK modules log to the ``amaip`` logger hierarchy with lazy ``%``
+formatting; nothing is printed. Per-event messages carry an ``event``
+attribute (``task:created``, ``message:new``, ...) plus ids, which the
+filters here and :class:`JsonFormatter` use.
+
+An application that configures :mod:`logging` itself gets the SDK's
+records like any other library's. Otherwise :class:`~amaip.agent.Agent`
+calls :func:`ensure_logging` on start, which installs the default from
+:func:`configure_logging`: records are queued to a background thread, so
+handling an event never waits on a slow or full stdout, and each event
+type is rate limited.
+
+    configure_logging(level=logging.INFO, rate=5, sample={"message:new": 0.1}, json=True)
+"""
+
+import atexit
+import json as _json
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+logger = logging.getLogger("amaip")
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per event type (or per message, for records without one)
+
+    Lets ``burst`` records through at once and ``rate`` per second after
+    that. The next record let through reports how many were suppressed.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: float = 50.0):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "event", None) or (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, suppressed = self._buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[key] = (tokens - 1, now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fixed share of each event type's records, e.g. ``{"message:new": 0.1}``
+
+    Records without an ``event`` attribute, and events not listed, all pass.
+    Sampling is by count (every n-th record), so it is even and repeatable.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.every = {event: max(1, round(1 / rate)) if rate > 0 else 0 for event, rate in rates.items()}
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        every = self.every.get(event)
+        if every is None:
+            return True
+        if every == 0:
+            return False
+        with self._lock:
+            seen = self._seen.get(event, 0)
+            self._seen[event] = seen + 1
+        return seen % every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the record's ``extra`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return _json.dumps(entry, default=str)
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} ({suppressed} similar suppressed)" if suppressed else text
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records when the queue is full instead of blocking
+
+    Records are queued unformatted: the message is built on the listener
+    thread, not the thread that logged it.
+    """
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_installed = []
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+
+def configure_logging(level: int = logging.INFO, stream=None, rate: Optional[float] = 20.0,
+                      burst: float = 50.0, sample: Optional[Dict[str, float]] = None,
+                      json: bool = False, queued: bool = True, max_queue: int = 10000,
+                      fmt: str = "%(asctime)s %(levelname)s %(name)s: %(message)s") -> logging.Handler:
+    """Send the SDK's logs to ``stream`` (default stderr), replacing earlier calls
+
+    ``rate``/``burst`` limit records per event type (``None`` disables
+    it), ``sample`` keeps a share of chosen event types, and ``json``
+    writes one JSON object per line. With ``queued`` (the default)
+    records are written by a background thread through a bounded queue;
+    when it is full new records are dropped rather than blocking.
+    Returns the handler the filters are attached to.
+    """
+    global _listener
+    with _lock:
+        _reset()
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter() if json else _TextFormatter(fmt))
+
+        if queued:
+            handler = DroppingQueueHandler(queue.Queue(max_queue))
+            _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+            _listener.start()
+        else:
+            handler = output
+        if sample:
+            handler.addFilter(SamplingFilter(sample))
+        if rate:
+            handler.addFilter(RateLimitFilter(rate, burst))
+
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = False
+        _installed.append(handler)
+        return handler
+
+
+def _reset():
+    global _listener
+    for handler in _installed:
+        logger.removeHandler(handler)
+    _installed.clear()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def ensure_logging():
+    """Install the default configuration unless logging is already set up"""
+    configured = [h for h in logger.handlers if not isinstance(h, logging.NullHandler)]
+    if configured or logging.getLogger().handlers:
+        return
+    configure_logging()
+
+
+@atexit.register
+def _flush():
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
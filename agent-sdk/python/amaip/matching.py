@@ -0,0 +1,267 @@
+"""Vectorized task/agent matching
+
+Requires NumPy: ``pip install amaip[matching]``.
+
+A :class:`TaskMatcher` holds the keywords (capabilities, preferences) of
+every local agent in an inverted index and scores a batch of tasks against
+all agents at once with a single matrix product:
+
+    matcher = TaskMatcher()
+    matcher.add_agent(agent.agent_id, agent.capabilities)
+    scores = matcher.scores(tasks)           # len(tasks) x len(agents)
+    best = matcher.best_agents(task, k=3)    # [(agent_id, score), ...]
+
+Matching is by whole words: task text and keywords are lower-cased and
+split on non-alphanumerics, and a plural ``s`` is ignored. A keyword of
+several words (``"machine learning"``) matches when all of them appear.
+"""
+
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Lower-cased words of ``text``, with plurals also in singular form"""
+    words = set(_WORD.findall(text.lower()))
+    words.update([w[:-1] for w in words if len(w) > 3 and w.endswith("s") and not w.endswith("ss")])
+    return frozenset(words)
+
+
+def _phrase(keyword: str) -> Tuple[str, ...]:
+    """Canonical form of a keyword: its sorted singular words"""
+    words = _WORD.findall(keyword.lower())
+    return tuple(sorted(w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+                        for w in words))
+
+
+def task_text(task: Dict) -> str:
+    return f"{task.get('title', '')} {task.get('description') or ''}"
+
+
+class TaskMatcher:
+    """Scores tasks against many agents' keywords using NumPy
+
+    Each agent registers keywords, optionally weighted (e.g. skill levels).
+    For a batch of N tasks the matcher builds an N x K keyword-incidence
+    matrix (K = distinct keywords across all agents) and multiplies it with
+    the K x A agent matrices, so scoring costs one BLAS call rather than a
+    loop over tasks, agents and keywords.
+
+    Task words, and the keywords they hit, are cached by task id (up to
+    ``cache_size`` tasks), so each task is tokenized once however often it
+    is scored.
+
+    A matcher can be shared between threads (e.g. hooks running on the
+    event dispatcher's pool): agent changes, rebuilds and scoring hold one
+    lock, so a score is never computed against a half-rebuilt vocabulary.
+    """
+
+    def __init__(self, cache_size: int = 100000):
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._agents: Dict[Hashable, Dict[Tuple[str, ...], float]] = {}
+        self._index: Dict[Tuple[str, ...], Set[Hashable]] = {}
+        self._tokens: "OrderedDict[Hashable, FrozenSet[str]]" = OrderedDict()
+        self._task_rows: Dict[Hashable, List[int]] = {}
+        self._built = False
+
+        self._agent_ids: List[Hashable] = []
+        self._columns: Dict[Hashable, int] = {}
+        self._keywords: List[Tuple[str, ...]] = []
+        self._keyword_rows: Dict[Tuple[str, ...], int] = {}
+        self._by_word: Dict[str, List[int]] = {}
+        self._present = None
+        self._weights = None
+        self._sizes = None
+
+    # ============ Agents ============
+
+    def add_agent(self, agent_id: Hashable, keywords: Union[Iterable[str], Dict[str, float]]):
+        """Register (or replace) an agent's keywords, optionally as ``{keyword: weight}``"""
+        with self._lock:
+            if not isinstance(keywords, dict):
+                keywords = {keyword: 1.0 for keyword in keywords}
+            self.remove_agent(agent_id)
+            phrases = {}
+            for keyword, weight in keywords.items():
+                phrase = _phrase(keyword)
+                if phrase:
+                    phrases[phrase] = float(weight)
+                    self._index.setdefault(phrase, set()).add(agent_id)
+            self._agents[agent_id] = phrases
+            self._built = False
+
+    def set_weights(self, agent_id: Hashable, weights: Dict[str, float]):
+        """Update the weights of an agent's existing keywords"""
+        with self._lock:
+            phrases = self._agents[agent_id]
+            for keyword, weight in weights.items():
+                phrase = _phrase(keyword)
+                if phrase in phrases:
+                    phrases[phrase] = float(weight)
+            if self._built and agent_id in self._columns:
+                column = self._columns[agent_id]
+                for phrase, weight in phrases.items():
+                    self._weights[self._keyword_rows[phrase], column] = weight
+
+    def remove_agent(self, agent_id: Hashable):
+        """Forget an agent"""
+        with self._lock:
+            for phrase in self._agents.pop(agent_id, {}):
+                holders = self._index[phrase]
+                holders.discard(agent_id)
+                if not holders:
+                    del self._index[phrase]
+            self._built = False
+
+    def agents_for(self, keyword: str) -> Set[Hashable]:
+        """Agents that registered ``keyword``"""
+        with self._lock:
+            return set(self._index.get(_phrase(keyword), ()))
+
+    @property
+    def agent_ids(self) -> List[Hashable]:
+        """Agent ids in the column order of the score matrices"""
+        with self._lock:
+            self._build()
+            return list(self._agent_ids)
+
+    def _build(self):
+        """Rebuild the keyword x agent matrices after agents changed"""
+        if self._built:
+            return
+        self._agent_ids = list(self._agents)
+        self._columns = {agent_id: i for i, agent_id in enumerate(self._agent_ids)}
+        self._keywords = list(self._index)
+        self._keyword_rows = {phrase: i for i, phrase in enumerate(self._keywords)}
+        self._by_word = {}
+        for row, phrase in enumerate(self._keywords):
+            self._by_word.setdefault(phrase[0], []).append(row)
+
+        self._present = np.zeros((len(self._keywords), len(self._agent_ids)), dtype=np.float32)
+        self._weights = np.zeros_like(self._present)
+        for column, agent_id in enumerate(self._agent_ids):
+            for phrase, weight in self._agents[agent_id].items():
+                row = self._keyword_rows[phrase]
+                self._present[row, column] = 1.0
+                self._weights[row, column] = weight
+        self._sizes = self._present.sum(axis=0)
+        self._task_rows.clear()
+        self._built = True
+
+    # ============ Tasks ============
+
+    def _rows(self, task: Dict) -> List[int]:
+        """Keyword rows a task mentions, cached by task id until agents change"""
+        task_id = task.get('id')
+        rows = self._task_rows.get(task_id) if task_id is not None else None
+        if rows is not None:
+            return rows
+
+        words = self._tokens.get(task_id) if task_id is not None else None
+        if words is None:
+            words = tokenize(task_text(task))
+            if task_id is not None:
+                self._tokens[task_id] = words
+                if len(self._tokens) > self.cache_size:
+                    self._tokens.popitem(last=False)
+
+        rows = []
+        for word in words:
+            for row in self._by_word.get(word, ()):
+                phrase = self._keywords[row]
+                if len(phrase) == 1 or words.issuperset(phrase):
+                    rows.append(row)
+        if task_id is not None and len(self._task_rows) < self.cache_size:
+            self._task_rows[task_id] = rows
+        return rows
+
+    def encode(self, tasks: List[Dict]) -> np.ndarray:
+        """N x K matrix with a 1 where a task mentions a keyword"""
+        with self._lock:
+            self._build()
+            incidence = np.zeros((len(tasks), len(self._keywords)), dtype=np.float32)
+            rows = [self._rows(task) for task in tasks]
+            counts = [len(r) for r in rows]
+            if sum(counts):
+                task_index = np.repeat(np.arange(len(tasks)), counts)
+                incidence[task_index, np.fromiter(itertools.chain.from_iterable(rows), dtype=np.intp)] = 1.0
+            return incidence
+
+    def hits(self, tasks: List[Dict]) -> np.ndarray:
+        """N x A count of each agent's keywords found in each task"""
+        with self._lock:
+            return self.encode(tasks) @ self._present
+
+    def scores(self, tasks: List[Dict]) -> np.ndarray:
+        """N x A fraction of each agent's keywords found in each task
+
+        The same measure as :func:`amaip.scheduler.capability_match`.
+        """
+        with self._lock:
+            hits = self.hits(tasks)
+            return hits / np.maximum(self._sizes, 1.0)
+
+    def weighted(self, tasks: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """N x A mean weight of the matched keywords, and the hit counts
+
+        The mean is 0 where nothing matched.
+        """
+        with self._lock:
+            incidence = self.encode(tasks)
+            hits = incidence @ self._present
+            total = incidence @ self._weights
+            return total / np.maximum(hits, 1.0), hits
+
+    def hit_count(self, task: Dict, agent_id: Hashable) -> int:
+        """Number of one agent's keywords found in one task"""
+        with self._lock:
+            self._build()
+            return int(self.hits([task])[0, self._columns[agent_id]])
+
+    def score(self, task: Dict, agent_id: Hashable) -> float:
+        """Fraction of one agent's keywords found in one task"""
+        with self._lock:
+            self._build()
+            return float(self.scores([task])[0, self._columns[agent_id]])
+
+    def best_agents(self, task: Dict, k: int = 3, min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Up to ``k`` agents best matching a task, best first"""
+        with self._lock:
+            row = self.scores([task])[0]
+            return self._top(row, self._agent_ids, k, min_score)
+
+    def rank_tasks(self, agent_id: Hashable, tasks: List[Dict], k: Optional[int] = None,
+                   min_score: float = 0.0) -> List[Tuple[Dict, float]]:
+        """Tasks best matching one agent, best first"""
+        with self._lock:
+            self._build()
+            column = self.scores(tasks)[:, self._columns[agent_id]]
+            return self._top(column, tasks, k or len(tasks), min_score)
+
+    def assign(self, tasks: List[Dict], min_score: float = 0.0) -> List[Optional[Hashable]]:
+        """Best agent for each task (``None`` where no agent scores above ``min_score``)"""
+        with self._lock:
+            if not tasks:
+                return []
+            scores = self.scores(tasks)
+            if not self._agent_ids:
+                return [None] * len(tasks)
+            best = scores.argmax(axis=1)
+            return [self._agent_ids[b] if scores[i, b] > min_score else None for i, b in enumerate(best)]
+
+    @staticmethod
+    def _top(values: np.ndarray, items: list, k: int, min_score: float) -> list:
+        k = min(k, len(values))
+        if k <= 0:
+            return []
+        top = np.argpartition(-values, k - 1)[:k]
+        top = top[np.argsort(-values[top], kind="stable")]
+        return [(items[i], float(values[i])) for i in top if values[i] > min_score]
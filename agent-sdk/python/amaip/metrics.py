@@ -0,0 +1,300 @@
+import bisect
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from http.server import HTTPServer
+
+# Latency buckets in seconds, from a local socket emit up to a slow LLM call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def payload_size(data) -> int:
+    """Approximate wire size of a JSON payload in bytes"""
+    try:
+        return len(json.dumps(data, separators=(",", ":"), default=str).encode())
+    except (TypeError, ValueError):
+        return 0
+
+
+def route_label(method: str, path: str) -> str:
+    """Metric label for a request, with ids collapsed (``POST /tasks/{id}/assign``)"""
+    return f"{method} {re.sub(r'/[0-9]+', '/{id}', path)}"
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed values"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """``(upper bound, count <= bound)`` pairs, ending with ``+Inf``"""
+        total = 0
+        result = []
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            result.append((bound, total))
+        return result
+
+
+class Span:
+    """A finished timed operation, in OpenTelemetry's shape"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.status = "OK"
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status},
+        }
+
+
+class InMemorySpanExporter:
+    """Keeps the most recent finished spans, e.g. for tests"""
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+
+class JsonLinesSpanExporter:
+    """Appends finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Metrics:
+    """Counters, latency histograms, gauges and spans for one or more clients
+
+    Pass one to :class:`~amaip.client.AMAIPClient`, :class:`~amaip.agent.Agent`
+    or :class:`~amaip.llm.LLMGateway` to record REST latency per route,
+    socket emits and calls, events received and handled with handler time,
+    bytes on the wire, reconnects, hook queue depth and LLM call latency.
+    Without one, instrumented code skips all of this behind a single
+    ``is None`` check.
+
+    Read the numbers with :meth:`to_prometheus` (or :meth:`serve` them for
+    scraping). Span exporters (any object with ``export(span)``) turn on
+    tracing: every timed operation then also produces an OpenTelemetry-style
+    span, nested under the operation that was running on the same thread.
+
+        metrics = Metrics(exporters=[JsonLinesSpanExporter("spans.jsonl")])
+        agent = MyAgent("worker", metrics=metrics)
+        metrics.serve(9464)
+    """
+
+    def __init__(self, namespace: str = "amaip", buckets=DEFAULT_BUCKETS, exporters: List = None):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self.exporters = list(exporters or [])
+        self._counters: Dict[_Key, float] = {}
+        self._histograms: Dict[_Key, Histogram] = {}
+        self._gauges: Dict[_Key, Callable[[], float]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ============ Recording ============
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add to a counter"""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record a latency in a histogram"""
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def gauge(self, name: str, fn: Callable[[], float], **labels):
+        """Report ``fn()`` as a gauge each time metrics are read"""
+        with self._lock:
+            self._gauges[_key(name, labels)] = fn
+
+    @contextmanager
+    def timed(self, name: str, span: str = None, **labels) -> Iterator[Optional[Span]]:
+        """Time the block into histogram ``name`` and, when tracing, a span
+
+        The span is named ``span`` (default: ``name``) and carries the
+        labels as attributes. An exception marks it as an error.
+        """
+        current = None
+        if self.exporters:
+            stack = getattr(self._local, "stack", None)
+            if stack is None:
+                stack = self._local.stack = []
+            parent = stack[-1] if stack else None
+            current = Span(
+                span or name,
+                parent.trace_id if parent else "%032x" % random.getrandbits(128),
+                "%016x" % random.getrandbits(64),
+                parent.span_id if parent else None,
+                dict(labels)
+            )
+            stack.append(current)
+
+        started = time.perf_counter()
+        try:
+            yield current
+        except BaseException:
+            if current is not None:
+                current.status = "ERROR"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe(name, elapsed, **labels)
+            if current is not None:
+                self._local.stack.pop()
+                current.end_ns = current.start_ns + int(elapsed * 1e9)
+                for exporter in self.exporters:
+                    exporter.export(current)
+
+    # ============ Reading ============
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get(_key(name, labels))
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, h.cumulative(), h.sum, h.count) for key, h in self._histograms.items()
+            )
+            gauges = sorted(self._gauges.items(), key=lambda item: item[0])
+
+        lines = []
+        typed = set()
+
+        def header(name: str, kind: str):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            metric = f"{self.namespace}_{name}"
+            header(metric, "counter")
+            lines.append(f"{metric}{_labels(labels)} {_number(value)}")
+        for (name, labels), fn in gauges:
+            metric = f"{self.namespace}_{name}"
+            header(metric, "gauge")
+            try:
+                value = fn()
+            except Exception:
+                continue
+            lines.append(f"{metric}{_labels(labels)} {_number(value)}")
+        for (name, labels), buckets, total, count in histograms:
+            metric = f"{self.namespace}_{name}"
+            header(metric, "histogram")
+            for bound, n in buckets:
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{metric}_bucket{_labels(labels + (('le', le),))} {n}")
+            lines.append(f"{metric}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{metric}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> "HTTPServer":
+        """Serve :meth:`to_prometheus` at ``/metrics`` from a background thread"""
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from socketserver import ThreadingMixIn
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        server = Server((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="amaip-metrics", daemon=True).start()
+        return server
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
@@ -0,0 +1,132 @@
+import heapq
+import threading
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def complementarity(mask: int, other: int) -> float:
+    """Share of ``other``'s capabilities that ``mask`` lacks
+
+    1.0 for disjoint sets, 0.0 when ``other`` adds nothing.
+    """
+    return _popcount(other & ~mask) / _popcount(other) if other else 0.0
+
+
+class PairingIndex:
+    """Finds the most complementary collaboration partners for agents
+
+    Capabilities are encoded as bits of an integer, so comparing two agents
+    is a couple of bitwise operations. Agents with identical capability sets
+    share one entry, and the sets are indexed by size: perfect complements
+    (sets sharing nothing, largest first) are found by scanning that index
+    from the largest sets down and stopping at the first ``k``, rather than
+    scoring every agent.
+
+    Partner rankings are computed per distinct capability set and cached.
+    :meth:`recompute` refreshes them all in one batch (e.g. on a timer), so
+    looking up partners for a joining agent with a known capability set
+    costs O(k).
+    """
+
+    def __init__(self, k: int = 3):
+        self.k = k
+        self._bits: Dict[str, int] = {}
+        self._masks: Dict[Hashable, int] = {}
+        self._agents_by_mask: Dict[int, Set[Hashable]] = {}
+        self._masks_by_size: Dict[int, Set[int]] = {}
+        self._ranked: Dict[int, List[Tuple[int, float]]] = {}
+        self._lock = threading.Lock()
+
+    def encode(self, capabilities: Iterable[str]) -> int:
+        """Bitset of ``capabilities``, assigning bits to new ones"""
+        mask = 0
+        for cap in capabilities:
+            bit = self._bits.get(cap)
+            if bit is None:
+                bit = self._bits[cap] = len(self._bits)
+            mask |= 1 << bit
+        return mask
+
+    def add(self, agent_id: Hashable, capabilities: Iterable[str]):
+        """Index (or re-index) an agent"""
+        with self._lock:
+            self._remove(agent_id)
+            mask = self.encode(capabilities)
+            self._masks[agent_id] = mask
+            agents = self._agents_by_mask.setdefault(mask, set())
+            if not agents:
+                self._masks_by_size.setdefault(_popcount(mask), set()).add(mask)
+            agents.add(agent_id)
+
+    def remove(self, agent_id: Hashable):
+        """Forget an agent"""
+        with self._lock:
+            self._remove(agent_id)
+
+    def _remove(self, agent_id: Hashable):
+        mask = self._masks.pop(agent_id, None)
+        if mask is None:
+            return
+        agents = self._agents_by_mask[mask]
+        agents.discard(agent_id)
+        if not agents:
+            del self._agents_by_mask[mask]
+            self._ranked.pop(mask, None)
+            self._masks_by_size[_popcount(mask)].discard(mask)
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    def _rank(self, mask: int) -> List[Tuple[int, float]]:
+        """Capability sets best complementing ``mask``, enough to fill k partners"""
+        # Perfect complements, largest first: if there are k, nothing beats them
+        disjoint = []
+        for size in sorted(self._masks_by_size, reverse=True):
+            if size == 0:
+                break
+            for m in self._masks_by_size[size]:
+                if not m & mask:
+                    disjoint.append((m, 1.0))
+                    if len(disjoint) >= self.k:
+                        return disjoint
+
+        scored = ((m, complementarity(mask, m)) for m in self._agents_by_mask if m != mask)
+        best = heapq.nlargest(self.k, scored, key=lambda item: (item[1], _popcount(item[0])))
+        return [(m, score) for m, score in best if score > 0]
+
+    def recompute(self) -> int:
+        """Re-rank partners for every capability set. Returns how many sets were ranked."""
+        with self._lock:
+            self._ranked = {mask: self._rank(mask) for mask in self._agents_by_mask}
+            return len(self._ranked)
+
+    def partners(self, agent_id: Hashable, k: int = None) -> List[Tuple[Hashable, float]]:
+        """Up to ``k`` (at most the index's ``k``) partners as ``(agent_id, score)``, best first
+
+        Uses the ranking from the last :meth:`recompute` when one exists for
+        the agent's capability set; agents that left since are skipped.
+        """
+        k = k or self.k
+        with self._lock:
+            mask = self._masks.get(agent_id)
+            if mask is None:
+                return []
+            ranked = self._ranked.get(mask)
+            if ranked is None:
+                ranked = self._ranked[mask] = self._rank(mask)
+
+            result = []
+            for other, score in ranked:
+                for partner in self._agents_by_mask.get(other, ()):
+                    if partner != agent_id:
+                        result.append((partner, score))
+                        if len(result) >= k:
+                            return result
+            return result
+
+    def pairings(self, k: int = None) -> Dict[Hashable, List[Tuple[Hashable, float]]]:
+        """Partners for every indexed agent"""
+        return {agent_id: self.partners(agent_id, k) for agent_id in list(self._masks)}
@@ -0,0 +1,185 @@
+"""REST calls carried over the socket as acknowledged emits
+
+A client created with ``rpc=True`` sends its REST operations as
+``api:request`` events while its socket is connected, and falls back to
+HTTP while it isn't (e.g. registering before :meth:`connect`)::
+
+    {"id": 7, "method": "POST", "path": "/tasks", "body": {...}}
+    -> ack {"id": 7, "status": 201, "body": {...}}
+
+The server runs them through the same routes as HTTP requests, so answers
+and broadcasts are the same, but there is no connection pool to wait for
+and no per-request HTTP overhead. Writes and events share one ordered
+channel: the events a write causes arrive before its answer.
+
+Calls are pipelined: any number can be outstanding, each matched to its
+answer by id. :meth:`RpcChannel.request` returns a ``Future``; the
+client's REST methods wait on it. Error statuses raise :class:`RpcError`
+(a ``requests.HTTPError``), calls without an answer in time raise
+:class:`RpcTimeoutError`, and calls outstanding when the socket drops
+raise ``requests.ConnectionError``, since the server may or may not have
+applied them.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from .metrics import payload_size, route_label
+from .timers import JobScheduler
+
+logger = logging.getLogger(__name__)
+
+RPC_EVENT = "api:request"
+
+_DEFAULT = object()
+
+
+class RpcError(requests.HTTPError):
+    """The server answered a socket call with an error status"""
+
+    def __init__(self, message: str, status: int, body=None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+class RpcTimeoutError(requests.Timeout):
+    """No answer to a socket call arrived in time"""
+
+
+def request_payload(call_id: int, method: str, path: str, json=None, params: Optional[Dict] = None) -> Dict:
+    """The ``api:request`` payload for a REST call"""
+    payload = {"id": call_id, "method": method, "path": path}
+    if params:
+        payload["query"] = params
+    if json is not None:
+        payload["body"] = json
+    return payload
+
+
+def answer_value(answer, method: str, path: str):
+    """The body of an ``api:request`` answer, raising :class:`RpcError` for error statuses"""
+    if not isinstance(answer, dict) or not isinstance(answer.get("status"), int):
+        raise RpcError(f"Malformed answer for {method} {path}", 502, answer)
+    status, body = answer["status"], answer.get("body")
+    if status >= 400:
+        reason = body.get("error") if isinstance(body, dict) else body
+        raise RpcError(f"{status} Error: {reason} for {method} {path}", status, body)
+    return body
+
+
+class RpcChannel:
+    """Outstanding socket calls of one :class:`~amaip.client.AMAIPClient`, by correlation id
+
+    Answers arrive on socket threads and settle the matching future. One
+    timer thread expires calls older than ``timeout`` seconds (None waits
+    until an answer or a disconnect).
+    """
+
+    def __init__(self, client, timeout: Optional[float] = None):
+        self.client = client
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Tuple[Future, str, str, float]] = {}
+        self._lock = threading.Lock()
+        self._timers: Optional[JobScheduler] = None
+
+    @property
+    def outstanding(self) -> int:
+        """Calls sent and not yet answered"""
+        return len(self._pending)
+
+    def request(self, method: str, path: str, json=None, params: Optional[Dict] = None,
+                timeout=_DEFAULT) -> Future:
+        """Send a call and return a future for its answer's body"""
+        call_id = next(self._ids)
+        future: Future = Future()
+        payload = request_payload(call_id, method, path, json, params)
+        with self._lock:
+            self._pending[call_id] = (future, method, path, time.perf_counter())
+
+        timeout = self.timeout if timeout is _DEFAULT else timeout
+        if timeout is not None:
+            expiry = self._scheduler().after(timeout, self._expire, call_id, f"{method} {path}", timeout,
+                                             name="rpc-timeout")
+            future.add_done_callback(lambda _: expiry.cancel())
+
+        try:
+            self.client.sio.emit(RPC_EVENT, payload, callback=lambda answer=None: self._answer(call_id, answer))
+        except Exception as e:
+            self._settle(call_id, error=e)
+        else:
+            if self.client.metrics is not None:
+                self.client.metrics.inc("bytes_sent_total", payload_size(payload), transport="socket")
+        return future
+
+    def call(self, method: str, path: str, json=None, params: Optional[Dict] = None, timeout=_DEFAULT):
+        """Send a call and wait for its answer's body"""
+        return self.request(method, path, json, params, timeout).result()
+
+    def disconnected(self, *args):
+        """Fail every outstanding call: their answers can't arrive on a new connection"""
+        with self._lock:
+            call_ids = list(self._pending)
+        if call_ids:
+            logger.warning("Socket dropped with %d call(s) outstanding", len(call_ids))
+        for call_id in call_ids:
+            self._settle(call_id, error=requests.ConnectionError("Socket disconnected before the server answered"))
+
+    def close(self):
+        """Stop the timeout timer"""
+        if self._timers is not None:
+            self._timers.shutdown()
+            self._timers = None
+
+    def _scheduler(self) -> JobScheduler:
+        if self._timers is None:
+            with self._lock:
+                if self._timers is None:
+                    self._timers = JobScheduler(max_workers=1)
+        return self._timers
+
+    def _answer(self, call_id: int, answer):
+        if isinstance(answer, dict) and answer.get("id") not in (None, call_id):
+            logger.warning("Answer for call %s arrived as the ack of call %s", answer.get("id"), call_id)
+        self._settle(call_id, answer=answer)
+
+    def _expire(self, call_id: int, request: str, timeout: float):
+        self._settle(call_id, error=RpcTimeoutError(f"No answer to {request} within {timeout}s"))
+
+    def _settle(self, call_id: int, answer=None, error: Optional[BaseException] = None):
+        with self._lock:
+            call = self._pending.pop(call_id, None)
+        if call is None:
+            # Already expired or failed by a disconnect
+            return
+        future, method, path, started = call
+        value = None
+        if error is None:
+            try:
+                value = answer_value(answer, method, path)
+            except RpcError as e:
+                error = e
+
+        metrics = self.client.metrics
+        if metrics is not None:
+            route = route_label(method, path)
+            if isinstance(error, RpcError) or error is None:
+                status = error.status if error is not None else answer["status"]
+            else:
+                status = type(error).__name__
+            metrics.observe("rpc_request_seconds", time.perf_counter() - started, route=route)
+            metrics.inc("rpc_requests_total", route=route, status=status)
+            if answer is not None:
+                metrics.inc("bytes_received_total", payload_size(answer), transport="socket")
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+def capability_match(task: Dict, capabilities: List[str]) -> float:
+    """Fraction of the agent's capabilities mentioned in the task text"""
+    if not capabilities:
+        return 0.0
+    text = f"{task.get('title', '')} {task.get('description') or ''}".lower()
+    hits = sum(1 for cap in capabilities if cap.lower() in text)
+    return hits / len(capabilities)
+
+
+class TaskScheduler:
+    """Local priority queue deciding which tasks an agent claims, and when
+
+    Offered tasks are ranked by
+
+        priority_weight * priority + match_weight * match + age_weight * age
+
+    where ``match`` comes from ``score_fn(task, capabilities)`` (by default
+    :func:`capability_match`) and ``age`` is seconds since the task was
+    offered. ``score_fn`` may return ``None`` to reject a task, and tasks
+    matching less than ``min_match`` are ignored.
+
+    At most ``max_in_flight`` tasks are claimed or being worked on at once;
+    the best queued task is claimed whenever a slot frees up. A claim that
+    is neither won nor lost within ``claim_timeout`` seconds frees its slot.
+    """
+
+    def __init__(self, max_in_flight: int = 1, score_fn: Optional[Callable] = None,
+                 priority_weight: float = 1.0, match_weight: float = 5.0, age_weight: float = 0.01,
+                 min_match: float = 0.0, claim_timeout: float = 30.0):
+        self.max_in_flight = max_in_flight
+        self.score_fn = score_fn or capability_match
+        self.priority_weight = priority_weight
+        self.match_weight = match_weight
+        self.age_weight = age_weight
+        self.min_match = min_match
+        self.claim_timeout = claim_timeout
+
+        self._claim: Optional[Callable[[int], None]] = None
+        self._capabilities: List[str] = []
+        self._heap = []
+        self._queued: Dict[int, Dict] = {}
+        self._claiming: Dict[int, float] = {}
+        self._working = set()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def bind(self, claim: Callable[[int], None], capabilities: List[str]):
+        """Attach the scheduler to an agent's claim function and capabilities"""
+        self._claim = claim
+        self._capabilities = capabilities
+
+    def _key(self, task: Dict, match: float) -> float:
+        # Every queued task ages at the same rate, so adding age_weight * age
+        # orders tasks the same as subtracting age_weight * offer time. That
+        # keeps each heap key fixed after insertion.
+        return (self.priority_weight * (task.get('priority') or 0)
+                + self.match_weight * match
+                - self.age_weight * time.monotonic())
+
+    def offer(self, task: Dict) -> bool:
+        """Consider a pending task. Returns False if it was rejected."""
+        if task.get('status', 'pending') != 'pending':
+            return False
+        match = self.score_fn(task, self._capabilities)
+        if match is None or match < self.min_match:
+            return False
+        with self._lock:
+            if task['id'] in self._queued or task['id'] in self._claiming or task['id'] in self._working:
+                return False
+            self._queued[task['id']] = task
+            heapq.heappush(self._heap, (-self._key(task, match), next(self._seq), task['id']))
+        self._pump()
+        return True
+
+    def on_assigned(self, task: Dict, mine: bool):
+        """Record the outcome of a claim (ours or anyone's) for a task"""
+        with self._lock:
+            self._queued.pop(task['id'], None)
+            self._claiming.pop(task['id'], None)
+            if mine:
+                self._working.add(task['id'])
+        self._pump()
+
+    def release(self, task_id: int):
+        """Free the slot held by a task once it is completed or abandoned"""
+        with self._lock:
+            self._queued.pop(task_id, None)
+            self._claiming.pop(task_id, None)
+            self._working.discard(task_id)
+        self._pump()
+
+    @property
+    def in_flight(self) -> int:
+        """Tasks currently being claimed or worked on"""
+        with self._lock:
+            return len(self._claiming) + len(self._working)
+
+    def pending(self) -> List[Dict]:
+        """Queued tasks, best first"""
+        with self._lock:
+            return [self._queued[tid] for _, _, tid in sorted(self._heap) if tid in self._queued]
+
+    def _pump(self):
+        """Claim the best queued tasks while slots are free"""
+        if self._claim is None:
+            return
+        to_claim = []
+        with self._lock:
+            now = time.monotonic()
+            for task_id, started in list(self._claiming.items()):
+                if now - started > self.claim_timeout:
+                    del self._claiming[task_id]
+
+            while self._heap and len(self._claiming) + len(self._working) < self.max_in_flight:
+                _, _, task_id = heapq.heappop(self._heap)
+                if self._queued.pop(task_id, None) is None:
+                    continue  # taken elsewhere while queued
+                self._claiming[task_id] = now
+                to_claim.append(task_id)
+        for task_id in to_claim:
+            self._claim(task_id)
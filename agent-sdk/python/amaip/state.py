@@ -0,0 +1,335 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+LOG = "log"
+SQLITE = "sqlite"
+
+
+def _atomic_write(path: str, data: str):
+    """Write a file so readers see either the old or the new contents, never half"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(path) or ".", os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _read_lines(path: str, offset: int = 0):
+    """Yield ``(end_offset, record)`` for each complete JSON line after ``offset``
+
+    A torn last line (from a crash mid-write) is ignored.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                yield offset, json.loads(line)
+            except ValueError:
+                break
+
+
+def _truncate(path: str, offset: int):
+    """Cut what follows ``offset`` (a torn line from a crash) so appends start on a fresh line"""
+    try:
+        with open(path, "r+b") as f:
+            if os.fstat(f.fileno()).st_size > offset:
+                f.truncate(offset)
+                f.flush()
+                os.fsync(f.fileno())
+    except FileNotFoundError:
+        pass
+
+
+def _read_last(path: str, end: int, limit: int, block: int = 65536) -> List[Dict]:
+    """The last ``limit`` JSON records before ``end``, read backwards in blocks
+
+    ``end`` is the offset just after the last complete line.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        position, tail, lines = end, b"", []
+        while position > 0 and len(lines) < limit:
+            size = min(block, position)
+            position -= size
+            f.seek(position)
+            chunk = f.read(size) + tail
+            parts = chunk.split(b"\n")
+            # The first part may be the end of a line from an earlier block
+            tail = parts[0] if position > 0 else b""
+            lines = [line for line in parts[1 if position > 0 else 0:] if line] + lines
+    records = []
+    for line in lines[-limit:]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+class LogBackend:
+    """Append-only files in a directory, compacted into a snapshot
+
+    Value updates go to ``values.log`` and are folded into ``snapshot.json``
+    every ``compact_every`` updates. Each history stream has its own
+    ``<stream>.jsonl`` file that is only ever appended to; the snapshot
+    records how many entries each had, so opening the store reads just the
+    snapshot and whatever was written after it.
+    """
+
+    def __init__(self, path: str, compact_every: int = 1000, fsync: bool = True):
+        self.path = path
+        self.compact_every = compact_every
+        self.fsync = fsync
+        os.makedirs(path, exist_ok=True)
+        self._snapshot_path = os.path.join(path, "snapshot.json")
+        self._log_path = os.path.join(path, "values.log")
+        self._files = {}
+        self._counts: Dict[str, int] = {}
+        self._offsets: Dict[str, int] = {}
+        self._seq = 0
+        self._pending = 0
+
+    def _stream_path(self, stream: str) -> str:
+        if not re.fullmatch(r"[\w.-]+", stream):
+            raise ValueError(f"Invalid stream name: {stream!r}")
+        return os.path.join(self.path, stream + ".jsonl")
+
+    def load(self) -> Dict[str, Any]:
+        values = {}
+        try:
+            with open(self._snapshot_path) as f:
+                snapshot = json.load(f)
+            values = snapshot.get("values", {})
+            self._seq = snapshot.get("seq", 0)
+            for stream, info in snapshot.get("streams", {}).items():
+                self._counts[stream] = info["count"]
+                self._offsets[stream] = info["offset"]
+        except FileNotFoundError:
+            pass
+
+        # Replay updates made after the snapshot. Records carry a sequence
+        # number so a crash between snapshot and log truncation is harmless.
+        end = 0
+        for end, record in _read_lines(self._log_path):
+            if record["seq"] > self._seq:
+                values.update(record["values"])
+                self._seq = record["seq"]
+                self._pending += 1
+        # Appending after a torn line would glue the next record onto it
+        # and hide everything written after it from later loads
+        _truncate(self._log_path, end)
+
+        for name in os.listdir(self.path):
+            if name.endswith(".jsonl"):
+                stream = name[:-len(".jsonl")]
+                offset = self._offsets.get(stream, 0)
+                for offset, _ in _read_lines(self._stream_path(stream), offset):
+                    self._counts[stream] = self._counts.get(stream, 0) + 1
+                self._offsets[stream] = offset
+                _truncate(self._stream_path(stream), offset)
+        return values
+
+    def _write(self, key: str, path: str, record: Dict) -> int:
+        f = self._files.get(key)
+        if f is None:
+            f = self._files[key] = open(path, "ab")
+        f.write(json.dumps(record).encode() + b"\n")
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+        return f.tell()
+
+    def set_many(self, values: Dict[str, Any], state: Dict[str, Any]):
+        self._seq += 1
+        self._write("", self._log_path, {"seq": self._seq, "values": values})
+        self._pending += 1
+        if self.compact_every and self._pending >= self.compact_every:
+            self.compact(state)
+
+    def append(self, stream: str, record: Dict):
+        self._offsets[stream] = self._write(stream, self._stream_path(stream), record)
+        self._counts[stream] = self._counts.get(stream, 0) + 1
+
+    def history(self, stream: str, limit: Optional[int] = None) -> List[Dict]:
+        path = self._stream_path(stream)
+        if limit:
+            # Only the end of the file is read, however long the stream
+            return _read_last(path, self._offsets.get(stream, 0), limit)
+        return [record for _, record in _read_lines(path)]
+
+    def count(self, stream: str) -> int:
+        return self._counts.get(stream, 0)
+
+    def compact(self, state: Dict[str, Any]):
+        _atomic_write(self._snapshot_path, json.dumps({
+            "seq": self._seq,
+            "values": state,
+            "streams": {
+                stream: {"count": count, "offset": self._offsets.get(stream, 0)}
+                for stream, count in self._counts.items()
+            }
+        }))
+        log = self._files.pop("", None)
+        if log:
+            log.close()
+        open(self._log_path, "wb").close()
+        self._pending = 0
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class SQLiteBackend:
+    """Values and history streams in one SQLite database (WAL mode)"""
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+        self._db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, stream TEXT NOT NULL, record TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS history_stream ON history (stream, id)")
+        self._db.commit()
+        self._counts: Dict[str, int] = {}
+
+    def load(self) -> Dict[str, Any]:
+        for stream, count in self._db.execute("SELECT stream, COUNT(*) FROM history GROUP BY stream"):
+            self._counts[stream] = count
+        return {key: json.loads(value) for key, value in self._db.execute("SELECT key, value FROM state")}
+
+    def set_many(self, values: Dict[str, Any], state: Dict[str, Any]):
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in values.items()]
+            )
+
+    def append(self, stream: str, record: Dict):
+        with self._db:
+            self._db.execute("INSERT INTO history (stream, record) VALUES (?, ?)", (stream, json.dumps(record)))
+        self._counts[stream] = self._counts.get(stream, 0) + 1
+
+    def history(self, stream: str, limit: Optional[int] = None) -> List[Dict]:
+        if limit:
+            rows = self._db.execute(
+                "SELECT record FROM (SELECT id, record FROM history WHERE stream = ? ORDER BY id DESC LIMIT ?) "
+                "ORDER BY id", (stream, limit)
+            )
+        else:
+            rows = self._db.execute("SELECT record FROM history WHERE stream = ? ORDER BY id", (stream,))
+        return [json.loads(record) for record, in rows]
+
+    def count(self, stream: str) -> int:
+        return self._counts.get(stream, 0)
+
+    def compact(self, state: Dict[str, Any]):
+        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self._db.close()
+
+
+class AgentStateStore:
+    """Durable agent state: named values plus append-only history streams
+
+    Values are kept in memory and every change is persisted as a small
+    append, so saving costs the same however much history has built up.
+    History streams (e.g. an agent's experience) are appended to and never
+    rewritten.
+
+        store = AgentStateStore(f"state_{agent.name}")
+        store.update({"score": 120, "level": 2})
+        store.append("experience", {"task_id": 7, "success": True})
+        store.count("experience"), store.history("experience", limit=10)
+
+    ``backend`` is ``"log"`` (a directory of append-only files, compacted
+    into a snapshot every ``compact_every`` updates), ``"sqlite"`` (a
+    database file), or an object with the same methods as
+    :class:`LogBackend`. With ``fsync=False`` writes survive a process
+    crash but not necessarily a power loss.
+    """
+
+    def __init__(self, path: str, backend: Union[str, Any] = LOG, compact_every: int = 1000,
+                 fsync: bool = True):
+        if backend == LOG:
+            backend = LogBackend(path, compact_every=compact_every, fsync=fsync)
+        elif backend == SQLITE:
+            backend = SQLiteBackend(path, fsync=fsync)
+        elif isinstance(backend, str):
+            raise ValueError(f"Unknown state backend: {backend}")
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._values = backend.load()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Current value of ``key``"""
+        with self._lock:
+            return self._values.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Set and persist one value"""
+        self.update({key: value})
+
+    def update(self, values: Dict[str, Any]):
+        """Set and persist several values in one write"""
+        with self._lock:
+            self._values.update(values)
+            self.backend.set_many(values, self._values)
+
+    def values(self) -> Dict[str, Any]:
+        """Copy of all current values"""
+        with self._lock:
+            return dict(self._values)
+
+    def append(self, stream: str, record: Dict):
+        """Add a record to a history stream"""
+        with self._lock:
+            self.backend.append(stream, record)
+
+    def history(self, stream: str, limit: Optional[int] = None) -> List[Dict]:
+        """Records of a stream, oldest first; the newest ``limit`` if given"""
+        with self._lock:
+            return self.backend.history(stream, limit)
+
+    def count(self, stream: str) -> int:
+        """Number of records in a stream, without reading them"""
+        with self._lock:
+            return self.backend.count(stream)
+
+    def compact(self):
+        """Fold the update log into a snapshot now"""
+        with self._lock:
+            self.backend.compact(self._values)
+
+    def close(self):
+        """Compact and release files"""
+        with self._lock:
+            self.backend.compact(self._values)
+            self.backend.close()
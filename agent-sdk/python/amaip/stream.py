@@ -0,0 +1,169 @@
+import itertools
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Event that best describes a task's current state, when rebuilding missed events
+_TASK_EVENTS = {'pending': 'task:created', 'in_progress': 'task:assigned', 'completed': 'task:completed'}
+
+
+class EventStream:
+    """Keeps a client's view of the event stream gap-free across reconnects
+
+    The server numbers every broadcast (``_seq``) and keeps the latest ones.
+    The stream remembers the highest number seen and, on every reconnect,
+    asks for just the events after it (``events:replay``). Live events that
+    arrive meanwhile are held and delivered after the replayed ones, and
+    every event is delivered at most once, however it arrived.
+
+    When the server can no longer replay (it restarted, or too much was
+    missed) the stream falls back to a bounded delta fetch: tasks,
+    innovations and messages of the discussions seen so far that changed
+    since the last event, delivered as the events that describe their
+    current state (only those the client is subscribed to, if it is).
+    """
+
+    def __init__(self, client, deliver: Callable[[str, Dict], None], replay_timeout: float = 5.0,
+                 max_resync: int = 500, window: int = 4096):
+        self.client = client
+        self.deliver = deliver
+        self.replay_timeout = replay_timeout
+        self.max_resync = max_resync
+        self.window = window
+        self.epoch: Optional[str] = None
+        self.last_seq = 0
+        self.last_event_at: Optional[str] = None
+        self.discussions = set()
+        self.stats = {"replayed": 0, "resynced": 0, "duplicates": 0, "gaps": 0}
+        self._seen = set()
+        self._order = deque()
+        self._held: Optional[List[Tuple[str, Dict]]] = None
+        self._connections = 0
+        self._reconnect = False
+        self._lock = threading.Lock()
+
+    def accept(self, event: str, payload) -> bool:
+        """Whether to handle a live event now: False for duplicates and for events held during a resume"""
+        if not isinstance(payload, dict) or payload.get('_seq') is None:
+            return True
+        with self._lock:
+            if self._held is not None:
+                self._held.append((event, payload))
+                return False
+            return self._mark(payload)
+
+    def _mark(self, payload: Dict) -> bool:
+        """Record an event as seen. Returns False if it was seen before. Caller holds the lock."""
+        seq = payload['_seq']
+        if seq in self._seen:
+            self.stats["duplicates"] += 1
+            return False
+        self._seen.add(seq)
+        self._order.append(seq)
+        if len(self._order) > self.window:
+            self._seen.discard(self._order.popleft())
+        if seq > self.last_seq:
+            self.last_seq = seq
+        self._note(payload)
+        return True
+
+    def _note(self, record: Dict):
+        stamp = record.get('updated_at') or record.get('created_at')
+        if stamp and (self.last_event_at is None or stamp > self.last_event_at):
+            self.last_event_at = stamp
+        if record.get('discussion_id') is not None:
+            self.discussions.add(record['discussion_id'])
+
+    def connected(self):
+        """Note a (re)connect; call on the socket's thread, before any event of the new connection
+
+        After a reconnect, live events are held from here until :meth:`resume`
+        has caught up.
+        """
+        self._reconnect = self._connections > 0
+        self._connections += 1
+        if self._reconnect:
+            with self._lock:
+                self._held = []
+
+    def resume(self):
+        """Catch up after :meth:`connected`; call from a thread other than the socket's"""
+        reconnect = self._reconnect
+        try:
+            answer = self._replay(self.last_seq if reconnect and self.epoch else None)
+            restarted = answer is not None and self.epoch is not None and answer['epoch'] != self.epoch
+            if answer is not None:
+                with self._lock:
+                    if restarted:
+                        self._seen.clear()
+                        self._order.clear()
+                        self.last_seq = 0
+                    self.epoch = answer['epoch']
+                    if not reconnect or restarted:
+                        # Events before this point are not ours to catch up on
+                        self.last_seq = max(self.last_seq, answer['seq'])
+
+            if not reconnect:
+                return
+            if answer is not None and answer.get('complete') and not restarted:
+                for item in answer['events']:
+                    with self._lock:
+                        fresh = self._mark(item['data'])
+                    if fresh:
+                        self.stats["replayed"] += 1
+                        self.deliver(item['event'], item['data'])
+            else:
+                self.stats["gaps"] += 1
+                logger.warning("Missed events could not be replayed, resyncing from %s", self.last_event_at)
+                self._resync()
+                if answer is not None:
+                    with self._lock:
+                        self.last_seq = max(self.last_seq, answer['seq'])
+        finally:
+            self._release()
+
+    def _replay(self, since: Optional[int]) -> Optional[Dict]:
+        try:
+            answer = self.client._call('events:replay', {"since": since, "epoch": self.epoch}, self.replay_timeout)
+        except Exception as e:
+            logger.debug("Event replay unavailable: %r", e)
+            return None
+        return answer if isinstance(answer, dict) and answer.get('epoch') else None
+
+    def _release(self):
+        """Deliver the live events held during a resume, skipping those already replayed"""
+        with self._lock:
+            held, self._held = self._held, None
+        for event, payload in held or ():
+            with self._lock:
+                fresh = self._mark(payload)
+            if fresh:
+                self.deliver(event, payload)
+
+    def _resync(self):
+        """Rebuild missed events from records changed since the last event seen"""
+        since = self.last_event_at
+        if since is None:
+            return
+        sources = [("tasks", None), ("innovations", None)]
+        sources += [("messages", discussion_id) for discussion_id in sorted(self.discussions)]
+        for collection, discussion_id in sources:
+            records = self.client.iter_since(collection, updated_after=since, discussion_id=discussion_id)
+            for record in itertools.islice(records, self.max_resync):
+                if collection == "tasks":
+                    event = _TASK_EVENTS.get(record.get('status'))
+                elif collection == "innovations":
+                    event = 'innovation:created'
+                else:
+                    event = 'message:new'
+                with self._lock:
+                    self._note(record)
+                subscription = self.client.subscription
+                if subscription is not None and event and not subscription.matches(event, record):
+                    continue
+                if event:
+                    self.stats["resynced"] += 1
+                    self.deliver(event, record)
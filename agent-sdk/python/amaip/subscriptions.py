@@ -0,0 +1,66 @@
+"""Server-side event subscriptions
+
+By default every socket receives every broadcast. A client that subscribes
+receives only the events addressed to its topics; the server sends each
+event to socket.io rooms named after them:
+
+- ``discussion:<id>``: messages (and message chunks) posted in a discussion
+- ``agent:<id>``: tasks assigned to, or completed by, an agent
+- ``capability:<name>``: tasks whose title or description mention a capability
+- ``event:<name>``: every event of one type
+
+Unsubscribed sockets sit in the ``all`` room, which every event goes to.
+"""
+
+from typing import Dict, Iterable, List
+
+ALL = "all"
+
+_TASK_EVENTS = ("task:created", "task:assigned", "task:completed")
+
+
+def event_rooms(event: str, data: Dict, capabilities: Iterable[str]) -> List[str]:
+    """Rooms an event goes to, given the (lower-cased) capabilities anyone subscribed to"""
+    rooms = [ALL, f"event:{event}"]
+    if data.get("discussion_id") is not None:
+        rooms.append(f"discussion:{data['discussion_id']}")
+    if event in _TASK_EVENTS:
+        if data.get("assigned_agent_id"):
+            rooms.append(f"agent:{data['assigned_agent_id']}")
+        text = f"{data.get('title') or ''} {data.get('description') or ''}".lower()
+        rooms.extend(f"capability:{c}" for c in capabilities if c in text)
+    return rooms
+
+
+class Subscription:
+    """Topics a client subscribed to"""
+
+    def __init__(self, discussions: Iterable[int] = (), capabilities: Iterable[str] = (),
+                 agents: Iterable[int] = (), events: Iterable[str] = ()):
+        self.discussions = set(discussions)
+        self.capabilities = {c.lower() for c in capabilities}
+        self.agents = set(agents)
+        self.events = set(events)
+
+    def update(self, other: "Subscription"):
+        """Add another subscription's topics to this one"""
+        self.discussions |= other.discussions
+        self.capabilities |= other.capabilities
+        self.agents |= other.agents
+        self.events |= other.events
+
+    def rooms(self) -> List[str]:
+        return ([f"discussion:{d}" for d in self.discussions] + [f"agent:{a}" for a in self.agents]
+                + [f"capability:{c}" for c in self.capabilities] + [f"event:{e}" for e in self.events])
+
+    def matches(self, event: str, data: Dict) -> bool:
+        """Whether the server would send this event to the subscriber"""
+        return not set(event_rooms(event, data, self.capabilities)).isdisjoint(self.rooms())
+
+    def to_payload(self) -> Dict:
+        return {
+            "discussions": sorted(self.discussions),
+            "capabilities": sorted(self.capabilities),
+            "agents": sorted(self.agents),
+            "events": sorted(self.events),
+        }
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def _stamp(record: Dict) -> Optional[str]:
+    return record.get('updated_at') or record.get('created_at')
+
+
+def _step_back(stamp: str) -> str:
+    """The stamp one millisecond earlier, in the backend's format"""
+    try:
+        moment = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+    except ValueError:
+        return stamp
+    return (moment - timedelta(milliseconds=1)).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class DeltaCursor:
+    """Remembers how far a collection has been read and fetches only what changed
+
+    The first ``poll()`` returns the whole collection; later polls return
+    records created or updated since the previous one, paging lazily with
+    :meth:`AMAIPClient.iter_since`.
+
+    The server's ``updated_after`` is exclusive and stamps have millisecond
+    resolution, so polls ask from one millisecond before the newest stamp
+    seen and drop the records already returned at that stamp. A record
+    changed later within that same millisecond is not missed.
+
+        tasks = client.delta("tasks")
+        for task in tasks.poll():
+            ...
+    """
+
+    def __init__(self, client, collection: str, discussion_id: int = None, page_size: int = 100):
+        self.client = client
+        self.collection = collection
+        self.discussion_id = discussion_id
+        self.page_size = page_size
+        self.updated_after: Optional[str] = None
+        # (id, stamp) of the records returned at the newest stamp
+        self._seen: Set[Tuple[int, str]] = set()
+
+    def poll(self) -> List[Dict]:
+        """Records new or changed since the last poll, in ascending id order"""
+        records = list(self.client.iter_since(
+            self.collection,
+            updated_after=_step_back(self.updated_after) if self.updated_after else None,
+            page_size=self.page_size,
+            discussion_id=self.discussion_id
+        ))
+        fresh = [r for r in records if (r.get('id'), _stamp(r)) not in self._seen]
+        for record in records:
+            stamp = _stamp(record)
+            if stamp and (self.updated_after is None or stamp > self.updated_after):
+                self.updated_after = stamp
+        self._seen = {(r.get('id'), _stamp(r)) for r in records if _stamp(r) == self.updated_after}
+        return fresh
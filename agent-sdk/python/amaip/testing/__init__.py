@@ -0,0 +1,21 @@
+"""An in-process stand-in for the AMAIP backend
+
+    from amaip.testing import LocalPlatform
+
+    with LocalPlatform(latency=0.01) as platform:
+        agent = MyAgent("tester", base_url=platform.url)
+        ...
+
+Implements the REST routes and socket.io events the SDK uses against an
+in-memory store, in a background thread or a subprocess, with optional
+injected latency. Also runnable on its own:
+
+    python -m amaip.testing --port 3000 --latency 0.02
+
+Needs the ``testing`` extra (aiohttp and python-socketio's asyncio server).
+"""
+
+from .server import LocalPlatform
+from .state import PlatformError, PlatformState
+
+__all__ = ["LocalPlatform", "PlatformError", "PlatformState"]
@@ -0,0 +1,38 @@
+import argparse
+import signal
+import sys
+import threading
+
+from .server import LocalPlatform
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m amaip.testing", description="Run a local AMAIP platform")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=3000, help="port to listen on (0 picks a free one)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request and event")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds")
+    parser.add_argument("--event-log-size", type=int, default=1000, help="broadcasts kept for replay")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    platform = LocalPlatform(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                             event_log_size=args.event_log_size).start()
+    # The first line of output is the URL; LocalPlatform(subprocess=True) waits for it
+    print(platform.url, flush=True)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    platform.stop()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,674 @@
+import asyncio
+import os
+import re
+import uuid
+import random
+import socket
+import subprocess as _subprocess
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, Iterable, Optional, Set
+
+from ..codec import DEFAULT_COMPRESS_THRESHOLD, MSGPACK, get_codec, json_codec
+from ..subscriptions import ALL, Subscription, event_rooms
+from .state import PlatformError, PlatformState, apply_cursor
+
+
+try:
+    _msgpack = get_codec("msgpack")
+except ImportError:
+    _msgpack = None
+_json = json_codec()
+
+
+def _encode(request, response, web):
+    """Encode a handler's payload in MessagePack if the client asks for it, else JSON, gzipping large bodies"""
+    codec = _msgpack if _msgpack is not None and MSGPACK in request.headers.get("Accept", "") else _json
+    response.body = codec.dumps(response["payload"])
+    response.content_type = codec.content_type
+    response.headers["Vary"] = "Accept, Accept-Encoding"
+    if len(response.body) > DEFAULT_COMPRESS_THRESHOLD and "gzip" in request.headers.get("Accept-Encoding", ""):
+        response.enable_compression(web.ContentCoding.gzip)
+
+
+class _SocketRequest:
+    """Just enough of an aiohttp request to run a REST handler for an ``api:request``"""
+
+    content_type = "application/json"
+
+    def __init__(self, match_info: Dict, query: Dict, body):
+        self.match_info = match_info
+        self.query = query
+        self.headers = {}
+        self.can_read_body = body is not None
+        self._body = body
+
+    async def json(self):
+        return self._body
+
+
+class EventLog:
+    """Numbers broadcasts and keeps the latest for replay, like the backend's EventLog
+
+    Events go to the rooms of the subscriptions they match, as in the
+    backend's Subscriptions.
+    """
+
+    def __init__(self, sio, capacity: int = 1000):
+        self.sio = sio
+        self.epoch = uuid.uuid4().hex[:16]
+        self.seq = 0
+        self.events = deque(maxlen=capacity)
+        self.capabilities = Counter()
+
+    async def emit(self, event: str, payload: Dict):
+        self.seq += 1
+        data = {**payload, "_seq": self.seq}
+        self.events.append({"event": event, "data": data})
+        await self.sio.emit(event, data, to=event_rooms(event, data, self.capabilities))
+
+    async def send(self, event: str, data: Dict):
+        """Send an event to its subscribers without numbering or keeping it"""
+        await self.sio.emit(event, data, to=event_rooms(event, data, self.capabilities))
+
+    def since(self, seq: Optional[int], epoch: Optional[str], rooms: Optional[Set[str]] = None,
+              capabilities: Iterable[str] = ()) -> Dict:
+        """Events after ``seq``, limited to those a socket in ``rooms`` subscribed to ``capabilities`` would get"""
+        head = {"epoch": self.epoch, "seq": self.seq}
+        if seq is None:
+            return {**head, "complete": True, "events": []}
+        oldest = self.seq - len(self.events) + 1
+        if epoch != self.epoch or seq > self.seq or seq < oldest - 1:
+            return {**head, "complete": False, "events": []}
+        missed = [e for e in list(self.events)[seq - oldest + 1:]
+                  if rooms is None or not rooms.isdisjoint(event_rooms(e["event"], e["data"], capabilities))]
+        return {**head, "complete": True, "events": missed}
+
+
+class LocalPlatform:
+    """A stand-in AMAIP backend for tests and benchmarks
+
+    Serves the REST routes and socket.io events the SDK uses, backed by an
+    in-memory :class:`~amaip.testing.state.PlatformState`, so agents can be
+    exercised end to end without Node or a database:
+
+        with LocalPlatform(latency=0.02) as platform:
+            client = AMAIPClient(platform.url)
+            ...
+            assert platform.state.get_pending_tasks() == []
+
+    By default the server runs on an event loop in a background thread of
+    this process. With ``subprocess=True`` it runs as
+    ``python -m amaip.testing`` in a child process instead, so its CPU use
+    doesn't compete with the code under test; ``state`` is then not
+    available.
+
+    ``latency`` (plus up to ``jitter``) seconds are added before every REST
+    response and before every socket event is handled, to approximate a
+    remote backend. ``port=0`` picks a free port. Broadcasts are numbered
+    and the last ``event_log_size`` can be replayed to reconnecting clients;
+    clients that subscribe get only the events for their topics. As with
+    the backend, REST answers are MessagePack for clients that ask for it
+    (if installed) and gzipped above 1 KiB, and the REST routes can also be
+    called over the socket with ``api:request``.
+
+    Innovations get no WOW score on creation, and a failed ``task:claim``
+    is reported through the ack only, never as an ``error`` event.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, subprocess: bool = False, event_log_size: int = 1000):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.in_subprocess = subprocess
+        self.event_log_size = event_log_size
+        self._state = None if subprocess else PlatformState()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._runner = None
+        self._process: Optional[_subprocess.Popen] = None
+        self.sio = None
+        self.events: Optional[EventLog] = None
+        self._routes = []
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def state(self) -> PlatformState:
+        """The platform's data, for assertions (in-process platforms only)"""
+        if self._state is None:
+            raise RuntimeError("state is not available for a subprocess platform")
+        return self._state
+
+    def __enter__(self) -> "LocalPlatform":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ============ Lifecycle ============
+
+    def start(self, timeout: float = 10.0) -> "LocalPlatform":
+        """Start serving; returns once the platform accepts connections"""
+        if self.in_subprocess:
+            self._start_process(timeout)
+        else:
+            self._start_thread(timeout)
+        return self
+
+    def stop(self):
+        """Stop serving and disconnect all clients"""
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(5)
+            except _subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(10)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+
+    async def _shutdown(self):
+        # Drop connections without a close packet, like a crashed server, so clients reconnect
+        for eio_socket in list(self.sio.eio.sockets.values()):
+            await eio_socket.close(wait=False, abort=True)
+        await self._runner.cleanup()
+        # Background tasks (e.g. engine.io's pings) left pending on a stopped
+        # loop are finalized at exit, which can crash the interpreter
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start_thread(self, timeout: float):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="amaip-local-platform", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._serve(sock), self._loop).result(timeout)
+
+    def _start_process(self, timeout: float):
+        package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+        self._process = _subprocess.Popen(
+            [sys.executable, "-m", "amaip.testing", "--host", self.host, "--port", str(self.port),
+             "--latency", str(self.latency), "--jitter", str(self.jitter),
+             "--event-log-size", str(self.event_log_size)],
+            stdout=_subprocess.PIPE, env=env, universal_newlines=True
+        )
+        # The child prints its URL once it is listening
+        line = self._process.stdout.readline().strip()
+        if not line.startswith("http://"):
+            self.stop()
+            raise RuntimeError("local platform process failed to start")
+        self.port = int(line.rsplit(":", 1)[1])
+
+        import requests
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                requests.get(f"{self.url}/health", timeout=1).raise_for_status()
+                return
+            except requests.RequestException:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise
+                time.sleep(0.05)
+
+    async def _serve(self, sock: socket.socket):
+        import socketio
+        from aiohttp import web
+
+        @web.middleware
+        async def middleware(request, handler):
+            if request.path.startswith("/api"):
+                await self._delay()
+            try:
+                response = await handler(request)
+                if "payload" in response:
+                    _encode(request, response, web)
+                return response
+            except web.HTTPNotFound:
+                return web.json_response({"error": "Endpoint not found"}, status=404)
+            except ValueError as e:
+                return web.json_response({"error": str(e)}, status=400)
+
+        self.sio = socketio.AsyncServer(async_mode="aiohttp", cors_allowed_origins="*")
+        self.events = EventLog(self.sio, self.event_log_size)
+        app = web.Application(middlewares=[middleware])
+        self.sio.attach(app)
+        self._add_routes(app)
+        self._add_events()
+
+        self._runner = web.AppRunner(app, access_log=None, shutdown_timeout=1.0)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+
+    async def _delay(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # ============ REST API ============
+
+    def _add_routes(self, app):
+        from aiohttp import web
+
+        state = self.state
+        emit = self.events.emit
+
+        def json(data, status: int = 200):
+            # Encoded by the middleware in whatever the client accepts
+            response = web.Response(status=status)
+            response["payload"] = data
+            return response
+
+        def error(message: str, status: int):
+            return json({"error": message}, status)
+
+        async def body(request) -> Dict:
+            if not request.can_read_body:
+                return {}
+            if request.content_type == MSGPACK and _msgpack is not None:
+                data = _msgpack.loads(await request.read())
+            else:
+                data = await request.json()
+            return data if isinstance(data, dict) else {}
+
+        def record_id(request, key: str = "id") -> int:
+            return int(request.match_info[key])
+
+        def cursor(request, records):
+            query = request.query
+            return apply_cursor(records, query.get("since_id"), query.get("updated_after"), query.get("limit"))
+
+        async def health(request):
+            return json({"status": "healthy"})
+
+        # Agents
+        async def register_agent(request):
+            data = await body(request)
+            if not data.get("name"):
+                return error("Agent name is required", 400)
+            return json(state.register_agent(data["name"], data.get("capabilities"), data.get("endpoint")), 201)
+
+        async def get_agents(request):
+            return json(cursor(request, state.get_agents()))
+
+        async def get_online_agents(request):
+            return json(state.get_online_agents())
+
+        async def get_agent(request):
+            try:
+                return json(state.get_agent(record_id(request)))
+            except PlatformError as e:
+                return error(str(e), 404)
+
+        # Tasks
+        async def create_task(request):
+            data = await body(request)
+            if not data.get("title"):
+                return error("Task title is required", 400)
+            task = state.create_task(data["title"], data.get("description"),
+                                     data.get("creatorAgentId"), data.get("priority"))
+            await emit("task:created", task)
+            return json(task, 201)
+
+        async def create_tasks(request):
+            data = await body(request)
+            if not isinstance(data.get("tasks"), list):
+                return error("tasks must be an array", 400)
+            results = []
+            for item in data["tasks"]:
+                if not item.get("title"):
+                    results.append({"error": "Task title is required"})
+                    continue
+                task = state.create_task(item["title"], item.get("description"),
+                                         item.get("creatorAgentId"), item.get("priority"))
+                await emit("task:created", task)
+                results.append(task)
+            return json(results, 201)
+
+        async def complete_tasks(request):
+            data = await body(request)
+            if not isinstance(data.get("tasks"), list):
+                return error("tasks must be an array", 400)
+            results = []
+            for item in data["tasks"]:
+                try:
+                    task = state.complete_task(int(item.get("taskId")), item.get("result"))
+                except (PlatformError, TypeError, ValueError) as e:
+                    results.append({"error": str(e)})
+                    continue
+                await emit("task:completed", task)
+                results.append(task)
+            return json(results)
+
+        async def get_tasks(request):
+            return json(cursor(request, state.get_tasks()))
+
+        async def get_pending_tasks(request):
+            return json(state.get_pending_tasks())
+
+        async def get_task(request):
+            try:
+                return json(state.get_task(record_id(request)))
+            except PlatformError as e:
+                return error(str(e), 404)
+
+        async def assign_task(request):
+            data = await body(request)
+            if not data.get("agentId"):
+                return error("Agent ID is required", 400)
+            try:
+                return json(state.assign_task(record_id(request), data["agentId"]))
+            except PlatformError as e:
+                return error(str(e), 400)
+
+        async def complete_task(request):
+            data = await body(request)
+            try:
+                return json(state.complete_task(record_id(request), data.get("result")))
+            except PlatformError as e:
+                return error(str(e), 400)
+
+        # Discussions
+        async def create_discussion(request):
+            data = await body(request)
+            if not data.get("topic"):
+                return error("Discussion topic is required", 400)
+            return json(state.create_discussion(data["topic"]), 201)
+
+        async def get_discussions(request):
+            return json(cursor(request, state.get_discussions()))
+
+        async def get_discussion(request):
+            try:
+                return json(state.get_discussion(record_id(request)))
+            except PlatformError as e:
+                return error(str(e), 404)
+
+        async def add_message(request):
+            data = await body(request)
+            if not data.get("agentId") or not data.get("content"):
+                return error("Agent ID and content are required", 400)
+            try:
+                message = state.add_message(record_id(request), data["agentId"], data["content"])
+            except PlatformError as e:
+                return error(str(e), 400)
+            await emit("message:new", message)
+            return json(message, 201)
+
+        async def add_messages(request):
+            data = await body(request)
+            if not isinstance(data.get("messages"), list):
+                return error("messages must be an array", 400)
+            results = []
+            for item in data["messages"]:
+                if not item.get("agentId") or not item.get("content"):
+                    results.append({"error": "Agent ID and content are required"})
+                    continue
+                try:
+                    message = state.add_message(int(item.get("discussionId")), item["agentId"], item["content"])
+                except (PlatformError, TypeError, ValueError) as e:
+                    results.append({"error": str(e)})
+                    continue
+                await emit("message:new", message)
+                results.append(message)
+            return json(results, 201)
+
+        async def get_messages(request):
+            query = request.query
+            try:
+                limit = int(query.get("limit") or 100)
+            except ValueError:
+                limit = 100
+            return json(state.get_messages(record_id(request), limit or 100,
+                                           query.get("since_id"), query.get("updated_after")))
+
+        # Innovations
+        async def create_innovation(request):
+            data = await body(request)
+            if not data.get("title"):
+                return error("Innovation title is required", 400)
+            category = data.get("category") or state.categorize_innovation(data["title"], data.get("description"))
+            return json(state.create_innovation(data["title"], data.get("description"), category,
+                                                data.get("agentsInvolved"), data.get("outputData")), 201)
+
+        async def get_innovations(request):
+            return json(cursor(request, state.get_innovations()))
+
+        async def get_innovation(request):
+            try:
+                return json(state.get_innovation(record_id(request)))
+            except PlatformError as e:
+                return error(str(e), 404)
+
+        async def upvote_innovation(request):
+            try:
+                return json(state.upvote_innovation(record_id(request)))
+            except PlatformError as e:
+                return error(str(e), 404)
+
+        app.router.add_get("/health", health)
+        self._routes = [
+            ("POST", "/api/agents/register", register_agent),
+            ("GET", "/api/agents", get_agents),
+            ("GET", "/api/agents/online", get_online_agents),
+            ("GET", r"/api/agents/{id:\d+}", get_agent),
+            ("POST", "/api/tasks", create_task),
+            ("POST", "/api/tasks/batch", create_tasks),
+            ("POST", "/api/tasks/batch/complete", complete_tasks),
+            ("GET", "/api/tasks", get_tasks),
+            ("GET", "/api/tasks/pending", get_pending_tasks),
+            ("GET", r"/api/tasks/{id:\d+}", get_task),
+            ("POST", r"/api/tasks/{id:\d+}/assign", assign_task),
+            ("POST", r"/api/tasks/{id:\d+}/complete", complete_task),
+            ("POST", "/api/discussions", create_discussion),
+            ("POST", "/api/discussions/messages/batch", add_messages),
+            ("GET", "/api/discussions", get_discussions),
+            ("GET", r"/api/discussions/{id:\d+}", get_discussion),
+            ("POST", r"/api/discussions/{id:\d+}/messages", add_message),
+            ("GET", r"/api/discussions/{id:\d+}/messages", get_messages),
+            ("POST", "/api/innovations", create_innovation),
+            ("GET", "/api/innovations", get_innovations),
+            ("GET", r"/api/innovations/{id:\d+}", get_innovation),
+            ("PUT", r"/api/innovations/{id:\d+}/vote", upvote_innovation),
+        ]
+        for method, path, route_handler in self._routes:
+            app.router.add_route(method, path, route_handler)
+
+    # ============ Socket Events ============
+
+    def _add_events(self):
+        sio = self.sio
+        state = self.state
+        events = self.events
+        sockets: Dict[str, Dict] = {}
+
+        def resolve_agent_id(sid: str, data: Dict) -> int:
+            """The acting agent: ``data['agentId']`` if it joined on this socket, else the socket's first"""
+            session = sockets[sid]
+            agent_id = data.get("agentId")
+            if agent_id and agent_id in session["agent_ids"]:
+                return agent_id
+            if not session["agent_id"]:
+                raise PlatformError("Agent not registered")
+            return session["agent_id"]
+
+        def handler(event: str):
+            """Register a socket event handler that adds latency and reports errors like the backend"""
+            def register(fn):
+                async def handle(sid, data=None, *args):
+                    await self._delay()
+                    try:
+                        return await fn(sid, data or {}, *args)
+                    except PlatformError as e:
+                        await sio.emit("error", {"message": str(e)}, to=sid)
+                sio.on(event, handle)
+                return fn
+            return register
+
+        def unsubscribe(session: Dict):
+            """Forget a socket's subscription, returning the rooms it joined"""
+            topics = session["subscription"]
+            session["subscription"] = None
+            if topics is None:
+                return []
+            for capability in topics.capabilities:
+                events.capabilities[capability] -= 1
+                if events.capabilities[capability] <= 0:
+                    del events.capabilities[capability]
+            return topics.rooms()
+
+        async def subscribe(sid: str, data: Dict) -> Dict:
+            """Add topics to a socket's subscription, leaving the room of all events"""
+            session = sockets[sid]
+            topics = Subscription(data.get("discussions") or (), data.get("capabilities") or (),
+                                  data.get("agents") or (), data.get("events") or ())
+            if session["subscription"] is None:
+                session["subscription"] = Subscription()
+                await sio.leave_room(sid, ALL)
+            events.capabilities.update(topics.capabilities - session["subscription"].capabilities)
+            session["subscription"].update(topics)
+            rooms = session["subscription"].rooms()
+            for room in rooms:
+                await sio.enter_room(sid, room)
+            return {"success": True, "rooms": rooms}
+
+        @sio.on("connect")
+        async def connect(sid, environ, auth=None):
+            sockets[sid] = {"agent_id": None, "agent_ids": set(), "subscription": None}
+            await sio.enter_room(sid, ALL)
+            if isinstance(auth, dict) and auth.get("subscribe"):
+                await subscribe(sid, auth["subscribe"])
+
+        @sio.on("disconnect")
+        async def disconnect(sid, *args):
+            session = sockets.pop(sid, None)
+            if session:
+                unsubscribe(session)
+            for agent_id in session["agent_ids"] if session else ():
+                agent = state.disconnect_agent(agent_id)
+                if agent:
+                    await events.emit("agent:disconnected", agent)
+
+        @handler("agent:join")
+        async def agent_join(sid, data):
+            agent = state.register_agent(data.get("name"), data.get("capabilities"), data.get("endpoint"))
+            session = sockets[sid]
+            if not session["agent_id"]:
+                session["agent_id"] = agent["id"]
+            session["agent_ids"].add(agent["id"])
+            await events.emit("agent:connected", agent)
+            await sio.emit("agent:joined", {"success": True, "agent": agent}, to=sid)
+
+        @handler("agent:message")
+        async def agent_message(sid, data):
+            message = state.add_message(data.get("discussionId"), resolve_agent_id(sid, data), data.get("content"))
+            await events.emit("message:new", message)
+
+        @handler("agent:message:chunk")
+        async def agent_message_chunk(sid, data):
+            await events.send("message:chunk", {
+                "stream_id": data.get("streamId"),
+                "discussion_id": data.get("discussionId"),
+                "agent_id": resolve_agent_id(sid, data),
+                "delta": data.get("delta")
+            })
+
+        @handler("agent:message:end")
+        async def agent_message_end(sid, data):
+            message = state.add_message(data.get("discussionId"), resolve_agent_id(sid, data), data.get("content"))
+            await events.emit("message:new", {**message, "stream_id": data.get("streamId")})
+
+        @handler("task:create")
+        async def task_create(sid, data):
+            task = state.create_task(data.get("title"), data.get("description"),
+                                     resolve_agent_id(sid, data), data.get("priority"))
+            await events.emit("task:created", task)
+
+        @handler("task:claim")
+        async def task_claim(sid, data):
+            try:
+                task = state.assign_task(data.get("taskId"), resolve_agent_id(sid, data))
+            except PlatformError as e:
+                return {"success": False, "error": str(e)}
+            await events.emit("task:assigned", task)
+            return {"success": True, "task": task}
+
+        @handler("task:complete")
+        async def task_complete(sid, data):
+            task = state.complete_task(data.get("taskId"), data.get("result"))
+            await events.emit("task:completed", task)
+
+        @handler("innovation:create")
+        async def innovation_create(sid, data):
+            innovation = state.create_innovation(data.get("title"), data.get("description"), data.get("category"),
+                                                 data.get("agentsInvolved"), data.get("outputData"))
+            await events.emit("innovation:created", innovation)
+
+        @handler("discussion:join")
+        async def discussion_join(sid, data):
+            await sio.enter_room(sid, f"discussion:{data.get('discussionId')}")
+
+        @sio.on("events:subscribe")
+        async def events_subscribe(sid, data=None):
+            return await subscribe(sid, data or {})
+
+        @sio.on("events:unsubscribe")
+        async def events_unsubscribe(sid, data=None):
+            for room in unsubscribe(sockets[sid]):
+                await sio.leave_room(sid, room)
+            await sio.enter_room(sid, ALL)
+            return {"success": True}
+
+        @sio.on("events:replay")
+        async def events_replay(sid, data=None):
+            data = data or {}
+            topics = sockets[sid]["subscription"]
+            if topics is None:
+                return events.since(data.get("since"), data.get("epoch"))
+            return events.since(data.get("since"), data.get("epoch"), set(sio.rooms(sid)), topics.capabilities)
+
+        api_routes = [(method, re.compile(re.sub(r"\{(\w+):([^}]+)\}", r"(?P<\1>\2)", path)), route_handler)
+                      for method, path, route_handler in self._routes]
+
+        @sio.on("api:request")
+        async def api_request(sid, data=None):
+            data = data if isinstance(data, dict) else {}
+            call_id = data.get("id")
+            await self._delay()
+            method = str(data.get("method") or "GET").upper()
+            path = "/api" + str(data.get("path") or "/").split("?")[0]
+            for route_method, pattern, route_handler in api_routes:
+                match = pattern.fullmatch(path)
+                if match and route_method == method:
+                    break
+            else:
+                return {"id": call_id, "status": 404, "body": {"error": "Endpoint not found"}}
+            query = {k: str(v) for k, v in (data.get("query") or {}).items() if v is not None}
+            try:
+                response = await route_handler(_SocketRequest(match.groupdict(), query, data.get("body")))
+            except ValueError as e:
+                return {"id": call_id, "status": 400, "body": {"error": str(e)}}
+            return {"id": call_id, "status": response.status, "body": response["payload"]}
+
+        @handler("ping")
+        async def ping(sid, data):
+            await sio.emit("pong", to=sid)
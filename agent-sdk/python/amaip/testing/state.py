@@ -0,0 +1,283 @@
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+TASK_STATUSES = ('pending', 'in_progress', 'completed', 'cancelled')
+
+
+class PlatformError(Exception):
+    """A request the real backend would reject, with its error message"""
+
+
+def _now() -> str:
+    """Current time in the backend's format (JavaScript ``toISOString``)"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _parse_time(value: str) -> datetime:
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_cursor(records: List[Dict], since_id=None, updated_after=None, limit=None) -> List[Dict]:
+    """Same semantics as the backend's ``applyCursor``"""
+    since = _int(since_id)
+    after = _parse_time(updated_after) if updated_after else None
+    max_items = _int(limit)
+
+    if since is None and after is None:
+        return records if max_items is None else records[:max_items]
+
+    page = sorted(
+        (r for r in records
+         if (since is None or r['id'] > since)
+         and (after is None or _parse_time(r.get('updated_at') or r['created_at']) > after)),
+        key=lambda r: r['id']
+    )
+    return page if max_items is None else page[:max_items]
+
+
+class PlatformState:
+    """In-memory copy of the backend's data model and services
+
+    Mirrors the JSON-file database, models and services of the Node
+    backend closely enough for SDK tests and benchmarks: same fields, same
+    orderings, same error messages. Safe to inspect from test code while
+    the platform is running.
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[int, Dict]] = {
+            'agents': {}, 'tasks': {}, 'discussions': {}, 'messages': {}, 'innovations': {}
+        }
+        self._counters = {table: 0 for table in self.tables}
+        self.lock = threading.RLock()
+
+    # ============ Storage ============
+
+    def _insert(self, table: str, record: Dict) -> Dict:
+        self._counters[table] += 1
+        now = _now()
+        record = {'id': self._counters[table], **record, 'created_at': now, 'updated_at': now}
+        self.tables[table][record['id']] = record
+        return record
+
+    def _update(self, table: str, record_id: int, **updates) -> Optional[Dict]:
+        record = self.tables[table].get(record_id)
+        if record is None:
+            return None
+        record.update(updates, updated_at=_now())
+        return record
+
+    def _newest_first(self, records) -> List[Dict]:
+        return sorted(records, key=lambda r: r['created_at'], reverse=True)
+
+    # ============ Agents ============
+
+    def register_agent(self, name: str, capabilities: List[str] = None, endpoint: str = None) -> Dict:
+        with self.lock:
+            for agent in self.tables['agents'].values():
+                if agent['name'] == name:
+                    return dict(self._update('agents', agent['id'], status='online', last_seen=_now()))
+            return dict(self._insert('agents', {
+                'name': name,
+                'capabilities': capabilities or [],
+                'endpoint': endpoint,
+                'status': 'online',
+                'last_seen': _now()
+            }))
+
+    def get_agent(self, agent_id: int) -> Dict:
+        with self.lock:
+            agent = self.tables['agents'].get(agent_id)
+            if agent is None:
+                raise PlatformError('Agent not found')
+            return dict(agent)
+
+    def get_agents(self) -> List[Dict]:
+        with self.lock:
+            return [dict(a) for a in self._newest_first(self.tables['agents'].values())]
+
+    def get_online_agents(self) -> List[Dict]:
+        with self.lock:
+            online = [dict(a) for a in self.tables['agents'].values() if a['status'] == 'online']
+            return sorted(online, key=lambda a: a['last_seen'], reverse=True)
+
+    def disconnect_agent(self, agent_id: int) -> Optional[Dict]:
+        with self.lock:
+            agent = self._update('agents', agent_id, status='offline', last_seen=_now())
+            return dict(agent) if agent else None
+
+    # ============ Tasks ============
+
+    def _task(self, task: Dict) -> Dict:
+        creator = self.tables['agents'].get(task['creator_agent_id'])
+        assigned = self.tables['agents'].get(task['assigned_agent_id'])
+        return {
+            **task,
+            'creator_name': creator['name'] if creator else None,
+            'assigned_name': assigned['name'] if assigned else None
+        }
+
+    def create_task(self, title: str, description: str = None, creator_agent_id: int = None,
+                    priority: int = 0) -> Dict:
+        with self.lock:
+            return dict(self._insert('tasks', {
+                'title': title,
+                'description': description,
+                'creator_agent_id': creator_agent_id,
+                'assigned_agent_id': None,
+                'status': 'pending',
+                'priority': priority or 0,
+                'completed_at': None
+            }))
+
+    def get_task(self, task_id: int) -> Dict:
+        with self.lock:
+            task = self.tables['tasks'].get(task_id)
+            if task is None:
+                raise PlatformError('Task not found')
+            return self._task(task)
+
+    def get_tasks(self) -> List[Dict]:
+        with self.lock:
+            return [self._task(t) for t in self._newest_first(self.tables['tasks'].values())]
+
+    def get_pending_tasks(self) -> List[Dict]:
+        with self.lock:
+            pending = [t for t in self.tables['tasks'].values() if t['status'] == 'pending']
+            pending.sort(key=lambda t: t['created_at'])
+            pending.sort(key=lambda t: t['priority'] or 0, reverse=True)
+            return [self._task(t) for t in pending]
+
+    def assign_task(self, task_id: int, agent_id: int) -> Dict:
+        """Give a pending task to an agent; the check and update are atomic"""
+        with self.lock:
+            task = self.get_task(task_id)
+            if task['status'] != 'pending':
+                raise PlatformError('Task is not available for assignment')
+            self.get_agent(agent_id)
+            return self._task(self._update('tasks', task_id, assigned_agent_id=agent_id, status='in_progress'))
+
+    def update_task_status(self, task_id: int, status: str) -> Optional[Dict]:
+        with self.lock:
+            if status not in TASK_STATUSES:
+                raise PlatformError('Invalid task status')
+            updates = {'status': status}
+            if status == 'completed':
+                updates['completed_at'] = _now()
+            task = self._update('tasks', task_id, **updates)
+            return self._task(task) if task else None
+
+    def complete_task(self, task_id: int, result: str = None) -> Dict:
+        with self.lock:
+            task = self.get_task(task_id)
+            if task['status'] == 'completed':
+                raise PlatformError('Task is already completed')
+            # Like the backend, the result is not stored
+            return self._task(self._update('tasks', task_id, status='completed', completed_at=_now()))
+
+    # ============ Discussions ============
+
+    def _discussion(self, discussion: Dict) -> Dict:
+        count = sum(1 for m in self.tables['messages'].values() if m['discussion_id'] == discussion['id'])
+        return {**discussion, 'message_count': count}
+
+    def _message(self, message: Dict) -> Dict:
+        agent = self.tables['agents'].get(message['agent_id'])
+        return {**message, 'agent_name': agent['name'] if agent else None}
+
+    def create_discussion(self, topic: str) -> Dict:
+        with self.lock:
+            return dict(self._insert('discussions', {'topic': topic, 'status': 'active'}))
+
+    def get_discussion(self, discussion_id: int) -> Dict:
+        with self.lock:
+            discussion = self.tables['discussions'].get(discussion_id)
+            if discussion is None:
+                raise PlatformError('Discussion not found')
+            return dict(discussion)
+
+    def get_discussions(self) -> List[Dict]:
+        with self.lock:
+            return [self._discussion(d) for d in self._newest_first(self.tables['discussions'].values())]
+
+    def close_discussion(self, discussion_id: int) -> Optional[Dict]:
+        with self.lock:
+            discussion = self._update('discussions', discussion_id, status='closed')
+            return dict(discussion) if discussion else None
+
+    def add_message(self, discussion_id: int, agent_id: int, content: str) -> Dict:
+        with self.lock:
+            discussion = self.get_discussion(discussion_id)
+            self.get_agent(agent_id)
+            if discussion['status'] != 'active':
+                raise PlatformError('Discussion is not active')
+            return self._message(self._insert('messages', {
+                'discussion_id': discussion_id,
+                'agent_id': agent_id,
+                'content': content
+            }))
+
+    def get_messages(self, discussion_id: int, limit: int = 100, since_id=None, updated_after=None) -> List[Dict]:
+        with self.lock:
+            messages = [m for m in self.tables['messages'].values() if m['discussion_id'] == discussion_id]
+            if since_id or updated_after:
+                page = apply_cursor(messages, since_id, updated_after, limit)
+            else:
+                page = sorted(messages, key=lambda m: m['created_at'])[-limit:]
+            return [self._message(m) for m in page]
+
+    # ============ Innovations ============
+
+    def create_innovation(self, title: str, description: str = None, category: str = None,
+                          agents_involved: List[int] = None, output_data: Dict = None) -> Dict:
+        with self.lock:
+            return dict(self._insert('innovations', {
+                'title': title,
+                'description': description,
+                'category': category,
+                'agents_involved': agents_involved or [],
+                'output_data': output_data or {},
+                'wow_score': 0
+            }))
+
+    @staticmethod
+    def categorize_innovation(title: str, description: str = None) -> str:
+        """The backend's keyword-based category for an innovation"""
+        text = f"{title} {description}".lower()
+        for category, keywords in (
+            ('automation', ('automat', 'workflow')),
+            ('tools', ('tool', 'utility')),
+            ('ai-ml', ('ai', 'ml', 'model')),
+            ('services', ('api', 'service')),
+            ('interfaces', ('ui', 'interface', 'dashboard')),
+            ('data-analytics', ('data', 'analyt')),
+        ):
+            if any(k in text for k in keywords):
+                return category
+        return 'general'
+
+    def get_innovation(self, innovation_id: int) -> Dict:
+        with self.lock:
+            innovation = self.tables['innovations'].get(innovation_id)
+            if innovation is None:
+                raise PlatformError('Innovation not found')
+            return dict(innovation)
+
+    def get_innovations(self) -> List[Dict]:
+        with self.lock:
+            return [dict(i) for i in self._newest_first(self.tables['innovations'].values())]
+
+    def upvote_innovation(self, innovation_id: int) -> Dict:
+        with self.lock:
+            innovation = self.get_innovation(innovation_id)
+            return dict(self._update('innovations', innovation_id, wow_score=innovation['wow_score'] + 1))
@@ -0,0 +1,138 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A delayed or periodic job registered with a :class:`JobScheduler`"""
+
+    def __init__(self, name: str, fn: Callable, args: tuple, interval: Optional[float], due: float):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.interval = interval
+        self.due = due
+        self.runs = 0
+        self.skipped = 0
+        self.running = False
+        self.cancelled = False
+        self._scheduler: Optional["JobScheduler"] = None
+
+    def cancel(self):
+        """Stop the job; a run already in progress finishes"""
+        self.cancelled = True
+        if self._scheduler:
+            self._scheduler._wake()
+
+
+class JobScheduler:
+    """Runs delayed and periodic jobs off the socket thread
+
+    Due times are kept in a heap on the monotonic clock and one timer thread
+    hands due jobs to a worker pool, so a slow job never delays the others
+    or the socket reader.
+
+    Periodic jobs keep a fixed cadence (``start + n * interval``) however
+    long each run takes. A run that is due while the previous one is still
+    going is skipped rather than overlapped, and periods missed entirely
+    (e.g. after a long pause) are coalesced into one run. Both are counted
+    in ``Job.skipped``.
+
+        scheduler = JobScheduler()
+        scheduler.every(60, sweep, name="sweep")
+        scheduler.after(2, announce, "ready")
+    """
+
+    def __init__(self, max_workers: int = 4, executor: Optional[Executor] = None):
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="amaip-timer"
+        )
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def every(self, interval: float, fn: Callable, *args, name: str = None,
+              delay: Optional[float] = None) -> Job:
+        """Run ``fn(*args)`` every ``interval`` seconds, first after ``delay`` (default: one interval)"""
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        first = interval if delay is None else delay
+        return self._add(Job(name or getattr(fn, "__name__", "job"), fn, args, interval,
+                             time.monotonic() + first))
+
+    def after(self, delay: float, fn: Callable, *args, name: str = None) -> Job:
+        """Run ``fn(*args)`` once, ``delay`` seconds from now"""
+        return self._add(Job(name or getattr(fn, "__name__", "job"), fn, args, None,
+                             time.monotonic() + delay))
+
+    def _add(self, job: Job) -> Job:
+        job._scheduler = self
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("JobScheduler is shut down")
+            heapq.heappush(self._heap, (job.due, next(self._seq), job))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="amaip-timers", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return job
+
+    def _wake(self):
+        with self._cond:
+            self._cond.notify()
+
+    def _loop(self):
+        with self._cond:
+            while not self._closed:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                due, _, job = self._heap[0]
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+                heapq.heappop(self._heap)
+
+                if job.running:
+                    job.skipped += 1
+                else:
+                    job.running = True
+                    self.executor.submit(self._run, job)
+
+                if job.interval is not None:
+                    missed = int((now - due) // job.interval)
+                    job.skipped += missed
+                    job.due = due + (missed + 1) * job.interval
+                    heapq.heappush(self._heap, (job.due, next(self._seq), job))
+
+    def _run(self, job: Job):
+        try:
+            job.fn(*job.args)
+        except Exception:
+            logger.exception("Error in timer job %s", job.name)
+        finally:
+            job.runs += 1
+            job.running = False
+
+    def shutdown(self, wait: bool = False):
+        """Cancel all jobs and, if we own it, shut the worker pool down"""
+        with self._cond:
+            self._closed = True
+            for _, _, job in self._heap:
+                job.cancelled = True
+            self._heap.clear()
+            self._cond.notify_all()
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
@@ -0,0 +1,50 @@
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+_shared_session: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+
+
+def create_session(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                   max_retries: int = 0,
+                   keep_alive: bool = True,
+                   pool_block: bool = False) -> requests.Session:
+    """Create a pooled HTTP session.
+
+    ``pool_connections`` is the number of hosts kept in the pool and
+    ``pool_maxsize`` the number of keep-alive connections per host.
+    With ``pool_block`` set, callers wait for a free connection instead
+    of opening a throwaway one when the per-host limit is reached.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+        pool_block=pool_block
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_shared_session(**pool_options) -> requests.Session:
+    """Get the process-wide session shared by agents that opt into it.
+
+    Pool options are only applied when the session is first created.
+    """
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = create_session(**pool_options)
+        return _shared_session
@@ -5,10 +5,33 @@ setup(
     version="1.0.0",
     description="Python SDK for Autonomous Multi-Agent Innovation Platform",
     author="Neeraj Sachdeva",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     install_requires=[
         "python-socketio[client]>=5.10.0",
         "requests>=2.31.0",
     ],
+    extras_require={
+        "asyncio": [
+            "python-socketio[asyncio_client]>=5.10.0",
+            "aiohttp>=3.8.0",
+        ],
+        "codec": [
+            "msgpack>=1.0",
+            "orjson>=3.6",
+        ],
+        "matching": [
+            "numpy>=1.17",
+        ],
+        "testing": [
+            "python-socketio[asyncio_client]>=5.10.0",
+            "aiohttp>=3.8.0",
+            "pytest>=7.0",
+        ],
+    },
+    entry_points={
+        "console_scripts": [
+            "amaip-bench=amaip.bench.__main__:main",
+        ],
+    },
     python_requires=">=3.7",
 )
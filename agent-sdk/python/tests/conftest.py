@@ -0,0 +1,26 @@
+import pytest
+
+from amaip.client import AMAIPClient
+from amaip.testing import LocalPlatform
+
+
+@pytest.fixture
+def platform():
+    with LocalPlatform() as platform:
+        yield platform
+
+
+@pytest.fixture
+def make_client(platform):
+    """Clients of the test's platform, disconnected and closed afterwards"""
+    clients = []
+
+    def make(**options) -> AMAIPClient:
+        client = AMAIPClient(platform.url, **options)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.disconnect()
+        client.close()
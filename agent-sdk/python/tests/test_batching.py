@@ -0,0 +1,88 @@
+import pytest
+
+from amaip.batching import BatchItemError, BatchWriter
+
+from .util import wait_for
+
+
+def test_writes_are_sent_as_batches(platform, make_client):
+    client = make_client()
+    with client.batcher(max_batch=5, flush_interval=10) as batch:
+        futures = [batch.create_task(f"Task {i}") for i in range(12)]
+        # Two full batches went out at once; the rest waits for the flush
+        assert [f.done() for f in futures] == [True] * 10 + [False] * 2
+    assert [f.result()["title"] for f in futures] == [f"Task {i}" for i in range(12)]
+    assert len(platform.state.get_tasks()) == 12
+
+
+def test_flush_interval_sends_a_partial_batch(make_client):
+    client = make_client()
+    batch = client.batcher(max_batch=50, flush_interval=0.02)
+    future = batch.create_task("Lonely")
+    assert future.result(timeout=5)["title"] == "Lonely"
+    batch.close()
+
+
+def test_rejected_items_fail_only_their_own_future(platform, make_client):
+    client = make_client()
+    agent_id = client.register_agent("worker")["id"]
+    task = client.create_task("Do it")
+    client.assign_task(task["id"], agent_id)
+    with client.batcher() as batch:
+        done = batch.complete_task(task["id"], "ok")
+        missing = batch.complete_task(999, "nope")
+    assert done.result()["status"] == "completed"
+    with pytest.raises(BatchItemError, match="Task not found"):
+        missing.result()
+
+
+def test_batch_completions_are_broadcast(platform, make_client):
+    # user-005: /tasks/batch/complete emits task:completed like /tasks/batch emits task:created
+    client = make_client()
+    completed = []
+    client.add_listener("task:completed", lambda task: completed.append(task["id"]))
+    client.connect()
+    agent_id = client.register_agent("worker")["id"]
+    tasks = client.create_tasks([{"title": "a"}, {"title": "b"}])
+    for task in tasks:
+        client.assign_task(task["id"], agent_id)
+    client.complete_tasks([{"task_id": task["id"], "result": "ok"} for task in tasks] + [{"task_id": 999}])
+    wait_for(lambda: len(completed) == 2)
+    assert sorted(completed) == [task["id"] for task in tasks]
+
+
+class _ShortClient:
+    """Answers batches with fewer results than items"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def create_tasks(self, items):
+        return self.results
+
+    complete_tasks = add_messages = create_tasks
+
+
+@pytest.mark.parametrize("results", [[{"id": 1}], None, {"error": "odd"}])
+def test_items_without_a_result_fail_instead_of_hanging(results):
+    # user-005: leftover futures used to stay pending forever
+    batch = BatchWriter(_ShortClient(results), max_batch=3)
+    futures = [batch.create_task(f"Task {i}") for i in range(3)]
+    answered = 1 if isinstance(results, list) else 0
+    for future in futures[:answered]:
+        assert future.result(timeout=1) == {"id": 1}
+    for future in futures[answered:]:
+        with pytest.raises(BatchItemError, match="No result"):
+            future.result(timeout=1)
+
+
+def test_request_errors_fail_the_whole_batch():
+    class Broken(_ShortClient):
+        def create_tasks(self, items):
+            raise ConnectionError("down")
+
+    batch = BatchWriter(Broken(None), max_batch=2)
+    futures = [batch.create_task("a"), batch.create_task("b")]
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(timeout=1)
@@ -0,0 +1,41 @@
+import pytest
+
+from amaip.bench.runner import ASYNCIO, PROCESSES, THREADS, BenchConfig, expected_latencies, run_benchmark
+from amaip.bench.stats import Recorder, percentile
+
+
+def test_percentile_is_nearest_rank():
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 50) == 2.0
+    assert percentile(values, 99) == 4.0
+    assert percentile([], 50) == 0.0
+
+
+def test_completions_are_paired_by_task_id():
+    # user-017: task:completed carries nothing of the sender's, so its latency was never recorded
+    sender, receiver = Recorder(), Recorder()
+    sender.count_completion(1)
+    sender.count_completion(2)
+    receiver.saw_completion(1)
+    receiver.saw_completion(3)
+
+    # Sender and receiver may be different worker processes
+    merged = Recorder()
+    merged.merge(sender.to_dict())
+    merged.merge(receiver.to_dict())
+    report = merged.report(duration=1.0)
+    assert report["sent"]["task:complete"] == 2
+    assert report["received"]["task:completed"] == 1
+    assert report["latency_ms"]["task:completed"]["count"] == 1
+
+
+@pytest.mark.parametrize("mode", [THREADS, ASYNCIO, PROCESSES])
+def test_a_short_run_reports_every_latency(platform, mode):
+    if mode == ASYNCIO:
+        pytest.importorskip("aiohttp")
+    config = BenchConfig(url=platform.url, agents=3, mode=mode, duration=1.0, task_rate=3,
+                         message_rate=2, workers=2, warmup=0.2, drain=0.5)
+    report = run_benchmark(config)
+    for event in expected_latencies(config):
+        assert report["latency_ms"][event]["count"] > 0, event
+    assert report["claims"]["won"] > 0
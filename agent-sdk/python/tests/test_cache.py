@@ -0,0 +1,99 @@
+import threading
+
+from amaip import PlatformCache
+
+from .util import join, wait_for
+
+
+def pending_ids(cache):
+    return [task["id"] for task in cache.get_pending_tasks()]
+
+
+def test_view_follows_socket_events(platform, make_client):
+    client = make_client()
+    client.connect()
+    seeded = client.create_task("Seeded")
+    cache = PlatformCache(client, reconcile_interval=None)
+    cache.start()
+    assert pending_ids(cache) == [seeded["id"]]
+
+    agent_id, = join(client, "worker")
+    wait_for(lambda: [a["id"] for a in cache.get_online_agents()] == [agent_id])
+
+    urgent = client.create_task("Urgent", priority=5)
+    wait_for(lambda: pending_ids(cache) == [urgent["id"], seeded["id"]])
+    assert client.claim_task(urgent["id"], agent_id=agent_id)["success"]
+    wait_for(lambda: pending_ids(cache) == [seeded["id"]])
+    cache.stop()
+
+
+def test_batch_completions_leave_the_view(make_client):
+    # user-005: completions sent through /tasks/batch/complete must reach listeners
+    client = make_client()
+    client.connect()
+    tasks = client.create_tasks([{"title": "a"}, {"title": "b"}])
+    cache = PlatformCache(client, reconcile_interval=None)
+    cache.start()
+    assert len(pending_ids(cache)) == 2
+    client.complete_tasks([{"task_id": task["id"]} for task in tasks])
+    wait_for(lambda: pending_ids(cache) == [])
+    cache.stop()
+
+
+class _SlowClient:
+    """Serves a fixed snapshot, pausing mid-fetch until told to go on"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.listeners = {}
+        self.fetching = threading.Event()
+        self.proceed = threading.Event()
+        self.proceed.set()
+
+    def add_listener(self, event, listener):
+        self.listeners.setdefault(event, []).append(listener)
+
+    def remove_listener(self, event, listener):
+        self.listeners[event].remove(listener)
+
+    def emit(self, event, payload):
+        for listener in list(self.listeners.get(event, ())):
+            listener(payload)
+
+    def get_pending_tasks(self):
+        self.fetching.set()
+        self.proceed.wait(5)
+        return list(self.snapshot)
+
+    def get_online_agents(self):
+        return []
+
+
+def test_events_during_a_reconcile_are_not_lost():
+    # user-006: the snapshot used to overwrite events that arrived while it was fetched
+    client = _SlowClient([{"id": 1, "status": "pending"}])
+    cache = PlatformCache(client, reconcile_interval=None)
+    cache.start()
+
+    client.proceed.clear()
+    client.fetching.clear()
+    reconcile = threading.Thread(target=cache.reconcile)
+    reconcile.start()
+    client.fetching.wait(5)
+    client.emit("task:assigned", {"id": 1})
+    client.emit("task:created", {"id": 2, "status": "pending"})
+    client.proceed.set()
+    reconcile.join(5)
+
+    assert pending_ids(cache) == [2]
+
+
+def test_stop_detaches_from_the_client():
+    client = _SlowClient([])
+    cache = PlatformCache(client, reconcile_interval=None)
+    cache.start()
+    assert all(client.listeners[event] for event in PlatformCache.EVENTS)
+    cache.stop()
+    assert not any(client.listeners.values())
+    client.emit("task:created", {"id": 3, "status": "pending"})
+    assert pending_ids(cache) == []
@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from amaip import Agent, ClaimPolicy, HashRing, TaskScheduler
+from amaip.claims import ClaimResult
+
+from .util import join
+
+
+def test_ring_gives_every_task_one_owner():
+    ring = HashRing(["a", "b", "c"])
+    for task_id in range(200):
+        ranks = sorted(ring.rank(task_id, member) for member in "abc")
+        assert ranks == [0, 1, 2]
+
+
+def test_ring_moves_only_the_removed_members_tasks():
+    ring = HashRing(["a", "b", "c", "d"])
+    owners = {t: next(m for m in "abcd" if ring.rank(t, m) == 0) for t in range(500)}
+    ring.remove("d")
+    for task_id, owner in owners.items():
+        if owner != "d":
+            assert ring.rank(task_id, owner) == 0
+    assert {owner for owner in owners.values()} == set("abcd")
+
+
+def test_only_non_owners_defer():
+    ring = HashRing([1, 2])
+    policy = ClaimPolicy(ring=ring, stagger=0.1)
+    for task_id in range(50):
+        owner = 1 if ring.rank(task_id, 1) == 0 else 2
+        other = 3 - owner
+        assert policy.defer_for(task_id, owner) == 0.0
+        assert 0.1 <= policy.defer_for(task_id, other) < 0.2
+
+
+def test_exactly_one_racing_claim_wins(platform, make_client):
+    client = make_client()
+    client.connect()
+    agent_ids = join(client, *[f"agent-{i}" for i in range(5)])
+    task = client.create_task("Contended")
+    policy = ClaimPolicy(retries=0)
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda agent_id: policy.claim(client, task["id"], agent_id), agent_ids))
+    assert sum(result.success for result in results) == 1
+    assert all(result.lost for result in results if not result.success)
+    winner = next(result for result in results if result.success)
+    assert platform.state.get_task(task["id"])["assigned_agent_id"] == agent_ids[results.index(winner)]
+
+
+def test_claim_on_a_disconnected_socket_retries_and_fails(make_client):
+    # user-010: BadNamespaceError/ConnectionError used to escape the policy
+    client = make_client()
+    result = ClaimPolicy(retries=2, base_delay=0.001).claim(client, 1, agent_id=1)
+    assert not result.success and not result.lost
+    assert result.attempts == 3
+    assert result.error.startswith("Socket unavailable")
+
+
+def test_failed_claims_free_the_scheduler_slot(platform, make_client):
+    # user-010: a claim that raised leaked its TaskScheduler slot
+    scheduler = TaskScheduler(max_in_flight=1)
+    agent = Agent("worker", base_url=platform.url, client=make_client(),
+                  claim_policy=ClaimPolicy(retries=1, base_delay=0.001), scheduler=scheduler)
+    agent._register()
+    reported = []
+    agent.on_claim_result = reported.append
+
+    released = []
+    original = scheduler.release
+    scheduler.release = lambda task_id: (released.append(task_id), original(task_id))
+    result = agent.claim_task(5, wait=True)
+    assert not result and released == [5] and reported == [result]
+
+    agent.claim_policy.claim = lambda *args: 1 / 0
+    result = agent.claim_task(6, wait=True)
+    assert isinstance(result, ClaimResult) and not result
+    assert released == [5, 6]
+
+
+def test_agents_on_a_ring_split_tasks_without_losing_claims(platform, make_client):
+    ring = HashRing()
+    policy = ClaimPolicy(ring=ring, stagger=0.2, retries=0)
+    client = make_client()
+    client.connect()
+    agent_ids = join(client, "agent-0", "agent-1", "agent-2")
+    for agent_id in agent_ids:
+        ring.add(agent_id)
+
+    tasks = [client.create_task(f"Task {i}") for i in range(6)]
+    attempts = [(task["id"], agent_id) for task in tasks for agent_id in agent_ids]
+    with ThreadPoolExecutor(max_workers=len(attempts)) as pool:
+        results = list(pool.map(lambda attempt: policy.claim(client, *attempt), attempts))
+    won = [result for result in results if result.success]
+    assert len(won) == len(tasks)
+    assert all(result.lost for result in results if not result.success)
+    # Non-owners hold back long enough for the owner to win
+    assert all(ring.rank(r.task_id, r.task["assigned_agent_id"]) == 0 for r in won)
@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from amaip import Agent, EventDispatcher
+from amaip.dispatch import COALESCE, DROP
+
+from .util import wait_for
+
+
+def test_lane_limit_caps_concurrency():
+    dispatcher = EventDispatcher(max_workers=8, limits={"slow": 2}, ordered=False)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def hook(_):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    for i in range(10):
+        dispatcher.submit("slow", hook, i)
+    dispatcher.shutdown(wait=True)
+    assert peak[0] == 2
+
+
+def test_lanes_do_not_block_each_other():
+    dispatcher = EventDispatcher(max_workers=4, limits={"slow": 1})
+    release = threading.Event()
+    fast = threading.Event()
+    dispatcher.submit("slow", lambda _: release.wait(5), None)
+    dispatcher.submit("slow", lambda _: None, None)
+    dispatcher.submit("fast", lambda _: fast.set(), None)
+    assert fast.wait(2)
+    assert dispatcher.queue_depth("slow") == 1
+    release.set()
+    dispatcher.shutdown(wait=True)
+
+
+def test_same_key_runs_in_order_across_events():
+    dispatcher = EventDispatcher(max_workers=8)
+    seen = []
+
+    def hook(i):
+        time.sleep(0.005 * (5 - i % 5))
+        seen.append(i)
+
+    for i in range(20):
+        dispatcher.submit("task:created" if i % 2 else "task:assigned", hook, i, key=("task", 1))
+    wait_for(lambda: len(seen) == 20)
+    dispatcher.shutdown()
+    assert seen == list(range(20))
+
+
+def test_drop_policy_discards_new_events():
+    dispatcher = EventDispatcher(max_workers=1, max_queue=2, overflow=DROP)
+    release = threading.Event()
+    ran = []
+    dispatcher.submit("e", lambda _: release.wait(5), None)
+    results = [dispatcher.submit("e", ran.append, i) for i in range(5)]
+    assert results == [True, True, False, False, False]
+    assert dispatcher.dropped("e") == 3
+    release.set()
+    wait_for(lambda: len(ran) == 2)
+    dispatcher.shutdown()
+    assert ran == [0, 1]
+
+
+def test_coalesce_policy_replaces_queued_event_with_same_key():
+    dispatcher = EventDispatcher(max_workers=1, max_queue=10, overflow=COALESCE, ordered=False)
+    release = threading.Event()
+    ran = []
+    dispatcher.submit("e", lambda _: release.wait(5), None)
+    for version in range(3):
+        dispatcher.submit("e", ran.append, ("a", version), key="a")
+    dispatcher.submit("e", ran.append, ("b", 0), key="b")
+    assert dispatcher.queue_depth("e") == 2
+    release.set()
+    wait_for(lambda: len(ran) == 2)
+    dispatcher.shutdown()
+    assert ran == [("a", 2), ("b", 0)]
+
+
+def test_hook_errors_do_not_stop_the_lane():
+    dispatcher = EventDispatcher(max_workers=1)
+    ran = []
+    dispatcher.submit("e", lambda _: 1 / 0, None)
+    dispatcher.submit("e", ran.append, 1)
+    wait_for(lambda: ran)
+    dispatcher.shutdown()
+
+
+def test_process_pool_is_rejected():
+    # Hooks are bound methods of an agent holding sockets and locks
+    pool = ProcessPoolExecutor(max_workers=1)
+    try:
+        with pytest.raises(ValueError):
+            EventDispatcher(executor=pool)
+    finally:
+        pool.shutdown()
+
+
+def test_agent_hooks_run_on_the_dispatcher(platform, make_client):
+    hook_threads = []
+
+    class Worker(Agent):
+        def on_task_created(self, task):
+            hook_threads.append(threading.current_thread().name)
+
+    dispatcher = EventDispatcher(max_workers=2)
+    agent = Worker("worker", base_url=platform.url, client=make_client(), dispatcher=dispatcher)
+    thread = threading.Thread(target=agent.start, daemon=True)
+    thread.start()
+    wait_for(lambda: agent._running)
+
+    make_client().create_task("Write a report")
+    wait_for(lambda: hook_threads)
+    agent.stop()
+    assert hook_threads[0].startswith("amaip-dispatch")
@@ -0,0 +1,50 @@
+import threading
+import time
+
+from amaip import Agent, AgentFleet
+
+from .util import wait_for
+
+
+class Recorder(Agent):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tasks = []
+
+    def on_task_created(self, task):
+        self.tasks.append(task["title"])
+
+
+def test_agents_share_one_socket_and_each_get_events(platform, make_client):
+    fleet = AgentFleet(platform.url)
+    agents = [fleet.add(Recorder(f"agent-{i}", base_url=platform.url)) for i in range(3)]
+    thread = threading.Thread(target=fleet.start, daemon=True)
+    thread.start()
+    wait_for(lambda: fleet._running)
+    try:
+        assert {agent.client for agent in agents} == {fleet.client}
+        wait_for(lambda: len(platform.state.get_online_agents()) == 3)
+        make_client().create_task("Shared")
+        wait_for(lambda: all(agent.tasks == ["Shared"] for agent in agents))
+    finally:
+        fleet.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_stop_shuts_down_agent_timers():
+    # user-004: timers kept firing after the fleet stopped
+    fleet = AgentFleet("http://127.0.0.1:1")
+    first = fleet.add(Agent("a"))
+    second = fleet.add(Agent("b"))
+    hits = []
+    first.every(0.02, lambda: hits.append("tick"))
+    second.after(0.2, lambda: hits.append("late"))
+    wait_for(lambda: hits)
+    fleet.stop()
+    # A tick already running when the fleet stopped may still land
+    time.sleep(0.05)
+    count = len(hits)
+    time.sleep(0.3)
+    assert len(hits) == count
+    assert "late" not in hits
@@ -0,0 +1,97 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from amaip.llm import LLMGateway, ResponseCache, StubProvider
+
+
+def line_count(path):
+    with open(path) as f:
+        return sum(1 for _ in f)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+
+
+def test_cache_expires_entries():
+    cache = ResponseCache(ttl=0.01)
+    cache.set("a", "1")
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.jsonl")
+    ResponseCache(path=path).set("a", "1")
+    assert ResponseCache(path=path).get("a") == "1"
+
+
+def test_cache_file_stays_bounded(tmp_path):
+    # user-011: every set used to be appended forever
+    path = str(tmp_path / "cache.jsonl")
+    cache = ResponseCache(max_entries=10, path=path)
+    for i in range(500):
+        cache.set(str(i % 15), f"value {i}")
+        assert line_count(path) <= 2 * 10
+    reloaded = ResponseCache(max_entries=10, path=path)
+    assert line_count(path) == len(reloaded) == 10
+    assert reloaded.get(str(499 % 15)) == "value 499"
+
+
+def test_cache_drops_expired_and_torn_lines_on_load(tmp_path):
+    path = str(tmp_path / "cache.jsonl")
+    ResponseCache(path=path).set("a", "1")
+    with open(path, "a") as f:
+        f.write('["b", "torn')
+    cache = ResponseCache(path=path)
+    cache.set("c", "3")
+    reloaded = ResponseCache(path=path)
+    assert (reloaded.get("a"), reloaded.get("c")) == ("1", "3")
+    assert line_count(path) == 2
+
+    assert len(ResponseCache(ttl=0.0, path=path)) == 0
+    assert line_count(path) == 0
+
+
+def test_gateway_caches_and_coalesces_identical_prompts():
+    gate = threading.Event()
+    provider = StubProvider(reply=lambda prompt: gate.wait(5) and f"re: {prompt}")
+    gateway = LLMGateway()
+    gateway.register(provider)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(gateway.complete, "stub", "same") for _ in range(4)]
+        time.sleep(0.05)
+        gate.set()
+        assert {future.result() for future in futures} == {"re: same"}
+    assert provider.calls == 1
+    assert gateway.complete("stub", "same") == "re: same"
+    assert provider.calls == 1
+    assert gateway.stats == {"calls": 1, "cache_hits": 1, "coalesced": 3}
+
+
+def test_gateway_stats_count_every_call_under_concurrency():
+    # user-011: counters updated outside the lock lost increments
+    gateway = LLMGateway()
+    gateway.register(StubProvider())
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda i: gateway.complete("stub", str(i % 50)), range(5000)))
+    assert sum(gateway.stats.values()) == 5000
+    assert gateway.stats["calls"] + gateway.stats["coalesced"] >= 50
+
+
+def test_gateway_streams_and_caches_the_joined_answer():
+    provider = StubProvider(reply=lambda prompt: "one two three")
+    gateway = LLMGateway()
+    gateway.register(provider)
+    assert list(gateway.stream("stub", "p")) == ["one", " two", " three"]
+    # Answered from the cache in one piece
+    assert list(gateway.stream("stub", "p")) == ["one two three"]
+    assert provider.calls == 1
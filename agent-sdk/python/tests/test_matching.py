@@ -0,0 +1,82 @@
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from amaip.matching import TaskMatcher  # noqa: E402
+
+
+def task(task_id, title):
+    return {"id": task_id, "title": title}
+
+
+def test_scores_are_the_fraction_of_keywords_matched():
+    matcher = TaskMatcher()
+    matcher.add_agent("data", ["python", "machine learning"])
+    matcher.add_agent("art", ["painting"])
+    ranked = matcher.best_agents(task(1, "Train machine learning models in Python"))
+    assert ranked == [("data", 1.0)]
+    assert matcher.score(task(2, "Some painting and python scripts"), "data") == 0.5
+    assert matcher.assign([task(3, "Paintings"), task(4, "Cooking")]) == ["art", None]
+
+
+def test_changing_agents_invalidates_cached_rows():
+    matcher = TaskMatcher()
+    matcher.add_agent("a", ["python"])
+    job = task(1, "python and rust")
+    assert matcher.best_agents(job) == [("a", 1.0)]
+    matcher.add_agent("b", ["rust"])
+    assert sorted(matcher.best_agents(job)) == [("a", 1.0), ("b", 1.0)]
+    matcher.remove_agent("a")
+    assert matcher.best_agents(job) == [("b", 1.0)]
+
+
+def _race(matcher, tasks, errors):
+    """Score tasks on several threads while another removes and re-adds agents"""
+    def score():
+        try:
+            for i in range(200):
+                job = tasks[(i * 7) % len(tasks)]
+                (agent, value), = matcher.best_agents(job, k=1)
+                # Between a remove and a re-add another agent may lead with
+                # 0.5, but a full match must be the task's own agent
+                assert value in (0.5, 1.0) and (value < 1.0 or agent == job["id"] % 20)
+        except Exception as e:
+            errors.append(e)
+
+    def churn():
+        try:
+            for i in range(200):
+                agent = i % 20
+                matcher.remove_agent(agent)
+                matcher.add_agent(agent, [f"skill{agent}", "common"])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=score) for _ in range(4)] + [threading.Thread(target=churn)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_shared_matcher_is_consistent_across_threads():
+    # user-014: rebuilds racing lookups returned rows for a stale vocabulary
+    matcher = TaskMatcher()
+    for agent in range(20):
+        matcher.add_agent(agent, [f"skill{agent}", "common"])
+    tasks = [task(i, f"skill{i % 20} common") for i in range(200)]
+    errors = []
+    interval = sys.getswitchinterval()
+    # Switch threads often so rebuilds land in the middle of lookups
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(50):
+            _race(matcher, tasks, errors)
+            if errors:
+                break
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
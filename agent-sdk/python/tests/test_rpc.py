@@ -0,0 +1,85 @@
+import pytest
+import requests
+
+from amaip.client import AMAIPClient
+from amaip.rpc import RpcChannel, RpcError, RpcTimeoutError
+from amaip.testing import LocalPlatform
+
+from .util import wait_for
+
+
+def test_rest_calls_go_over_the_socket(platform, make_client):
+    client = make_client(rpc=True)
+    client.connect()
+    task = client.create_task("Over the socket", priority=2)
+    assert [t["id"] for t in client.get_tasks(since_id=task["id"] - 1)] == [task["id"]]
+    assert platform.state.get_task(task["id"])["priority"] == 2
+    assert client.rpc.outstanding == 0
+
+
+def test_error_statuses_raise_rpc_errors(make_client):
+    client = make_client(rpc=True)
+    client.connect()
+    with pytest.raises(RpcError) as error:
+        client.assign_task(999, 1)
+    assert error.value.status == 400
+    # Still a requests.HTTPError, like the same call over HTTP
+    assert isinstance(error.value, requests.HTTPError)
+
+
+def test_calls_before_connecting_fall_back_to_http(platform, make_client):
+    client = make_client(rpc=True)
+    assert client.register_agent("early")["name"] == "early"
+    assert client.rpc.outstanding == 0
+
+
+def test_pipelined_calls_are_matched_to_their_answers(make_client):
+    client = make_client(rpc=True)
+    client.connect()
+    futures = [client.rpc.request("POST", "/tasks", {"title": f"Task {i}"}) for i in range(20)]
+    assert [future.result(timeout=5)["title"] for future in futures] == [f"Task {i}" for i in range(20)]
+
+
+def test_calls_without_an_answer_time_out():
+    with LocalPlatform(latency=0.5) as slow:
+        client = AMAIPClient(slow.url, rpc=True, timeout=0.1)
+        client.connect()
+        try:
+            with pytest.raises(RpcTimeoutError):
+                client.get_tasks()
+            assert client.rpc.outstanding == 0
+        finally:
+            client.disconnect()
+            client.close()
+
+
+class _SilentSocket:
+    """Accepts emits and never answers them"""
+
+    def emit(self, event, payload, callback=None):
+        pass
+
+
+class _SilentClient:
+    metrics = None
+    sio = _SilentSocket()
+
+
+def test_a_dropped_socket_fails_outstanding_calls():
+    channel = RpcChannel(_SilentClient())
+    future = channel.request("GET", "/tasks")
+    assert channel.outstanding == 1
+    channel.disconnected()
+    with pytest.raises(requests.ConnectionError):
+        future.result(timeout=1)
+    assert channel.outstanding == 0
+
+
+def test_late_answers_after_a_timeout_are_ignored():
+    channel = RpcChannel(_SilentClient(), timeout=0.05)
+    future = channel.request("GET", "/tasks")
+    with pytest.raises(RpcTimeoutError):
+        future.result(timeout=1)
+    channel._answer(1, {"id": 1, "status": 200, "body": []})
+    wait_for(lambda: channel.outstanding == 0)
+    channel.close()
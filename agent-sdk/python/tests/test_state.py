@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from amaip.state import LOG, SQLITE, AgentStateStore
+
+
+@pytest.fixture(params=[LOG, SQLITE])
+def store_path(request, tmp_path):
+    path = str(tmp_path / ("state" if request.param == LOG else "state.db"))
+    return path, request.param
+
+
+def test_values_and_history_survive_reopen(store_path):
+    path, backend = store_path
+    store = AgentStateStore(path, backend=backend, fsync=False)
+    store.update({"score": 120, "level": 2})
+    for i in range(5):
+        store.append("experience", {"i": i})
+    store.close()
+
+    store = AgentStateStore(path, backend=backend, fsync=False)
+    assert store.values() == {"score": 120, "level": 2}
+    assert store.count("experience") == 5
+    assert [r["i"] for r in store.history("experience")] == list(range(5))
+    assert [r["i"] for r in store.history("experience", limit=2)] == [3, 4]
+    store.close()
+
+
+def test_compaction_keeps_values_and_counts(tmp_path):
+    path = str(tmp_path / "state")
+    store = AgentStateStore(path, compact_every=3, fsync=False)
+    for i in range(10):
+        store.set("n", i)
+        store.append("h", {"i": i})
+    store.close()
+
+    store = AgentStateStore(path, compact_every=3, fsync=False)
+    assert store.get("n") == 9
+    assert store.count("h") == 10
+    store.close()
+
+
+def test_history_limit_reads_from_the_end(tmp_path):
+    path = str(tmp_path / "state")
+    store = AgentStateStore(path, fsync=False)
+    for i in range(3000):
+        store.append("h", {"i": i, "pad": "x" * (i % 200)})
+    assert [r["i"] for r in store.history("h", limit=3)] == [2997, 2998, 2999]
+    assert [r["i"] for r in store.history("h", limit=5000)] == list(range(3000))
+    assert store.history("missing", limit=3) == []
+    store.close()
+
+
+def test_appends_after_a_torn_line_are_kept(tmp_path):
+    path = str(tmp_path / "state")
+    store = AgentStateStore(path, fsync=False)
+    store.set("a", 1)
+    store.append("h", {"i": 1})
+    store.close()
+
+    # A crash mid-write leaves a partial last line in both files
+    for name in ("h.jsonl", "values.log"):
+        with open(os.path.join(path, name), "ab") as f:
+            f.write(b'{"i": 2, "trunc')
+
+    store = AgentStateStore(path, fsync=False)
+    assert store.count("h") == 1
+    store.append("h", {"i": 3})
+    store.set("a", 3)
+    store.close()
+
+    store = AgentStateStore(path, fsync=False)
+    assert store.count("h") == 2
+    assert store.history("h") == [{"i": 1}, {"i": 3}]
+    assert store.history("h", limit=5) == store.history("h")
+    assert store.values() == {"a": 3}
+    store.close()
@@ -0,0 +1,71 @@
+import socket
+import time
+
+from amaip.stream import EventStream
+
+from .util import wait_for
+
+
+def watch_tasks(client):
+    titles = []
+    client.add_listener("task:created", lambda task: titles.append(task["title"]))
+    client.connect()
+    wait_for(lambda: client.stream.epoch)
+    return titles
+
+
+def drop_socket(client):
+    """Cut the client's connection without a close handshake, as a network failure would"""
+    client.sio.eio.ws.sock.shutdown(socket.SHUT_RDWR)
+
+
+def test_events_missed_while_disconnected_are_replayed_once(make_client):
+    client = make_client(reconnection_delay=0.05, reconnection_delay_max=0.1)
+    titles = watch_tasks(client)
+    rest = make_client()
+    rest.create_task("before")
+    wait_for(lambda: titles == ["before"])
+
+    drop_socket(client)
+    rest.create_task("while down 1")
+    rest.create_task("while down 2")
+    wait_for(lambda: len(titles) == 3)
+    rest.create_task("after")
+    wait_for(lambda: len(titles) == 4)
+
+    assert titles == ["before", "while down 1", "while down 2", "after"]
+    assert client.stream.stats["replayed"] == 2
+    assert client.stream.stats["gaps"] == 0
+
+
+def test_server_restart_falls_back_to_a_delta_resync(platform, make_client):
+    client = make_client(reconnection_delay=0.05, reconnection_delay_max=0.1)
+    titles = watch_tasks(client)
+    rest = make_client()
+    rest.create_task("before")
+    wait_for(lambda: titles == ["before"])
+
+    platform.stop()
+    # Changes the restarted server has no events for
+    time.sleep(0.01)
+    platform.state.create_task("while down")
+    platform.start()
+
+    wait_for(lambda: "while down" in titles)
+    rest.create_task("after")
+    wait_for(lambda: "after" in titles)
+    assert titles == ["before", "while down", "after"]
+    assert client.stream.stats["gaps"] == 1
+    assert client.stream.stats["resynced"] == 1
+
+
+def test_duplicate_events_are_delivered_once():
+    stream = EventStream(client=None, deliver=None)
+    event = {"id": 1, "_seq": 7}
+    assert stream.accept("task:created", event)
+    assert not stream.accept("task:created", dict(event))
+    assert stream.accept("task:created", {"id": 2, "_seq": 8})
+    assert stream.last_seq == 8
+    assert stream.stats["duplicates"] == 1
+    # Unnumbered events (e.g. message chunks) are never held back
+    assert stream.accept("message:chunk", {"delta": "x"})
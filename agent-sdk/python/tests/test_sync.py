@@ -0,0 +1,52 @@
+from amaip.testing import state as platform_state
+
+
+def ids(records):
+    return [record["id"] for record in records]
+
+
+def test_first_poll_returns_everything_then_only_changes(platform, make_client):
+    client = make_client()
+    first = [client.create_task(f"Task {i}") for i in range(3)]
+    cursor = client.delta("tasks", page_size=2)
+    assert ids(cursor.poll()) == ids(first)
+    assert cursor.poll() == []
+
+    agent_id = client.register_agent("worker")["id"]
+    client.assign_task(first[1]["id"], agent_id)
+    new = client.create_task("Task 3")
+    changed = cursor.poll()
+    assert ids(changed) == [first[1]["id"], new["id"]]
+    assert changed[0]["status"] == "in_progress"
+    assert cursor.poll() == []
+
+
+def test_records_stamped_in_the_same_millisecond_are_not_skipped(platform, make_client, monkeypatch):
+    # user-007: a record written in the cursor's newest millisecond after a poll used to be missed
+    monkeypatch.setattr(platform_state, "_now", lambda: "2026-01-01T00:00:00.005Z")
+    client = make_client()
+    cursor = client.delta("tasks")
+    first = client.create_task("First")
+    assert ids(cursor.poll()) == [first["id"]]
+
+    second = client.create_task("Second")
+    assert ids(cursor.poll()) == [second["id"]]
+    assert cursor.poll() == []
+
+    monkeypatch.setattr(platform_state, "_now", lambda: "2026-01-01T00:00:01.000Z")
+    platform.state.update_task_status(first["id"], "cancelled")
+    assert ids(cursor.poll()) == [first["id"]]
+    assert cursor.poll() == []
+
+
+def test_messages_cursor_is_scoped_to_a_discussion(make_client):
+    client = make_client()
+    agent_id = client.register_agent("talker")["id"]
+    one = client.create_discussion("one")["id"]
+    two = client.create_discussion("two")["id"]
+    client.add_message(one, agent_id, "hello")
+    client.add_message(two, agent_id, "elsewhere")
+    cursor = client.delta("messages", discussion_id=one)
+    assert [m["content"] for m in cursor.poll()] == ["hello"]
+    client.add_message(one, agent_id, "again")
+    assert [m["content"] for m in cursor.poll()] == ["again"]
@@ -0,0 +1,28 @@
+import time
+
+
+def wait_for(predicate, timeout: float = 5.0, interval: float = 0.01):
+    """Poll until ``predicate()`` is truthy and return its value, failing after ``timeout`` seconds"""
+    deadline = time.monotonic() + timeout
+    while True:
+        value = predicate()
+        if value:
+            return value
+        if time.monotonic() > deadline:
+            raise AssertionError(f"Timed out after {timeout}s waiting for {predicate}")
+        time.sleep(interval)
+
+
+def join(client, *names: str):
+    """Register and join agents on a connected client, waiting for the server's confirmations"""
+    joined = []
+    listener = joined.append
+    client.add_listener("agent:joined", listener)
+    try:
+        ids = [client.register_agent(name)["id"] for name in names]
+        for name in names:
+            client.emit_agent_join(name)
+        wait_for(lambda: len(joined) >= len(names))
+    finally:
+        client.remove_listener("agent:joined", listener)
+    return ids
@@ -0,0 +1,62 @@
+import express from 'express';
+import zlib from 'zlib';
+
+// MessagePack is optional (`npm install @msgpack/msgpack`): without the
+// package the API speaks JSON only
+let msgpack = null;
+try {
+  msgpack = await import('@msgpack/msgpack');
+} catch (error) {
+  msgpack = null;
+}
+
+const MSGPACK = 'application/msgpack';
+const COMPRESS_THRESHOLD = parseInt(process.env.COMPRESS_THRESHOLD) || 1024;
+
+const rawBody = express.raw({ type: MSGPACK, limit: '10mb' });
+
+// Parse MessagePack request bodies. Like JSON ones, gzipped bodies are
+// inflated first.
+export function msgpackBody(req, res, next) {
+  if (!msgpack || !req.is(MSGPACK)) {
+    return next();
+  }
+  rawBody(req, res, (error) => {
+    if (error) {
+      return next(error);
+    }
+    try {
+      req.body = msgpack.decode(req.body);
+    } catch (decodeError) {
+      return res.status(400).json({ error: 'Invalid MessagePack body' });
+    }
+    next();
+  });
+}
+
+// Answer res.json() in MessagePack when the client prefers it, and gzip
+// bodies above the threshold when the client accepts gzip
+export function negotiateResponse(req, res, next) {
+  res.json = (value) => {
+    const binary = msgpack && req.accepts(['application/json', MSGPACK]) === MSGPACK;
+    const body = binary
+      ? Buffer.from(msgpack.encode(value, { ignoreUndefined: true }))
+      : Buffer.from(JSON.stringify(value));
+
+    res.set('Content-Type', binary ? MSGPACK : 'application/json; charset=utf-8');
+    res.vary('Accept');
+    res.vary('Accept-Encoding');
+    if (body.length <= COMPRESS_THRESHOLD || !req.acceptsEncodings('gzip')) {
+      return res.send(body);
+    }
+    zlib.gzip(body, { level: 5 }, (error, compressed) => {
+      if (error) {
+        return res.send(body);
+      }
+      res.set('Content-Encoding', 'gzip');
+      res.send(compressed);
+    });
+    return res;
+  };
+  next();
+}
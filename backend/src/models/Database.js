@@ -54,10 +54,12 @@ class Database {
 
   insert(table, record) {
     const id = this.getNextId(table);
+    const now = new Date().toISOString();
     const newRecord = {
       id,
       ...record,
-      created_at: new Date().toISOString()
+      created_at: now,
+      updated_at: now
     };
     this.data[table].push(newRecord);
     this.save();
@@ -84,7 +86,8 @@ class Database {
     if (index !== -1) {
       this.data[table][index] = {
         ...this.data[table][index],
-        ...updates
+        ...updates,
+        updated_at: new Date().toISOString()
       };
       this.save();
       return this.data[table][index];
@@ -127,6 +130,25 @@ class Database {
   }
 }
 
+// Incremental fetch: keep records with id > sinceId and/or changed after
+// updatedAfter, in ascending id order so the last id is the next cursor.
+// Without a cursor the records are returned untouched.
+export function applyCursor(records, { sinceId, updatedAfter, limit } = {}) {
+  const since = parseInt(sinceId);
+  const after = updatedAfter ? new Date(updatedAfter) : null;
+  const max = parseInt(limit);
+
+  if (isNaN(since) && !after) {
+    return isNaN(max) ? records : records.slice(0, max);
+  }
+
+  const page = records
+    .filter(r => isNaN(since) || r.id > since)
+    .filter(r => !after || new Date(r.updated_at || r.created_at) > after)
+    .sort((a, b) => a.id - b.id);
+  return isNaN(max) ? page : page.slice(0, max);
+}
+
 // Create singleton instance
 const db = new Database();
 
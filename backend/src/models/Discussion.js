@@ -1,4 +1,4 @@
-import db from './Database.js';
+import db, { applyCursor } from './Database.js';
 
 export class Discussion {
   static create({ topic }) {
@@ -68,6 +68,17 @@ export class Discussion {
       });
   }
 
+  static getMessagesPage(discussionId, cursor) {
+    const page = applyCursor(db.findAll('messages', m => m.discussion_id === discussionId), cursor);
+    return page.map(m => {
+      const agent = db.findById('agents', m.agent_id);
+      return {
+        ...m,
+        agent_name: agent ? agent.name : null
+      };
+    });
+  }
+
   static delete(id) {
     // Delete messages first
     const messages = db.findAll('messages', m => m.discussion_id === id);
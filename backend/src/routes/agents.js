@@ -1,4 +1,5 @@
 import express from 'express';
+import { applyCursor } from '../models/Database.js';
 import { AgentRegistry } from '../services/agentRegistry.js';
 
 const router = express.Router();
@@ -19,10 +20,14 @@ router.post('/register', (req, res) => {
   }
 });
 
-// Get all agents
+// Get all agents (since_id / updated_after / limit for incremental fetch)
 router.get('/', (req, res) => {
   try {
-    const agents = AgentRegistry.getAllAgents();
+    const agents = applyCursor(AgentRegistry.getAllAgents(), {
+      sinceId: req.query.since_id,
+      updatedAfter: req.query.updated_after,
+      limit: req.query.limit
+    });
     res.json(agents);
   } catch (error) {
     res.status(500).json({ error: error.message });
@@ -1,4 +1,5 @@
 import express from 'express';
+import { applyCursor } from '../models/Database.js';
 import { DiscussionOrchestrator } from '../services/discussionOrchestrator.js';
 
 const router = express.Router();
@@ -19,10 +20,49 @@ router.post('/', (req, res) => {
   }
 });
 
-// Get all discussions
+// Add many messages, possibly across discussions, in one request
+router.post('/messages/batch', (req, res) => {
+  try {
+    const { messages } = req.body;
+
+    if (!Array.isArray(messages)) {
+      return res.status(400).json({ error: 'messages must be an array' });
+    }
+
+    const results = messages.map(({ discussionId, agentId, content }) => {
+      if (!agentId || !content) {
+        return { error: 'Agent ID and content are required' };
+      }
+      try {
+        const message = DiscussionOrchestrator.addMessage({
+          discussionId: parseInt(discussionId),
+          agentId,
+          content
+        });
+        if (req.events) {
+          req.events.emit('message:new', message);
+        }
+        return message;
+      } catch (error) {
+        return { error: error.message };
+      }
+    });
+
+    console.log(`[Socket] Emitted message:new for batch of ${messages.length}`);
+    res.status(201).json(results);
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Get all discussions (since_id / updated_after / limit for incremental fetch)
 router.get('/', (req, res) => {
   try {
-    const discussions = DiscussionOrchestrator.getAllDiscussions();
+    const discussions = applyCursor(DiscussionOrchestrator.getAllDiscussions(), {
+      sinceId: req.query.since_id,
+      updatedAfter: req.query.updated_after,
+      limit: req.query.limit
+    });
     res.json(discussions);
   } catch (error) {
     res.status(500).json({ error: error.message });
@@ -75,8 +115,8 @@ router.post('/:id/messages', (req, res) => {
     });
 
     // Emit socket event to notify all connected agents
-    if (req.io) {
-      req.io.emit('message:new', message);
+    if (req.events) {
+      req.events.emit('message:new', message);
       console.log(`[Socket] Emitted message:new in discussion ${req.params.id}`);
     }
 
@@ -86,11 +126,18 @@ router.post('/:id/messages', (req, res) => {
   }
 });
 
-// Get messages in discussion
+// Get messages in discussion (latest `limit`, or a page after since_id / updated_after)
 router.get('/:id/messages', (req, res) => {
   try {
     const limit = parseInt(req.query.limit) || 100;
-    const messages = DiscussionOrchestrator.getMessages(parseInt(req.params.id), limit);
+    const discussionId = parseInt(req.params.id);
+    const messages = req.query.since_id || req.query.updated_after
+      ? DiscussionOrchestrator.getMessagesPage(discussionId, {
+        sinceId: req.query.since_id,
+        updatedAfter: req.query.updated_after,
+        limit
+      })
+      : DiscussionOrchestrator.getMessages(discussionId, limit);
     res.json(messages);
   } catch (error) {
     res.status(500).json({ error: error.message });
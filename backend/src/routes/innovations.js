@@ -1,4 +1,5 @@
 import express from 'express';
+import { applyCursor } from '../models/Database.js';
 import { InnovationTracker } from '../services/innovationTracker.js';
 import { scoreInnovation } from '../services/wowScoring.js';
 
@@ -42,10 +43,14 @@ router.post('/', (req, res) => {
   }
 });
 
-// Get all innovations
+// Get all innovations (since_id / updated_after / limit for incremental fetch)
 router.get('/', (req, res) => {
   try {
-    const innovations = InnovationTracker.getAllInnovations();
+    const innovations = applyCursor(InnovationTracker.getAllInnovations(), {
+      sinceId: req.query.since_id,
+      updatedAfter: req.query.updated_after,
+      limit: req.query.limit
+    });
     res.json(innovations);
   } catch (error) {
     res.status(500).json({ error: error.message });
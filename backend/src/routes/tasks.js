@@ -1,4 +1,5 @@
 import express from 'express';
+import { applyCursor } from '../models/Database.js';
 import { TaskManager } from '../services/taskManager.js';
 
 const router = express.Router();
@@ -20,8 +21,8 @@ router.post('/', (req, res) => {
     });
 
     // Emit socket event to notify all connected agents
-    if (req.io) {
-      req.io.emit('task:created', task);
+    if (req.events) {
+      req.events.emit('task:created', task);
       console.log(`[Socket] Emitted task:created for: ${title}`);
     }
 
@@ -31,10 +32,73 @@ router.post('/', (req, res) => {
   }
 });
 
-// Get all tasks
+// Create many tasks in one request
+router.post('/batch', (req, res) => {
+  try {
+    const { tasks } = req.body;
+
+    if (!Array.isArray(tasks)) {
+      return res.status(400).json({ error: 'tasks must be an array' });
+    }
+
+    const results = tasks.map(({ title, description, creatorAgentId, priority }) => {
+      if (!title) {
+        return { error: 'Task title is required' };
+      }
+      try {
+        const task = TaskManager.createTask({ title, description, creatorAgentId, priority });
+        if (req.events) {
+          req.events.emit('task:created', task);
+        }
+        return task;
+      } catch (error) {
+        return { error: error.message };
+      }
+    });
+
+    console.log(`[Socket] Emitted task:created for batch of ${tasks.length}`);
+    res.status(201).json(results);
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Complete many tasks in one request
+router.post('/batch/complete', (req, res) => {
+  try {
+    const { tasks } = req.body;
+
+    if (!Array.isArray(tasks)) {
+      return res.status(400).json({ error: 'tasks must be an array' });
+    }
+
+    const results = tasks.map(({ taskId, result }) => {
+      try {
+        const task = TaskManager.completeTask(parseInt(taskId), result);
+        if (req.events) {
+          req.events.emit('task:completed', task);
+        }
+        return task;
+      } catch (error) {
+        return { error: error.message };
+      }
+    });
+
+    console.log(`[Socket] Emitted task:completed for batch of ${tasks.length}`);
+    res.json(results);
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Get all tasks (since_id / updated_after / limit for incremental fetch)
 router.get('/', (req, res) => {
   try {
-    const tasks = TaskManager.getAllTasks();
+    const tasks = applyCursor(TaskManager.getAllTasks(), {
+      sinceId: req.query.since_id,
+      updatedAfter: req.query.updated_after,
+      limit: req.query.limit
+    });
     res.json(tasks);
   } catch (error) {
     res.status(500).json({ error: error.message });
@@ -3,6 +3,8 @@ import { createServer } from 'http';
 import { Server } from 'socket.io';
 import cors from 'cors';
 import { setupSocketHandlers } from './sockets/agentSocket.js';
+import { setupRpc } from './sockets/rpc.js';
+import { EventLog } from './services/eventLog.js';
 
 // Import routes
 import agentsRouter from './routes/agents.js';
@@ -13,6 +15,7 @@ import analyticsRouter from './routes/analytics.js';
 
 // Import middleware
 import { rateLimit } from './middleware/auth.js';
+import { msgpackBody, negotiateResponse } from './middleware/codec.js';
 
 const app = express();
 const httpServer = createServer(app);
@@ -25,10 +28,15 @@ const io = new Server(httpServer, {
 
 const PORT = process.env.PORT || 3000;
 
+// Numbered broadcasts, replayable to reconnecting clients
+const events = new EventLog(io, parseInt(process.env.EVENT_LOG_SIZE) || 1000);
+
 // Middleware
 app.use(cors());
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
+app.use(msgpackBody);
+app.use(negotiateResponse);
 
 // Request logging
 app.use((req, res, next) => {
@@ -36,21 +44,28 @@ app.use((req, res, next) => {
   next();
 });
 
-// Make io available to routes via req.io
+// Make io and the event log available to routes via req.io / req.events
 app.use((req, res, next) => {
   req.io = io;
+  req.events = events;
   next();
 });
 
-// Rate limiting middleware
-app.use('/api', rateLimit(100, 60000)); // 100 requests per minute
-
-// API Routes
-app.use('/api/agents', agentsRouter);
-app.use('/api/tasks', tasksRouter);
-app.use('/api/discussions', discussionsRouter);
-app.use('/api/innovations', innovationsRouter);
-app.use('/api/analytics', analyticsRouter);
+// Rate limiting middleware, shared by HTTP and socket API requests
+const apiRateLimit = rateLimit(100, 60000); // 100 requests per minute
+app.use('/api', apiRateLimit);
+
+// API Routes (also served over the socket, see sockets/rpc.js)
+const apiMounts = {
+  '/api/agents': agentsRouter,
+  '/api/tasks': tasksRouter,
+  '/api/discussions': discussionsRouter,
+  '/api/innovations': innovationsRouter,
+  '/api/analytics': analyticsRouter
+};
+for (const [mount, router] of Object.entries(apiMounts)) {
+  app.use(mount, router);
+}
 
 // Root endpoint
 app.get('/', (req, res) => {
@@ -73,7 +88,11 @@ app.get('/', (req, res) => {
         'task:claim',
         'task:complete',
         'innovation:create',
-        'discussion:join'
+        'discussion:join',
+        'events:replay',
+        'events:subscribe',
+        'events:unsubscribe',
+        'api:request'
       ]
     }
   });
@@ -96,7 +115,8 @@ app.use((err, req, res, next) => {
 });
 
 // Setup WebSocket handlers
-setupSocketHandlers(io);
+setupSocketHandlers(io, events);
+setupRpc(io, events, { mounts: apiMounts, limiter: apiRateLimit });
 
 // Start server
 httpServer.listen(PORT, () => {
@@ -52,6 +52,10 @@ export class DiscussionOrchestrator {
     return Discussion.getMessages(discussionId, limit);
   }
 
+  static getMessagesPage(discussionId, cursor) {
+    return Discussion.getMessagesPage(discussionId, cursor);
+  }
+
   static getDiscussionStats(discussionId) {
     const messages = Discussion.getMessages(discussionId);
     const agentCounts = {};
@@ -0,0 +1,53 @@
+import crypto from 'crypto';
+import { Subscriptions } from './subscriptions.js';
+
+// Broadcasts that clients must not miss are numbered and the most recent
+// ones kept, so a client that reconnects can ask for just the events it
+// missed instead of re-downloading whole collections. The epoch changes
+// when the server restarts, telling clients that old numbers mean nothing.
+export class EventLog {
+  constructor(io, capacity = 1000, subscriptions = new Subscriptions()) {
+    this.io = io;
+    this.capacity = capacity;
+    this.subscriptions = subscriptions;
+    this.epoch = crypto.randomBytes(8).toString('hex');
+    this.seq = 0;
+    this.events = [];
+  }
+
+  // Number an event, remember it and send it to the clients subscribed to it
+  emit(event, payload) {
+    const data = { ...payload, _seq: ++this.seq };
+    this.events.push({ event, data });
+    if (this.events.length > this.capacity) {
+      this.events.shift();
+    }
+    this.io.to(this.subscriptions.rooms(event, data)).emit(event, data);
+    return data;
+  }
+
+  // Send an event to its subscribers without numbering or keeping it
+  send(event, data) {
+    this.io.to(this.subscriptions.rooms(event, data)).emit(event, data);
+  }
+
+  // Events after `seq`, limited to those a subscribed `socket` would get.
+  // `complete` is false when some of them are no longer kept (or `seq` is
+  // from another epoch) and the client has to resync.
+  since(seq, epoch, socket = null) {
+    const head = { epoch: this.epoch, seq: this.seq };
+    if (seq === undefined || seq === null) {
+      return { ...head, complete: true, events: [] };
+    }
+
+    const oldest = this.seq - this.events.length + 1;
+    if (epoch !== this.epoch || seq > this.seq || seq < oldest - 1) {
+      return { ...head, complete: false, events: [] };
+    }
+    let missed = this.events.slice(seq - oldest + 1);
+    if (socket && socket.subscriptions) {
+      missed = missed.filter(({ event, data }) => this.subscriptions.reaches(socket, event, data));
+    }
+    return { ...head, complete: true, events: missed };
+  }
+}
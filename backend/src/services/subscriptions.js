@@ -0,0 +1,106 @@
+// Sockets that never subscribe sit in this room and receive every broadcast
+export const ALL = 'all';
+
+const TASK_EVENTS = new Set(['task:created', 'task:assigned', 'task:completed']);
+
+// Server-side event filtering. A socket that subscribes leaves the ALL room
+// and joins one room per topic it cares about, so socket.io only sends it
+// the events addressed to those rooms:
+//   discussion:<id>   messages (and message chunks) posted in a discussion
+//   agent:<id>        tasks assigned to, or completed by, an agent
+//   capability:<name> tasks whose title or description mention a capability
+//   event:<name>      every event of one type
+export class Subscriptions {
+  constructor() {
+    this.capabilities = new Map(); // capability -> number of subscribed sockets
+  }
+
+  // Add topics to a socket's subscription and return the rooms it is now in
+  subscribe(socket, { discussions = [], capabilities = [], agents = [], events = [] } = {}) {
+    if (!socket.subscriptions) {
+      socket.subscriptions = new Set();
+      socket.leave(ALL);
+    }
+
+    const rooms = [
+      ...discussions.map(id => `discussion:${id}`),
+      ...agents.map(id => `agent:${id}`),
+      ...events.map(event => `event:${event}`)
+    ];
+    for (const capability of capabilities) {
+      const name = String(capability).toLowerCase();
+      if (!socket.subscriptions.has(`capability:${name}`)) {
+        this.capabilities.set(name, (this.capabilities.get(name) || 0) + 1);
+      }
+      rooms.push(`capability:${name}`);
+    }
+
+    for (const room of rooms) {
+      socket.subscriptions.add(room);
+      socket.join(room);
+    }
+    return [...socket.subscriptions];
+  }
+
+  // Whether an event is addressed to one of a subscribed socket's rooms
+  reaches(socket, event, data) {
+    const capabilities = [...socket.subscriptions]
+      .filter(room => room.startsWith('capability:'))
+      .map(room => room.slice('capability:'.length));
+    return this.rooms(event, data, capabilities).some(room => socket.rooms.has(room));
+  }
+
+  // Drop a socket's subscription; it receives every broadcast again
+  unsubscribe(socket) {
+    if (!socket.subscriptions) {
+      return;
+    }
+    for (const room of socket.subscriptions) {
+      if (room.startsWith('capability:')) {
+        this.release(room.slice('capability:'.length));
+      }
+      socket.leave(room);
+    }
+    socket.subscriptions = null;
+    socket.join(ALL);
+  }
+
+  // Forget a disconnected socket's capabilities (socket.io drops its rooms)
+  disconnect(socket) {
+    for (const room of socket.subscriptions || []) {
+      if (room.startsWith('capability:')) {
+        this.release(room.slice('capability:'.length));
+      }
+    }
+    socket.subscriptions = null;
+  }
+
+  release(capability) {
+    const count = (this.capabilities.get(capability) || 0) - 1;
+    if (count > 0) {
+      this.capabilities.set(capability, count);
+    } else {
+      this.capabilities.delete(capability);
+    }
+  }
+
+  // Rooms an event is delivered to, given the capabilities subscribed to
+  rooms(event, data, capabilities = this.capabilities.keys()) {
+    const rooms = [ALL, `event:${event}`];
+    if (data.discussion_id !== undefined && data.discussion_id !== null) {
+      rooms.push(`discussion:${data.discussion_id}`);
+    }
+    if (TASK_EVENTS.has(event)) {
+      if (data.assigned_agent_id) {
+        rooms.push(`agent:${data.assigned_agent_id}`);
+      }
+      const text = `${data.title || ''} ${data.description || ''}`.toLowerCase();
+      for (const capability of capabilities) {
+        if (text.includes(capability)) {
+          rooms.push(`capability:${capability}`);
+        }
+      }
+    }
+    return rooms;
+  }
+}
@@ -2,12 +2,32 @@ import { AgentRegistry } from '../services/agentRegistry.js';
 import { TaskManager } from '../services/taskManager.js';
 import { DiscussionOrchestrator } from '../services/discussionOrchestrator.js';
 import { InnovationTracker } from '../services/innovationTracker.js';
+import { ALL } from '../services/subscriptions.js';
 
-export function setupSocketHandlers(io) {
+// Resolve which agent an event is for. A fleet host joins several agents over
+// one socket and names the acting agent in the payload; anything else falls
+// back to the agent that joined on this socket.
+function resolveAgentId(socket, data = {}) {
+  if (data.agentId && socket.agentIds.has(data.agentId)) {
+    return data.agentId;
+  }
+  return socket.agentId;
+}
+
+export function setupSocketHandlers(io, events) {
   const connectedAgents = new Map(); // socket.id -> agentId
+  const { subscriptions } = events;
 
   io.on('connection', (socket) => {
     console.log(`[Socket] New connection: ${socket.id}`);
+    socket.agentIds = new Set();
+    socket.join(ALL);
+
+    // Clients may subscribe as they connect, so no unwanted event slips in
+    const { subscribe } = socket.handshake.auth || {};
+    if (subscribe) {
+      subscriptions.subscribe(socket, subscribe);
+    }
 
     // Agent joins the platform
     socket.on('agent:join', async (data) => {
@@ -15,13 +35,16 @@ export function setupSocketHandlers(io) {
         const { name, capabilities, endpoint } = data;
         const agent = AgentRegistry.register({ name, capabilities, endpoint });
 
-        // Store mapping
-        connectedAgents.set(socket.id, agent.id);
-        socket.agentId = agent.id;
-        socket.agentName = agent.name;
+        // Store mapping (the first agent stays the socket's default)
+        if (!socket.agentId) {
+          connectedAgents.set(socket.id, agent.id);
+          socket.agentId = agent.id;
+          socket.agentName = agent.name;
+        }
+        socket.agentIds.add(agent.id);
 
         // Notify all clients
-        io.emit('agent:connected', agent);
+        events.emit('agent:connected', agent);
 
         socket.emit('agent:joined', { success: true, agent });
         console.log(`[Agent] ${name} joined (ID: ${agent.id})`);
@@ -34,7 +57,7 @@ export function setupSocketHandlers(io) {
     socket.on('agent:message', async (data) => {
       try {
         const { discussionId, content } = data;
-        const agentId = socket.agentId;
+        const agentId = resolveAgentId(socket, data);
 
         if (!agentId) {
           throw new Error('Agent not registered');
@@ -47,18 +70,64 @@ export function setupSocketHandlers(io) {
         });
 
         // Broadcast to all clients
-        io.emit('message:new', message);
+        events.emit('message:new', message);
         console.log(`[Message] Agent ${socket.agentName} in discussion ${discussionId}`);
       } catch (error) {
         socket.emit('error', { message: error.message });
       }
     });
 
+    // Agent streams a message: partial chunks are relayed as they arrive,
+    // then the final text is stored and broadcast like any other message
+    socket.on('agent:message:chunk', async (data) => {
+      try {
+        const { streamId, discussionId, delta } = data;
+        const agentId = resolveAgentId(socket, data);
+
+        if (!agentId) {
+          throw new Error('Agent not registered');
+        }
+
+        // Chunks are transient and not numbered: a client that misses some
+        // still gets the whole text in the final message:new
+        events.send('message:chunk', {
+          stream_id: streamId,
+          discussion_id: discussionId,
+          agent_id: agentId,
+          delta
+        });
+      } catch (error) {
+        socket.emit('error', { message: error.message });
+      }
+    });
+
+    socket.on('agent:message:end', async (data) => {
+      try {
+        const { streamId, discussionId, content } = data;
+        const agentId = resolveAgentId(socket, data);
+
+        if (!agentId) {
+          throw new Error('Agent not registered');
+        }
+
+        const message = DiscussionOrchestrator.addMessage({
+          discussionId,
+          agentId,
+          content
+        });
+
+        events.emit('message:new', { ...message, stream_id: streamId });
+        console.log(`[Message] Agent ${agentId} finished streaming in discussion ${discussionId}`);
+      } catch (error) {
+        socket.emit('error', { message: error.message });
+      }
+    });
+
     // Agent creates a task
     socket.on('task:create', async (data) => {
       try {
         const { title, description, priority } = data;
-        const agentId = socket.agentId;
+        const agentId = resolveAgentId(socket, data);
 
         if (!agentId) {
           throw new Error('Agent not registered');
@@ -72,18 +141,19 @@ export function setupSocketHandlers(io) {
         });
 
         // Broadcast to all clients
-        io.emit('task:created', task);
+        events.emit('task:created', task);
         console.log(`[Task] Created by ${socket.agentName}: ${title}`);
       } catch (error) {
         socket.emit('error', { message: error.message });
       }
     });
 
-    // Agent claims a task
-    socket.on('task:claim', async (data) => {
+    // Agent claims a task. Clients that pass an ack callback learn whether
+    // they won the task instead of having to watch task:assigned.
+    socket.on('task:claim', async (data, ack) => {
       try {
         const { taskId } = data;
-        const agentId = socket.agentId;
+        const agentId = resolveAgentId(socket, data);
 
         if (!agentId) {
           throw new Error('Agent not registered');
@@ -92,10 +162,17 @@ export function setupSocketHandlers(io) {
         const task = TaskManager.assignTask(taskId, agentId);
 
         // Broadcast to all clients
-        io.emit('task:assigned', task);
+        events.emit('task:assigned', task);
         console.log(`[Task] ${socket.agentName} claimed task ${taskId}`);
+        if (typeof ack === 'function') {
+          ack({ success: true, task });
+        }
       } catch (error) {
-        socket.emit('error', { message: error.message });
+        if (typeof ack === 'function') {
+          ack({ success: false, error: error.message });
+        } else {
+          socket.emit('error', { message: error.message });
+        }
       }
     });
 
@@ -106,7 +183,7 @@ export function setupSocketHandlers(io) {
         const task = TaskManager.completeTask(taskId, result);
 
         // Broadcast to all clients
-        io.emit('task:completed', task);
+        events.emit('task:completed', task);
         console.log(`[Task] Completed: ${taskId}`);
       } catch (error) {
         socket.emit('error', { message: error.message });
@@ -127,7 +204,7 @@ export function setupSocketHandlers(io) {
         });
 
         // Broadcast to all clients
-        io.emit('innovation:created', innovation);
+        events.emit('innovation:created', innovation);
         console.log(`[Innovation] Created: ${title}`);
       } catch (error) {
         socket.emit('error', { message: error.message });
@@ -145,23 +222,58 @@ export function setupSocketHandlers(io) {
       }
     });
 
+    // Receive only the events for some discussions, capabilities, agents
+    // or event types instead of every broadcast. Repeated calls add topics.
+    socket.on('events:subscribe', (data, ack) => {
+      try {
+        const rooms = subscriptions.subscribe(socket, data || {});
+        console.log(`[Socket] ${socket.id} subscribed to ${rooms.length} topic(s)`);
+        if (typeof ack === 'function') {
+          ack({ success: true, rooms });
+        }
+      } catch (error) {
+        if (typeof ack === 'function') {
+          ack({ success: false, error: error.message });
+        } else {
+          socket.emit('error', { message: error.message });
+        }
+      }
+    });
+
+    // Back to receiving every broadcast
+    socket.on('events:unsubscribe', (data, ack) => {
+      subscriptions.unsubscribe(socket);
+      if (typeof ack === 'function') {
+        ack({ success: true });
+      }
+    });
+
     // Agent disconnects
     socket.on('disconnect', () => {
-      const agentId = connectedAgents.get(socket.id);
-      if (agentId) {
+      subscriptions.disconnect(socket);
+      for (const agentId of socket.agentIds) {
         try {
           AgentRegistry.disconnect(agentId);
           const agent = AgentRegistry.getAgent(agentId);
 
           // Notify all clients
-          io.emit('agent:disconnected', agent);
+          events.emit('agent:disconnected', agent);
 
-          console.log(`[Agent] ${socket.agentName} disconnected`);
-          connectedAgents.delete(socket.id);
+          console.log(`[Agent] ${agent.name} disconnected`);
         } catch (error) {
           console.error('Error disconnecting agent:', error);
         }
       }
+      connectedAgents.delete(socket.id);
+    });
+
+    // A reconnecting client asks for the numbered events it missed
+    socket.on('events:replay', (data, ack) => {
+      if (typeof ack !== 'function') {
+        return;
+      }
+      const { since, epoch } = data || {};
+      ack(events.since(since, epoch, socket));
     });
 
     // Ping/pong for heartbeat
@@ -0,0 +1,91 @@
+// REST calls over the socket. A client that already holds a socket can send
+// `api:request` with { id, method, path, query, body } and an ack callback
+// instead of opening HTTP requests, and gets back { id, status, body }.
+// Requests run through the same rate limit and API routers as HTTP ones, so
+// validation, status codes and the events they broadcast are identical.
+// Broadcasts caused by a call are written to the socket before its answer.
+
+const NOT_FOUND = { error: 'Endpoint not found' };
+
+// Query values arrive typed from JSON; routes expect strings, as from a URL
+function stringQuery(query) {
+  const result = {};
+  for (const [key, value] of Object.entries(query || {})) {
+    if (value !== undefined && value !== null) {
+      result[key] = String(value);
+    }
+  }
+  return result;
+}
+
+// Run one request through `handlers` (Express middleware and routers) with
+// a minimal req/res, resolving with the status and body it answered with
+function run(handlers, req) {
+  return new Promise((resolve) => {
+    let status = 200;
+    const res = {
+      status(code) {
+        status = code;
+        return res;
+      },
+      json(value) {
+        resolve({ status, body: value });
+        return res;
+      }
+    };
+
+    const next = (index) => (error) => {
+      if (error) {
+        console.error('[RPC] Error:', error);
+        return resolve({ status: 500, body: { error: 'Internal server error', message: error.message } });
+      }
+      if (index >= handlers.length) {
+        return resolve({ status: 404, body: NOT_FOUND });
+      }
+      try {
+        handlers[index](req, res, next(index + 1));
+      } catch (handlerError) {
+        next(handlers.length)(handlerError);
+      }
+    };
+    next(0)();
+  });
+}
+
+// `mounts` maps API prefixes (e.g. '/api/tasks') to their routers; paths
+// in requests are relative to '/api', like the SDK's
+export function setupRpc(io, events, { mounts, limiter = null }) {
+  io.on('connection', (socket) => {
+    socket.on('api:request', async (data, ack) => {
+      if (typeof ack !== 'function') {
+        return;
+      }
+      const { id, method = 'GET', path = '/', query, body } = data || {};
+      const fullPath = `/api${path}`.split('?')[0];
+      const mount = Object.keys(mounts).find(
+        (prefix) => fullPath === prefix || fullPath.startsWith(`${prefix}/`)
+      );
+      if (!mount) {
+        return ack({ id, status: 404, body: NOT_FOUND });
+      }
+
+      const req = {
+        method: String(method).toUpperCase(),
+        url: fullPath.slice(mount.length) || '/',
+        originalUrl: fullPath,
+        baseUrl: mount,
+        path: fullPath,
+        query: stringQuery(query),
+        body: body || {},
+        params: {},
+        headers: {},
+        ip: socket.handshake.address,
+        io,
+        events
+      };
+      const handlers = limiter ? [limiter, mounts[mount]] : [mounts[mount]];
+      const answer = await run(handlers, req);
+      ack({ id, ...answer });
+    });
+  });
+}
@@ -18,6 +18,7 @@ except ImportError:
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-sdk', 'python'))
 
 from amaip import Agent
+from amaip.llm import CallableProvider, get_gateway
 
 
 class RealAIAgent(Agent):
@@ -42,6 +43,12 @@ class RealAIAgent(Agent):
         else:
             self.anthropic = anthropic.Anthropic(api_key=api_key)
             self.ai_enabled = True
+
+            # All agents in this process share one gateway (cache + rate limit)
+            self.llm = get_gateway()
+            if not self.llm.has_provider("claude"):
+                self.llm.register(CallableProvider("claude", self._claude_call, self._claude_stream),
+                                  max_concurrency=4)
             print(f"✅ Claude AI enabled for {self.name}!")
 
         self.conversation_history = []
@@ -59,17 +66,31 @@ class RealAIAgent(Agent):
             return "I need Claude API key to respond intelligently. See setup instructions above."
 
         try:
-            response = self.anthropic.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=150,
-                system=self.personality,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return response.content[0].text
+            return self.llm.complete("claude", prompt, system=self.personality, max_tokens=150)
         except Exception as e:
             print(f"❌ Claude API error: {e}")
             return "Having trouble thinking right now..."
 
+    def _claude_call(self, prompt, system=None, max_tokens=150, **_):
+        """Raw Claude API call, used by the gateway on cache misses"""
+        response = self.anthropic.messages.create(
+            model="claude-3-5-sonnet-20241022",
+            max_tokens=max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return response.content[0].text
+
+    def _claude_stream(self, prompt, system=None, max_tokens=150, **_):
+        """Streaming Claude API call, yields text as it is generated"""
+        with self.anthropic.messages.stream(
+            model="claude-3-5-sonnet-20241022",
+            max_tokens=max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            yield from stream.text_stream
+
     def on_start(self):
         print(f"\n{'='*70}")
         print(f"🧠 REAL AI Agent '{self.name}' is online!")
@@ -187,16 +208,16 @@ Powered by: Claude 3.5 Sonnet
             """
 
             print(f"🧠 {self.name} is thinking...")
-            response = self.ask_claude(prompt)
 
-            print(f"💬 {self.name}: {response}\n")
-
-            # Post response to discussion
-            self.client.send_discussion_message(
-                message.get('discussion_id'),
-                self.agent_data['id'],
-                response
-            )
+            # Stream the reply into the discussion as Claude writes it
+            try:
+                response = self.send_message_stream(
+                    message.get('discussion_id'),
+                    self.llm.stream("claude", prompt, system=self.personality, max_tokens=150)
+                )
+                print(f"💬 {self.name}: {response}\n")
+            except Exception as e:
+                print(f"❌ Claude API error: {e}")
 
     def on_innovation_created(self, innovation):
         """Comment on innovations"""
@@ -15,10 +15,8 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-sdk', 'python'))
 
 from amaip import Agent
-
-# Uncomment to use Claude API:
-# pip install anthropic
-# import anthropic
+from amaip.llm import AnthropicProvider, get_gateway
+from amaip.pairing import PairingIndex
 
 
 class AIOrchestrator(Agent):
@@ -27,29 +25,41 @@ class AIOrchestrator(Agent):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # Setup Claude client (uncomment to use)
-        # self.anthropic = anthropic.Anthropic(
-        #     api_key=os.environ.get("ANTHROPIC_API_KEY")
-        # )
+        # Claude is used through the shared gateway when a key is set
+        self.llm = get_gateway()
+        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        if api_key and not self.llm.has_provider("anthropic"):
+            self.llm.register(AnthropicProvider(api_key), max_concurrency=4)
 
         self.agent_profiles = {}
+        self.pairing = PairingIndex(k=3)
+        self.orchestration_interval = 60.0
         self.collaboration_history = []
         self.innovation_ideas = []
 
+        # Platform-wide completed tasks, fetched incrementally per report
+        self.task_changes = None
+        self.completed_tasks = {}
+
     def on_start(self):
         print(f"\n{'='*70}")
         print(f"🧠 AI ORCHESTRATOR ONLINE")
         print(f"   Intelligent collaboration management powered by Claude AI")
         print(f"{'='*70}\n")
 
+        # Profile agents already online, then follow joins and departures
+        for agent in self.get_online_agents():
+            self.profile_agent(agent)
+        self.client.add_listener('agent:connected', self.on_agent_joined)
+        self.client.add_listener('agent:disconnected', self.on_agent_left)
+
         # Start periodic orchestration
         self.schedule_orchestration()
 
-    def on_agent_joined(self, agent):
-        """Profile new agent and suggest collaboration"""
-        print(f"\n🤝 Analyzing new agent: {agent['name']}")
-
-        # Build agent profile
+    def profile_agent(self, agent):
+        """Build an agent's profile and index it for pairing"""
+        if agent['id'] == self.agent_id:
+            return False
         self.agent_profiles[agent['id']] = {
             'name': agent['name'],
             'capabilities': agent.get('capabilities', []),
@@ -58,32 +68,38 @@ class AIOrchestrator(Agent):
             'innovations': 0,
             'collaboration_score': 1.0
         }
+        self.pairing.add(agent['id'], agent.get('capabilities', []))
+        return True
+
+    def on_agent_joined(self, agent):
+        """Profile new agent and suggest collaboration"""
+        if agent['id'] in self.agent_profiles or not self.profile_agent(agent):
+            return
+        print(f"\n🤝 Analyzing new agent: {agent['name']}")
 
         # Suggest collaboration opportunities
         self.suggest_collaborations(agent)
 
+    def on_agent_left(self, agent):
+        """Stop pairing agents that went offline"""
+        if agent and self.agent_profiles.pop(agent.get('id'), None) is not None:
+            self.pairing.remove(agent['id'])
+
     def suggest_collaborations(self, new_agent):
         """AI-powered collaboration suggestions"""
 
-        # Find complementary agents
-        complementary = []
-        for agent_id, profile in self.agent_profiles.items():
-            if agent_id == new_agent['id']:
-                continue
-
-            # Check for complementary capabilities
-            overlap = set(new_agent.get('capabilities', [])) & set(profile['capabilities'])
-            if len(overlap) == 0 and len(profile['capabilities']) > 0:
-                complementary.append(profile)
+        # Most complementary partners, from the pairing index
+        partners = self.pairing.partners(new_agent['id'], k=3)
 
-        if complementary:
+        if partners:
             print(f"\n💡 Collaboration Opportunity Detected!")
             print(f"   {new_agent['name']} can collaborate with:")
-            for partner in complementary[:3]:  # Top 3
-                print(f"   • {partner['name']} ({', '.join(partner['capabilities'])})")
+            for partner_id, score in partners:
+                partner = self.agent_profiles[partner_id]
+                print(f"   • {partner['name']} ({', '.join(partner['capabilities'])}) - {score:.0%} complementary")
 
             # Create collaboration task
-            self.create_collaboration_task(new_agent, complementary[0])
+            self.create_collaboration_task(new_agent, self.agent_profiles[partners[0][0]])
 
     def create_collaboration_task(self, agent1, agent2):
         """Create task requiring collaboration"""
@@ -119,9 +135,15 @@ class AIOrchestrator(Agent):
 
     def schedule_orchestration(self):
         """Periodic intelligent orchestration"""
-        # In a real implementation, this would run on a timer
-        # For demo, we'll trigger on events
-        print(f"🎯 AI Orchestration scheduling enabled")
+        # Fixed cadence on the SDK timer thread; a sweep still running when
+        # the next one is due is skipped, not overlapped
+        self.every(self.orchestration_interval, self.orchestration_sweep, name="orchestration")
+        print(f"🎯 AI Orchestration scheduling enabled (every {self.orchestration_interval:.0f}s)")
+
+    def orchestration_sweep(self):
+        """Re-rank collaboration partners for all agents in one batch"""
+        sets = self.pairing.recompute()
+        print(f"\n🔄 Collaboration pairings refreshed: {len(self.pairing)} agents, {sets} capability profiles")
 
     def on_discussion_message(self, message):
         """Analyze discussions and provide insights"""
@@ -155,13 +177,12 @@ class AIOrchestrator(Agent):
 
         print(f"   AI Suggestion: {idea}")
 
-        time.sleep(2)
-
-        self.client.create_task(
-            title=f"Innovation: {idea}",
-            description=f"AI-suggested innovation based on discussion analysis.\n\nContext: {trigger_message.get('content', 'N/A')}\n\nThis innovation has high potential for impact.",
-            priority=9,
-            creator_agent_id=self.agent_data['id']
+        self.after(
+            2, self.client.create_task,
+            f"Innovation: {idea}",
+            f"AI-suggested innovation based on discussion analysis.\n\nContext: {trigger_message.get('content', 'N/A')}\n\nThis innovation has high potential for impact.",
+            self.agent_data['id'],
+            9
         )
 
     def on_task_completed(self, task):
@@ -195,8 +216,6 @@ class AIOrchestrator(Agent):
             print(f"   {len(self.agent_profiles)} agents active")
             print(f"   Suggesting breakthrough innovation...")
 
-            time.sleep(2)
-
             breakthrough_ideas = [
                 "Self-Optimizing Multi-Agent System",
                 "Quantum-Inspired Task Distribution Algorithm",
@@ -208,23 +227,18 @@ class AIOrchestrator(Agent):
 
             idea = random.choice(breakthrough_ideas)
 
-            self.client.create_task(
-                title=f"🚀 Breakthrough: {idea}",
-                description=f"Major innovation opportunity identified by AI orchestrator.\n\nThis represents a significant advancement in agent collaboration.\n\nRequires: Multiple agents, high coordination, novel approach.",
-                priority=10,
-                creator_agent_id=self.agent_data['id']
+            self.after(
+                2, self.client.create_task,
+                f"🚀 Breakthrough: {idea}",
+                f"Major innovation opportunity identified by AI orchestrator.\n\nThis represents a significant advancement in agent collaboration.\n\nRequires: Multiple agents, high coordination, novel approach.",
+                self.agent_data['id'],
+                10
             )
 
     def analyze_with_claude(self, prompt):
-        """Use Claude API for analysis (uncomment to use)"""
-        # message = self.anthropic.messages.create(
-        #     model="claude-3-5-sonnet-20241022",
-        #     max_tokens=1024,
-        #     messages=[
-        #         {"role": "user", "content": prompt}
-        #     ]
-        # )
-        # return message.content[0].text
+        """Use Claude API for analysis (needs ANTHROPIC_API_KEY)"""
+        if self.llm.has_provider("anthropic"):
+            return self.llm.complete("anthropic", prompt, max_tokens=1024)
 
         # Simulation for demo
         return "AI analysis: High potential for innovation. Recommended priority: 9/10"
@@ -232,6 +246,13 @@ class AIOrchestrator(Agent):
     def generate_innovation_report(self):
         """Generate AI-powered innovation report"""
 
+        # Only tasks created or updated since the last report are downloaded
+        if self.task_changes is None:
+            self.task_changes = self.client.delta('tasks')
+        for task in self.task_changes.poll():
+            if task.get('status') == 'completed':
+                self.completed_tasks[task['id']] = task.get('assigned_agent_id')
+
         report = f"""
 ╔══════════════════════════════════════════════════════════╗
 ║          AI ORCHESTRATOR - INNOVATION REPORT             ║
@@ -240,6 +261,7 @@ class AIOrchestrator(Agent):
 📊 Platform Statistics:
    • Active Agents: {len(self.agent_profiles)}
    • Tasks Completed: {len(self.collaboration_history)}
+   • Platform Tasks Completed: {len(self.completed_tasks)}
    • Collaboration Score: {random.randint(75, 95)}%
 
 🎯 Top Performing Agents:
@@ -299,9 +321,7 @@ def main():
     ║  • Performance analytics                               ║
     ║                                                        ║
     ║  To enable Claude AI:                                  ║
-    ║  1. pip install anthropic                              ║
-    ║  2. export ANTHROPIC_API_KEY="sk-ant-..."             ║
-    ║  3. Uncomment Claude code in this file                 ║
+    ║  export ANTHROPIC_API_KEY="sk-ant-..."                ║
     ╚════════════════════════════════════════════════════════╝
     """)
 
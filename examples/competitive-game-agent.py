@@ -14,7 +14,7 @@ from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-sdk', 'python'))
 
-from amaip import Agent
+from amaip import Agent, AgentStateStore
 
 
 class CompetitiveAgent(Agent):
@@ -22,6 +22,7 @@ class CompetitiveAgent(Agent):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.state = AgentStateStore(f'state_{self.name}')
 
         self.score = 0
         self.achievements = []
@@ -49,34 +50,39 @@ class CompetitiveAgent(Agent):
 
     def load_stats(self):
         """Load previous competition stats"""
-        try:
-            with open(f'competition_stats_{self.name}.json', 'r') as f:
-                data = json.load(f)
-                self.score = data.get('score', 0)
-                self.level = data.get('level', 1)
-                self.xp = data.get('xp', 0)
-                self.achievements = data.get('achievements', [])
-                self.tasks_won = data.get('tasks_won', 0)
-
-                print(f"📊 Loaded stats: Level {self.level}, Score {self.score}")
-                if self.achievements:
-                    print(f"   🏆 Achievements: {', '.join(self.achievements[:3])}")
-        except FileNotFoundError:
-            print(f"🆕 New competitor! Starting fresh")
+        data = self.state.values()
+        if not data:
+            # Stats saved by older versions, imported once
+            try:
+                with open(f'competition_stats_{self.name}.json', 'r') as f:
+                    data = json.load(f)
+                self.state.update(data)
+            except FileNotFoundError:
+                print(f"🆕 New competitor! Starting fresh")
+                return
+
+        self.score = data.get('score', 0)
+        self.level = data.get('level', 1)
+        self.xp = data.get('xp', 0)
+        self.achievements = data.get('achievements', [])
+        self.tasks_won = data.get('tasks_won', 0)
+
+        print(f"📊 Loaded stats: Level {self.level}, Score {self.score}")
+        if self.achievements:
+            print(f"   🏆 Achievements: {', '.join(self.achievements[:3])}")
 
     def save_stats(self):
         """Save competition stats"""
-        with open(f'competition_stats_{self.name}.json', 'w') as f:
-            json.dump({
-                'score': self.score,
-                'level': self.level,
-                'xp': self.xp,
-                'achievements': self.achievements,
-                'tasks_won': self.tasks_won,
-                'innovations_created': self.innovations_created,
-                'collaborations': self.collaborations,
-                'last_played': datetime.now().isoformat()
-            }, f, indent=2)
+        self.state.update({
+            'score': self.score,
+            'level': self.level,
+            'xp': self.xp,
+            'achievements': list(self.achievements),
+            'tasks_won': self.tasks_won,
+            'innovations_created': self.innovations_created,
+            'collaborations': self.collaborations,
+            'last_played': datetime.now().isoformat()
+        })
 
     def announce_entrance(self):
         """Dramatic entrance announcement"""
@@ -348,6 +354,7 @@ def main():
         print(f"   • Achievements: {len(agent.achievements)}")
         agent.save_stats()
         agent.stop()
+        agent.state.close()
 
 
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ import random
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-sdk', 'python'))
 
-from amaip import Agent
+from amaip import Agent, AgentFleet
 
 
 class CustomAgent(Agent):
@@ -56,9 +56,12 @@ class CustomAgent(Agent):
 
         # Decide karo claim karna hai ya nahi
         if self.should_claim_task(task):
-            time.sleep(random.uniform(1, 3))
-            self.claim_task(task['id'])
-            print(f"👉 Claimed: {task['title']}")
+            # Server se confirm hota hai ki task mila ya kisi aur ne le liya
+            result = self.claim_task(task['id'], wait=True)
+            if result:
+                print(f"👉 Claimed: {task['title']}")
+            else:
+                print(f"⏭️  Missed: {task['title']} ({result.error})")
 
     def should_claim_task(self, task):
         """Logic: kaunsa task claim karna hai"""
@@ -210,8 +213,25 @@ def main():
         agent.stop()
 
 
+def main_fleet():
+    # Ek hi process aur ek hi connection par poori team chalao
+    fleet = AgentFleet()
+    fleet.add(DataAnalystAgent(name="DataAnalyst-1", capabilities=["data", "analysis"]))
+    fleet.add(CodeReviewerAgent(name="Reviewer-1", capabilities=["code", "review"]))
+    fleet.add(ResearchAgent(name="Researcher-1", capabilities=["research", "analysis"]))
+
+    try:
+        fleet.start()
+    except KeyboardInterrupt:
+        print("\n\n👋 Fleet shutting down gracefully...")
+        fleet.stop()
+
+
 if __name__ == "__main__":
-    main()
+    if "--fleet" in sys.argv:
+        main_fleet()
+    else:
+        main()
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -233,6 +253,9 @@ Terminal 1: python3 custom-agent-template.py
 Terminal 2: python3 custom-agent-template.py
 Terminal 3: python3 custom-agent-template.py
 
+# Multiple agents, one process, one connection:
+python3 custom-agent-template.py --fleet
+
 # With Claude/GPT:
 Install: pip install anthropic openai
 Add to do_work():
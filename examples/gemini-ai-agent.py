@@ -19,6 +19,7 @@ except ImportError:
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-sdk', 'python'))
 
 from amaip import Agent
+from amaip.llm import CallableProvider, get_gateway
 
 
 class GeminiAIAgent(Agent):
@@ -43,6 +44,14 @@ class GeminiAIAgent(Agent):
             genai.configure(api_key=api_key)
             self.model = genai.GenerativeModel('gemini-pro')
             self.ai_enabled = True
+
+            # All agents in this process share one gateway (cache + rate limit)
+            self.llm = get_gateway()
+            if not self.llm.has_provider("gemini-sdk"):
+                self.llm.register(
+                    CallableProvider("gemini-sdk", lambda prompt, **_: self.model.generate_content(prompt).text),
+                    rate=1.0, burst=5
+                )
             print(f"✅ Gemini AI enabled for {self.name}! (FREE - 1500 req/day)")
 
         self.personality = """
@@ -59,8 +68,7 @@ class GeminiAIAgent(Agent):
 
         try:
             full_prompt = f"{self.personality}\n\n{prompt}"
-            response = self.model.generate_content(full_prompt)
-            return response.text
+            return self.llm.complete("gemini-sdk", full_prompt)
         except Exception as e:
             print(f"❌ Gemini API error: {e}")
             return "Having trouble thinking right now..."
@@ -12,7 +12,8 @@ import json
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-sdk', 'python'))
 
-from amaip import Agent
+from amaip import Agent, AgentStateStore
+from amaip.matching import TaskMatcher
 
 
 class LearningAgent(Agent):
@@ -20,7 +21,8 @@ class LearningAgent(Agent):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.experience = []
+        self.state = AgentStateStore(f'state_{self.name}')
+        self.experience = []  # recent experience; the full history is in self.state
         self.skill_levels = {}
         self.success_rate = 0.0
         self.total_tasks = 0
@@ -30,6 +32,10 @@ class LearningAgent(Agent):
         for cap in self.capabilities:
             self.skill_levels[cap] = 1.0  # Start at level 1
 
+        # Skills weighted by level, for scoring tasks
+        self.matcher = TaskMatcher()
+        self.matcher.add_agent(self.name, self.skill_levels)
+
     def on_start(self):
         print(f"\n{'='*60}")
         print(f"🧠 Learning Agent '{self.name}' initializing...")
@@ -41,27 +47,51 @@ class LearningAgent(Agent):
 
     def load_experience(self):
         """Load experience from previous sessions"""
-        try:
-            with open(f'experience_{self.name}.json', 'r') as f:
-                data = json.load(f)
-                self.experience = data.get('experience', [])
-                self.skill_levels = data.get('skill_levels', self.skill_levels)
-                self.total_tasks = len(self.experience)
-                self.successful_tasks = sum(1 for e in self.experience if e.get('success'))
-                if self.total_tasks > 0:
-                    self.success_rate = self.successful_tasks / self.total_tasks
-                print(f"📚 Loaded {self.total_tasks} previous experiences")
-                print(f"   Current success rate: {self.success_rate:.1%}")
-        except FileNotFoundError:
-            print(f"📚 No previous experience found. Starting fresh!")
+        self.import_legacy_experience()
 
-    def save_experience(self):
-        """Save experience for future sessions"""
-        with open(f'experience_{self.name}.json', 'w') as f:
-            json.dump({
-                'experience': self.experience[-100:],  # Keep last 100
-                'skill_levels': self.skill_levels
-            }, f, indent=2)
+        if not self.state.count('experience'):
+            print(f"📚 No previous experience found. Starting fresh!")
+            return
+
+        # Counters are stored alongside the history, so nothing is re-derived
+        self.skill_levels = self.state.get('skill_levels', self.skill_levels)
+        self.total_tasks = self.state.get('total_tasks', 0)
+        self.successful_tasks = self.state.get('successful_tasks', 0)
+        self.experience = self.state.history('experience', limit=100)
+        self.matcher.set_weights(self.name, self.skill_levels)
+        if self.total_tasks > 0:
+            self.success_rate = self.successful_tasks / self.total_tasks
+        print(f"📚 Loaded {self.total_tasks} previous experiences")
+        print(f"   Current success rate: {self.success_rate:.1%}")
+
+    def import_legacy_experience(self):
+        """One-time import of an experience_<name>.json file from older versions"""
+        path = f'experience_{self.name}.json'
+        if self.state.count('experience') or not os.path.exists(path):
+            return
+        with open(path, 'r') as f:
+            data = json.load(f)
+        for entry in data.get('experience', []):
+            self.state.append('experience', entry)
+        self.state.update({
+            'skill_levels': data.get('skill_levels', self.skill_levels),
+            'total_tasks': len(data.get('experience', [])),
+            'successful_tasks': sum(1 for e in data.get('experience', []) if e.get('success'))
+        })
+
+    def save_experience(self, entry=None):
+        """Save experience for future sessions
+
+        The new entry is appended to the stored history; earlier entries are
+        never rewritten.
+        """
+        if entry is not None:
+            self.state.append('experience', entry)
+        self.state.update({
+            'skill_levels': self.skill_levels,
+            'total_tasks': self.total_tasks,
+            'successful_tasks': self.successful_tasks
+        })
 
     def on_task_created(self, task):
         """Evaluate if task matches our improving skills"""
@@ -69,25 +99,20 @@ class LearningAgent(Agent):
 
         if confidence > 0.6:  # Only claim if confident
             print(f"📊 Task confidence: {confidence:.1%} - Claiming!")
-            time.sleep(random.uniform(1, 2))
-            self.claim_task(task['id'])
+            result = self.claim_task(task['id'], wait=True)
+            if not result:
+                print(f"   ⏭️  Missed it: {result.error}")
         else:
             print(f"📊 Task confidence: {confidence:.1%} - Skipping for now")
 
     def calculate_confidence(self, task):
         """Calculate confidence based on current skill levels"""
-        task_text = f"{task['title']} {task.get('description', '')}".lower()
-
-        relevant_skills = [
-            skill for skill in self.skill_levels.keys()
-            if skill.lower() in task_text
-        ]
+        avg_skill, hits = self.matcher.weighted([task])
 
-        if not relevant_skills:
+        if not hits[0, 0]:
             return 0.3  # Base confidence
 
-        avg_skill = sum(self.skill_levels[s] for s in relevant_skills) / len(relevant_skills)
-        return min(avg_skill / 5.0, 0.95)  # Cap at 95%
+        return min(float(avg_skill[0, 0]) / 5.0, 0.95)  # Cap at 95%
 
     def on_task_assigned(self, task):
         """Execute task and learn from it"""
@@ -110,6 +135,7 @@ class LearningAgent(Agent):
             'skills_used': list(self.skill_levels.keys())
         }
         self.experience.append(experience_entry)
+        self.experience = self.experience[-100:]
 
         # Update stats
         self.total_tasks += 1
@@ -134,7 +160,7 @@ class LearningAgent(Agent):
         print(f"✅ Task completed! Success rate: {self.success_rate:.1%}")
 
         # Save experience
-        self.save_experience()
+        self.save_experience(experience_entry)
 
         # Create innovation if significant learning
         if self.total_tasks % 5 == 0:
@@ -160,6 +186,7 @@ class LearningAgent(Agent):
         for skill in self.skill_levels:
             self.skill_levels[skill] += improvement
             self.skill_levels[skill] = min(self.skill_levels[skill], 10.0)  # Cap at 10
+        self.matcher.set_weights(self.name, self.skill_levels)
 
         print(f"   📈 Skills improved! New levels: {self.skill_levels}")
 
@@ -174,7 +201,7 @@ class LearningAgent(Agent):
                 "success_rate": f"{self.success_rate:.1%}",
                 "skill_levels": self.skill_levels,
                 "learning_curve": "exponential",
-                "improvement": f"{len(self.experience) * 10}% better than start"
+                "improvement": f"{self.total_tasks * 10}% better than start"
             }
         )
         print(f"✨ Learning innovation created!")
@@ -192,6 +219,7 @@ def main():
         print("\n\n🧠 Learning Agent saving experience and shutting down...")
         agent.save_experience()
         agent.stop()
+        agent.state.close()
 
 
 if __name__ == "__main__":
@@ -13,6 +13,7 @@ import random
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-sdk', 'python'))
 
 from amaip import Agent
+from amaip.matching import TaskMatcher
 
 
 # Personality definitions
@@ -92,6 +93,12 @@ PERSONALITIES = {
 }
 
 
+# Task preferences of every personality, scored in one pass per task
+PREFERENCES = TaskMatcher()
+for _type, _personality in PERSONALITIES.items():
+    PREFERENCES.add_agent(_type, _personality['task_preference'])
+
+
 class PersonalityAgent(Agent):
     """Agent with distinct personality traits"""
 
@@ -143,13 +150,9 @@ class PersonalityAgent(Agent):
     def on_task_created(self, task):
         """Personality affects task selection"""
 
-        title = task.get('title', '').lower()
-        description = task.get('description', '').lower()
-        task_text = f"{title} {description}"
-
         # Check if task matches personality preferences
         preferences = self.personality['task_preference']
-        match_score = sum(1 for pref in preferences if pref in task_text)
+        match_score = PREFERENCES.hit_count(task, self.personality_type)
 
         # Personality affects decision
         if match_score > 0:
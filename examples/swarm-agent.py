@@ -13,6 +13,7 @@ from threading import Thread
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-sdk', 'python'))
 
 from amaip import Agent
+from amaip.matching import TaskMatcher
 
 
 class SwarmCoordinator(Agent):
@@ -23,6 +24,9 @@ class SwarmCoordinator(Agent):
         self.swarm_members = []
         self.coordinated_tasks = []
 
+        self.matcher = TaskMatcher()
+        self.matcher.add_agent('swarm', ['multi', 'complex', 'distributed', 'system', 'swarm'])
+
     def on_start(self):
         print(f"\n{'='*60}")
         print(f"🐝 Swarm Coordinator '{self.name}' activated!")
@@ -51,10 +55,7 @@ class SwarmCoordinator(Agent):
 
     def on_task_created(self, task):
         """Analyze if task needs swarm coordination"""
-        keywords = ['multi', 'complex', 'distributed', 'system', 'swarm']
-        task_text = f"{task['title']} {task.get('description', '')}".lower()
-
-        if any(kw in task_text for kw in keywords):
+        if self.matcher.hit_count(task, 'swarm'):
             print(f"🐝 Swarm-worthy task detected: {task['title']}")
             self.coordinate_swarm(task)
 